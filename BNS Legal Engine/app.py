@@ -1,14 +1,44 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response, g
 import sys
 import os
+import json
+import math
+import time
+import queue
+
+import engine_log as log
 
 from legal_classifier import LegalClassifier
+from voice_session import VoiceSessionManager
+from document_analysis import open_document, analyze_pages, analyze_document, aggregate, DocumentError, DOCUMENT_WORKERS
 
 app = Flask(__name__)
 
+# Largest page /api/sections/search returns
+SECTION_SEARCH_MAX_K = int(os.environ.get("LEGAL_SECTION_SEARCH_MAX_K", "50"))
+
 # Initialize the engine once
-print("Starting Legal Engine... please wait...")
+log.info("Starting Legal Engine... please wait...")
 engine = LegalClassifier()
+sessions = VoiceSessionManager(engine)
+# Pages classified in parallel per document: DOCUMENT_WORKERS if set, else the host profile's choice
+document_workers = DOCUMENT_WORKERS
+if "DOCUMENT_WORKERS" not in os.environ and engine.tuning.get("document_workers"):
+    document_workers = int(engine.tuning["document_workers"])
+
+@app.before_request
+def start_request():
+    # Honour an ID set by the Node server / proxy so logs can be joined across services
+    g.request_id = log.start_request((request.headers.get('X-Request-ID') or '')[:64] or None)
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def end_request(response):
+    response.headers['X-Request-ID'] = g.get('request_id', log.request_id())
+    if request.path.startswith('/api/'):
+        log.info("request", method=request.method, path=request.path, status=response.status_code,
+                 ms=round((time.perf_counter() - g.get('request_start', time.perf_counter())) * 1000, 2))
+    return response
 
 @app.route('/')
 def index():
@@ -26,5 +56,179 @@ def analyze():
     results = engine.classify(fir_text, lang=lang)
     return jsonify(results)
 
+@app.route('/api/document', methods=['POST'])
+def document():
+    """Classifies an uploaded PDF / text file page by page.
+
+    Accepts a multipart 'file' field or a raw application/pdf / text/plain body.
+    Options (form or query): language, early_exit=1 (stop once a page gives
+    high-confidence sections), stream=1 (NDJSON: one line per page as it is
+    done, then the document verdict), workers.
+    """
+    options = {**request.args.to_dict(), **request.form.to_dict()}
+    upload = request.files.get('file')
+    if upload is not None:
+        data, filename, content_type = upload.read(), upload.filename or '', upload.mimetype or ''
+    else:
+        data, filename, content_type = request.get_data(), '', request.mimetype or ''
+    if not data:
+        return jsonify({"error": "No file uploaded. Please provide a PDF or text file."}), 400
+
+    lang = options.get('language', 'hi')
+    early_exit = options.get('early_exit', '0').lower() in ('1', 'true', 'yes')
+    try:
+        workers = max(1, min(int(options.get('workers', document_workers)), document_workers))
+    except ValueError:
+        return jsonify({"error": "workers must be a number"}), 400
+    try:
+        doc = open_document(data, filename, content_type)
+    except DocumentError as e:
+        return jsonify({"error": str(e)}), 415
+
+    if options.get('stream', '0').lower() not in ('1', 'true', 'yes'):
+        return jsonify(analyze_document(engine, doc, lang, workers, early_exit))
+
+    def stream():
+        pages = []
+        for page in analyze_pages(engine, doc, lang, workers, early_exit):
+            pages.append(page)
+            yield json.dumps({"type": "page", **page}, ensure_ascii=False) + "\n"
+        verdict = aggregate(pages, doc.page_count, stopped_early=len(pages) < doc.page_count)
+        verdict.pop("pages")
+        yield json.dumps({"type": "document", **verdict}, ensure_ascii=False) + "\n"
+
+    return Response(stream(), mimetype='application/x-ndjson')
+
+@app.route('/healthz')
+def healthz():
+    """Liveness plus the encoder and the runtime configuration in effect (see tune_host.py)."""
+    return jsonify({
+        "status": "ok",
+        "encoder": engine.model_info,
+        "tuning": {**engine.tuning, "document_workers": document_workers}
+    })
+
+def filter_values(value):
+    """A filter given as a list or a comma separated string; None when absent."""
+    if value is None or value == '':
+        return None
+    values = value if isinstance(value, list) else str(value).split(',')
+    return [str(v).strip() for v in values if str(v).strip()] or None
+
+@app.route('/api/sections/search', methods=['GET', 'POST'])
+def search_sections():
+    """Semantic search over the BNS and special acts sections.
+
+    Parameters (query string or JSON body): q, language (hi / en), k (page size, at most
+    SECTION_SEARCH_MAX_K), offset, act (bns / special_acts) and chapter (chapter
+    numbers; comma separated or lists), min_score.
+    """
+    body = request.get_json(silent=True)
+    if body is not None and not isinstance(body, dict):
+        return jsonify({"error": "JSON body must be an object"}), 400
+    options = {**request.args.to_dict(), **(body or {})}
+    query = str(options.get('q') or '').strip()
+    lang = options.get('language', 'hi')
+    if not query:
+        return jsonify({"error": "No query provided"}), 400
+    if lang not in ('hi', 'en'):
+        return jsonify({"error": "language must be 'hi' or 'en'"}), 400
+    try:
+        k = int(options.get('k', 10))
+        offset = int(options.get('offset', 0))
+        chapters = filter_values(options.get('chapter'))
+        chapters = [int(c) for c in chapters] if chapters else None
+        min_score = options.get('min_score')
+        min_score = float(min_score) if min_score not in (None, '') else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "k, offset, chapter and min_score must be numbers"}), 400
+    if min_score is not None and not math.isfinite(min_score):
+        return jsonify({"error": "min_score must be a finite number"}), 400
+    if not 1 <= k <= SECTION_SEARCH_MAX_K or offset < 0:
+        return jsonify({"error": f"k must be 1-{SECTION_SEARCH_MAX_K} and offset at least 0"}), 400
+    try:
+        found = engine.search_sections(query, lang, k, offset, filter_values(options.get('act')), chapters, min_score)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"query": query, "language": lang, "k": k, "offset": offset, **found})
+
+@app.route('/api/stats')
+def stats():
+    """Which stage (keyword / lexical / hybrid / neural) answered the requests so far."""
+    return jsonify(engine.stats())
+
+@app.route('/api/vocabulary')
+def vocabulary():
+    """Keyword / section title phrases for grammar-constrained speech recognition."""
+    return jsonify(engine.speech_vocabulary())
+
+@app.route('/api/memory')
+def memory():
+    """Approximate memory held by the model, the embedding matrices and the datasets."""
+    return jsonify(engine.memory_report())
+
+# --- Incremental (dictation) analysis ---
+
+@app.route('/api/session', methods=['POST'])
+def create_session():
+    data = request.get_json(silent=True) or {}
+    lang = data.get('language', 'hi')
+    session = sessions.create(lang)
+    return jsonify(session.snapshot())
+
+@app.route('/api/session/<session_id>', methods=['GET'])
+def get_session(session_id):
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Unknown session"}), 404
+    return jsonify(session.snapshot())
+
+@app.route('/api/session/<session_id>/segment', methods=['POST'])
+def append_segment(session_id):
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Unknown session"}), 404
+    data = request.get_json(silent=True) or {}
+    text = data.get('text', '')
+    if not text:
+        return jsonify({"error": "No input text provided"}), 400
+    try:
+        return jsonify(session.append(text))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 409
+
+@app.route('/api/session/<session_id>/events')
+def session_events(session_id):
+    """Server-Sent Events stream of provisional results for a session."""
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Unknown session"}), 404
+
+    def stream():
+        q = session.subscribe()
+        try:
+            yield f"data: {json.dumps(session.snapshot(), ensure_ascii=False)}\n\n"
+            while True:
+                try:
+                    event = q.get(timeout=15)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None:
+                    break
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+        finally:
+            session.unsubscribe(q)
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.route('/api/session/<session_id>', methods=['DELETE'])
+def close_session(session_id):
+    final = sessions.close(session_id)
+    if final is None:
+        return jsonify({"error": "Unknown session"}), 404
+    return jsonify(final)
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', debug=True, port=5000)
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+
+# --- CONFIGURATION ---
+# Padded tokens per encoder batch (batch size x longest text in it)
+ENCODE_TOKEN_BUDGET = int(os.environ.get("LEGAL_ENCODE_TOKEN_BUDGET", "8192"))
+# Upper bound on texts per batch, however short they are
+ENCODE_MAX_BATCH = int(os.environ.get("LEGAL_ENCODE_MAX_BATCH", "256"))
+# Fixed cost of one encoder call, in padded-token equivalents: the planner only
+# splits off a new batch when that saves more padding than this
+ENCODE_BATCH_OVERHEAD = int(os.environ.get("LEGAL_ENCODE_BATCH_OVERHEAD", "512"))
+
+
+def token_lengths(model, texts):
+    """Tokens per text as the model will see them (special tokens included, truncated to max_seq_length).
+
+    None when the model has no HuggingFace tokenizer (static / stub encoders,
+    which do not pad and gain nothing from planning).
+    """
+    tokenizer = getattr(model, 'tokenizer', None)
+    max_length = getattr(model, 'max_seq_length', None)
+    if tokenizer is None or not max_length:
+        return None
+    ids = tokenizer(list(texts), truncation=True, max_length=max_length)['input_ids']
+    return np.array([len(i) for i in ids], dtype=np.int64)
+
+
+def plan_batches(lengths, token_budget=ENCODE_TOKEN_BUDGET, max_batch=ENCODE_MAX_BATCH,
+                 batch_overhead=ENCODE_BATCH_OVERHEAD):
+    """Groups text indices into batches of similar length whose padded size fits the budget.
+
+    Texts are sorted longest first and cut into contiguous batches so that the
+    total of (texts x longest text + batch_overhead) over all batches is
+    minimal, with every batch within `token_budget` and `max_batch` (a text
+    longer than the budget gets a batch of its own). Solved exactly by dynamic
+    programming from the short end. Returns a list of index arrays.
+    """
+    order = np.argsort(-np.asarray(lengths), kind='stable')
+    sorted_lengths = np.maximum(np.asarray(lengths)[order], 1)
+    n = len(order)
+    cost = np.zeros(n + 1)
+    size = np.zeros(n, dtype=np.int64)
+    for i in range(n - 1, -1, -1):
+        longest = int(sorted_lengths[i])
+        limit = max(1, min(max_batch, token_budget // longest, n - i))
+        sizes = np.arange(1, limit + 1)
+        options = sizes * longest + batch_overhead + cost[i + 1:i + limit + 1]
+        best = int(options.argmin())
+        size[i] = best + 1
+        cost[i] = options[best]
+
+    batches, start = [], 0
+    while start < n:
+        batches.append(order[start:start + size[start]])
+        start += size[start]
+    return batches
+
+
+def padding_stats(lengths, batches):
+    """(real tokens, padded tokens) that a batch plan costs the encoder."""
+    real = int(np.sum(lengths))
+    padded = int(sum(len(batch) * int(np.max(lengths[batch])) for batch in batches))
+    return real, padded
+
+
+def encode_planned(model, texts, token_budget=ENCODE_TOKEN_BUDGET, max_batch=ENCODE_MAX_BATCH,
+                   batch_overhead=ENCODE_BATCH_OVERHEAD):
+    """model.encode() over length-bucketed, token-budgeted batches; rows come back in input order."""
+    texts = list(texts)
+    lengths = token_lengths(model, texts) if len(texts) > 1 else None
+    if lengths is None:
+        return np.asarray(model.encode(texts, convert_to_numpy=True), dtype=np.float32)
+
+    out = None
+    for batch in plan_batches(lengths, token_budget, max_batch, batch_overhead):
+        embeddings = np.asarray(
+            model.encode([texts[i] for i in batch], batch_size=len(batch), convert_to_numpy=True),
+            dtype=np.float32
+        )
+        if out is None:
+            out = np.empty((len(texts), embeddings.shape[1]), dtype=np.float32)
+        out[batch] = embeddings
+    return out
@@ -0,0 +1,105 @@
+import re
+import math
+from collections import Counter, defaultdict
+
+# Latin letters/digits and the whole Devanagari block (matras included, which
+# Python's \w does not treat as word characters)
+TOKEN_RE = re.compile(r"[0-9a-z\u0900-\u0963\u0966-\u097f]+")
+
+STOPWORDS = {
+    # English
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "at", "by", "for", "with", "from",
+    "is", "was", "were", "are", "be", "been", "it", "its", "this", "that", "as", "he", "she",
+    "his", "her", "they", "my", "me", "i", "we", "our", "has", "have", "had", "not", "no",
+    # Hindi
+    "का", "की", "के", "को", "में", "मे", "से", "ने", "पर", "और", "है", "हैं", "था", "थी", "थे",
+    "हो", "कि", "एवं", "तथा", "भी", "एक", "यह", "वह", "इस", "उस", "लिए", "साथ", "द्वारा",
+    "गया", "गई", "गए", "किया", "कर", "करने", "जो", "या", "तो", "ही", "अपने", "मेरे", "मेरी",
+}
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index (term -> [(doc_id, tf), ...]).
+
+    Scores are also reported normalized to [0, 1] by dividing by the score the
+    query would get against itself as a document (clamped at 1), so they can be
+    compared across corpora and mixed with cosine similarities.
+    """
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(list)
+        self.doc_len = []
+        for doc_id, text in enumerate(documents):
+            counts = Counter(tokenize(text))
+            self.doc_len.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self.postings[term].append((doc_id, tf))
+        self.n_docs = len(self.doc_len)
+        self.avgdl = (sum(self.doc_len) / self.n_docs) if self.n_docs else 0.0
+        # Length normalization term of every document, computed once
+        avgdl = self.avgdl or 1.0
+        self.doc_norm = [k1 * (1 - b + b * dl / avgdl) for dl in self.doc_len]
+        self.idf = {
+            term: math.log(1 + (self.n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for term, posting in self.postings.items()
+        }
+        self.max_idf = math.log(1 + (self.n_docs + 0.5) / 0.5) if self.n_docs else 0.0
+
+    def scores(self, query_tokens):
+        """Returns ({doc_id: raw_score}, self_score) for tokenized query terms."""
+        scores = defaultdict(float)
+        self_score = 0.0
+        k1, doc_norm = self.k1, self.doc_norm
+        query_norm = k1 * (1 - self.b + self.b * len(query_tokens) / (self.avgdl or 1.0))
+        for term, qtf in Counter(query_tokens).items():
+            idf = self.idf.get(term)
+            # Unknown query terms still count against the normalization
+            self_score += qtf * (self.max_idf if idf is None else idf) * qtf * (k1 + 1) / (qtf + query_norm)
+            if idf is None:
+                continue
+            for doc_id, tf in self.postings[term]:
+                scores[doc_id] += qtf * idf * tf * (k1 + 1) / (tf + doc_norm[doc_id])
+        return scores, self_score
+
+    def search(self, text, top_k=5):
+        """Top documents for `text` as [(doc_id, normalized_score), ...], best first."""
+        return self.search_tokens(tokenize(text), top_k)
+
+    def search_tokens(self, query_tokens, top_k=5):
+        scores, self_score = self.scores(query_tokens)
+        if not scores or self_score <= 0:
+            return []
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [(doc_id, min(1.0, score / self_score)) for doc_id, score in ranked]
+
+    def normalized_scores(self, query_tokens):
+        """Dense list of normalized scores, one per document (for score fusion)."""
+        scores, self_score = self.scores(query_tokens)
+        dense = [0.0] * self.n_docs
+        if self_score > 0:
+            for doc_id, score in scores.items():
+                dense[doc_id] = min(1.0, score / self_score)
+        return dense
+
+
+def top_k(dense_scores, k):
+    """[(doc_id, score), ...] of the k best non-zero scores, best first."""
+    ranked = sorted(((i, s) for i, s in enumerate(dense_scores) if s > 0), key=lambda item: item[1], reverse=True)
+    return ranked[:k]
+
+
+def lexical_confidence(ranked):
+    """Confidence that the top lexical hit is the answer: its normalized score,
+    scaled down when the runner-up is close behind."""
+    if not ranked:
+        return 0.0
+    top = ranked[0][1]
+    second = ranked[1][1] if len(ranked) > 1 else 0.0
+    margin = (top - second) / top if top > 0 else 0.0
+    return top * (0.5 + 0.5 * margin)
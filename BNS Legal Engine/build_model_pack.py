@@ -0,0 +1,43 @@
+import os
+import sys
+import time
+
+from download_model import MODEL_PATH, MODEL_NAME, download_and_save_model
+from legal_classifier import LegalClassifier
+from model_pack import build_model_pack, MODEL_PACK_DIR
+
+# Usage: python build_model_pack.py [--no-quantize]
+#
+# Turns the raw model saved by download_model.py into an optimized CPU pack:
+#   models/model-pack/model.pt        dynamically int8-quantized SentenceTransformer
+#   models/model-pack/<corpus>.npy    precomputed template / BNS / special act embeddings
+#   models/model-pack/manifest.json   checksums + source fingerprints
+# LegalClassifier picks the pack up automatically and falls back to the raw model.
+
+
+def main():
+    quantize = "--no-quantize" not in sys.argv
+
+    if not os.path.exists(MODEL_PATH):
+        download_and_save_model()
+
+    print("Loading raw model and corpora...")
+    # Always start from the raw fp32 model, never from an existing pack
+    classifier = LegalClassifier(use_model_pack=False)
+
+    print(f"Building model pack in {MODEL_PACK_DIR} (quantize={quantize})...")
+    start = time.time()
+    manifest = build_model_pack(
+        classifier.model,
+        classifier._corpus_texts(),
+        MODEL_PACK_DIR,
+        source_model=MODEL_NAME,
+        quantize=quantize
+    )
+    print(f"✔ Model pack built in {time.time() - start:.1f}s")
+    for name, entry in manifest["corpora"].items():
+        print(f"  - {name}: {entry['count']} embeddings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import os
+import json
+import time
+
+from legal_classifier import BNS_FILE, BNS_FILE_EN, SPECIAL_ACTS_FILE, SPECIAL_ACTS_FILE_EN
+from section_store import SectionStore, SECTION_STORE_DIR, sources_sha256
+
+# Usage: python build_section_store.py
+#
+# Converts the BNS and special act JSON files into prebuilt columnar stores:
+#   models/section-store/bns.npz
+#   models/section-store/special_acts.npz
+# LegalClassifier loads them instead of parsing the JSON, as long as the JSON
+# files have not changed since (otherwise it reads the JSON again).
+
+STORES = {
+    "bns": {"hi": BNS_FILE, "en": BNS_FILE_EN},
+    "special_acts": {"hi": SPECIAL_ACTS_FILE, "en": SPECIAL_ACTS_FILE_EN},
+}
+
+
+def main():
+    for name, files in STORES.items():
+        start = time.time()
+        records = {}
+        for lang, path in files.items():
+            with open(path, 'r', encoding='utf-8') as f:
+                records[lang] = json.load(f)
+        store = SectionStore.from_records(records, sources=sources_sha256(files.values()))
+        out = os.path.join(SECTION_STORE_DIR, f"{name}.npz")
+        store.save(out)
+        print(f"✔ {name}: {len(store)} sections, {len(store.chapter_numbers)} chapters, "
+              f"{os.path.getsize(out) / 1024:.0f} KB on disk, {store.nbytes() / 1024:.0f} KB in memory "
+              f"({time.time() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import os
+import sys
+import json
+import time
+from collections import Counter
+
+import numpy as np
+import torch
+
+from download_model import MODEL_PATH, MODEL_NAME, download_and_save_model
+from legal_classifier import LegalClassifier
+from static_encoder import (
+    STATIC_ENCODER_DIR, STATIC_FORMAT, MANIFEST_FILE,
+    EMBEDDINGS_FILE, WEIGHTS_FILE, TOKENIZER_FILE, _sha256
+)
+
+# Usage: python build_static_encoder.py [--dims 256] [--batch-size 1024]
+#
+# Distills the raw MiniLM model into a static token embedding table:
+#   models/static-encoder/token_embeddings.npy  one float16 row per vocabulary token
+#   models/static-encoder/token_weights.npy     SIF weights from the legal corpora
+#   models/static-encoder/tokenizer.json        the model's own tokenizer
+#   models/static-encoder/manifest.json         checksums + build info
+# Use it with LEGAL_ENCODER=static (no torch needed at query time).
+
+SIF_A = 1e-3
+
+
+def embed_vocabulary(model, batch_size):
+    """Runs every vocabulary token through the model once, as [CLS] token [SEP]."""
+    tokenizer = model.tokenizer
+    vocab_size = len(tokenizer)
+    cls_id, sep_id = tokenizer.cls_token_id, tokenizer.sep_token_id
+    rows = []
+    with torch.no_grad():
+        for start in range(0, vocab_size, batch_size):
+            ids = torch.arange(start, min(start + batch_size, vocab_size)).unsqueeze(1)
+            input_ids = torch.cat([
+                torch.full_like(ids, cls_id), ids, torch.full_like(ids, sep_id)
+            ], dim=1)
+            features = {"input_ids": input_ids, "attention_mask": torch.ones_like(input_ids)}
+            if "token_type_ids" in tokenizer.model_input_names:
+                features["token_type_ids"] = torch.zeros_like(input_ids)
+            rows.append(model(features)["sentence_embedding"].cpu().numpy())
+            print(f"\r  {min(start + batch_size, vocab_size)}/{vocab_size} tokens", end="", flush=True)
+    print()
+    return np.concatenate(rows).astype(np.float32)
+
+
+def pca(embeddings, dims):
+    """Projects onto the top `dims` principal components (no-op if dims >= width)."""
+    if dims >= embeddings.shape[1]:
+        return embeddings
+    centered = embeddings - embeddings.mean(axis=0)
+    _, vectors = np.linalg.eigh(centered.T @ centered)
+    return centered @ vectors[:, ::-1][:, :dims]
+
+
+def sif_weights(tokenizer, corpora):
+    """a / (a + p(token)) from token frequencies in the corpora the engine searches.
+
+    Frequent tokens (matras, common words) are damped, rare legal terms dominate.
+    Special tokens get weight 0.
+    """
+    counts = Counter()
+    for texts in corpora.values():
+        for text in texts:
+            counts.update(tokenizer(text, add_special_tokens=False)["input_ids"])
+    total = sum(counts.values()) or 1
+    weights = np.ones(len(tokenizer), dtype=np.float32)
+    for token_id, count in counts.items():
+        weights[token_id] = SIF_A / (SIF_A + count / total)
+    weights[tokenizer.all_special_ids] = 0.0
+    return weights
+
+
+def main():
+    dims = int(sys.argv[sys.argv.index('--dims') + 1]) if '--dims' in sys.argv else 256
+    batch_size = int(sys.argv[sys.argv.index('--batch-size') + 1]) if '--batch-size' in sys.argv else 1024
+
+    if not os.path.exists(MODEL_PATH):
+        download_and_save_model()
+
+    print("Loading raw model and corpora...")
+    classifier = LegalClassifier(use_model_pack=False, lexical_cascade=False, encoder="transformer")
+    model = classifier.model.to('cpu').eval()
+
+    start = time.time()
+    print(f"Embedding vocabulary ({len(model.tokenizer)} tokens)...")
+    embeddings = pca(embed_vocabulary(model, batch_size), dims)
+    weights = sif_weights(model.tokenizer, classifier._corpus_texts())
+
+    os.makedirs(STATIC_ENCODER_DIR, exist_ok=True)
+    np.save(os.path.join(STATIC_ENCODER_DIR, EMBEDDINGS_FILE), embeddings.astype(np.float16))
+    np.save(os.path.join(STATIC_ENCODER_DIR, WEIGHTS_FILE), weights)
+    model.tokenizer.backend_tokenizer.save(os.path.join(STATIC_ENCODER_DIR, TOKENIZER_FILE))
+
+    manifest = {
+        "format": STATIC_FORMAT,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "source_model": MODEL_NAME,
+        "dimensions": int(embeddings.shape[1]),
+        "vocab_size": int(embeddings.shape[0]),
+        "files": {
+            filename: _sha256(os.path.join(STATIC_ENCODER_DIR, filename))
+            for filename in (EMBEDDINGS_FILE, WEIGHTS_FILE, TOKENIZER_FILE)
+        }
+    }
+    with open(os.path.join(STATIC_ENCODER_DIR, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    size_mb = os.path.getsize(os.path.join(STATIC_ENCODER_DIR, EMBEDDINGS_FILE)) / (1024 * 1024)
+    print(f"✔ Static encoder built in {time.time() - start:.1f}s "
+          f"({manifest['vocab_size']} tokens x {manifest['dimensions']} dims, {size_mb:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
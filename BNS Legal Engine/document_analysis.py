@@ -0,0 +1,194 @@
+import io
+import os
+import re
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from legal_classifier import KEYWORD_STAGES
+
+# --- CONFIGURATION ---
+DOCUMENT_WORKERS = int(os.environ.get("DOCUMENT_WORKERS", str(min(4, os.cpu_count() or 1))))
+DOCUMENT_MAX_BYTES = int(os.environ.get("DOCUMENT_MAX_BYTES", str(25 * 1024 * 1024)))
+# Plain text without form feeds is cut into pages of about this many characters
+TEXT_PAGE_CHARS = 3000
+# A page "settles" the document for early exit when it has sections with at least
+# this confidence (keyword and phonetic matches count as 1.0) and is not a fallback answer
+EARLY_EXIT_CONFIDENCE = 0.8
+
+
+class DocumentError(Exception):
+    """Raised for uploads that cannot be read (unsupported type, broken PDF, too large)."""
+
+
+class TextDocument:
+    """Plain text split into pages on form feeds (as pdftotext writes them),
+    or into ~TEXT_PAGE_CHARS chunks on paragraph boundaries."""
+
+    def __init__(self, text):
+        if '\f' in text:
+            self.pages = text.split('\f')
+        else:
+            self.pages, current = [], ""
+            for paragraph in re.split(r'(\n\s*\n)', text):
+                if current and len(current) + len(paragraph) > TEXT_PAGE_CHARS:
+                    self.pages.append(current)
+                    current = ""
+                current += paragraph
+            self.pages.append(current)
+
+    @property
+    def page_count(self):
+        return len(self.pages)
+
+    def page_text(self, page_idx):
+        return self.pages[page_idx]
+
+
+class PdfDocument:
+    """PDF with per-page text extraction (pypdf).
+
+    pypdf is pure Python and holds the GIL, so page threads could not extract
+    in parallel anyway: pages are extracted one at a time from a single reader
+    (readers are not safe to share between threads), while the classification
+    of other pages goes on. testing/benchmark_documents.py measures both.
+    """
+
+    def __init__(self, data):
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            raise DocumentError("PDF support needs the 'pypdf' package (pip install pypdf)")
+        self._lock = threading.Lock()
+        try:
+            self._reader = PdfReader(io.BytesIO(data))
+            self.page_count = len(self._reader.pages)
+        except Exception as e:
+            raise DocumentError(f"Unreadable PDF: {e}")
+
+    def page_text(self, page_idx):
+        with self._lock:
+            return self._reader.pages[page_idx].extract_text() or ""
+
+
+def open_document(data, filename="", content_type=""):
+    """PdfDocument or TextDocument for an upload, by content type / extension / magic bytes."""
+    if len(data) > DOCUMENT_MAX_BYTES:
+        raise DocumentError(f"Document larger than {DOCUMENT_MAX_BYTES // (1024 * 1024)} MB")
+    if content_type == "application/pdf" or filename.lower().endswith(".pdf") or data[:5] == b"%PDF-":
+        return PdfDocument(data)
+    if content_type.startswith("text/") or filename.lower().endswith(".txt") or not content_type:
+        return TextDocument(data.decode('utf-8', errors='ignore'))
+    raise DocumentError(f"Unsupported file type: {content_type}. Please upload a PDF or a plain text file.")
+
+
+def page_confidence(result):
+    """Confidence of the sections a page found (0 if it found none or fell back)."""
+    if not result.get('relevant_sections') or result.get('is_fallback'):
+        return 0.0
+    if result.get('analysis_stage') in KEYWORD_STAGES:
+        return 1.0
+    return float(result.get('confidence_score') or 0.0)
+
+
+def analyze_pages(engine, document, lang='hi', workers=DOCUMENT_WORKERS, early_exit=False):
+    """Extracts and classifies pages on `workers` threads, yielding page results as they complete.
+
+    Classification runs in parallel; PDF extraction is serialized (see PdfDocument).
+
+    Only about 2 x workers pages are in flight at a time, so with `early_exit`
+    the pages after the first confident one are mostly never extracted.
+    """
+    def process(page_idx):
+        page = {"page": page_idx + 1}
+        try:
+            text = document.page_text(page_idx)
+            if not text.strip():
+                page["empty"] = True   # e.g. a scanned page without a text layer
+                return page
+            page["chars"] = len(text)
+            page["result"] = engine.classify(text, lang=lang)
+        except Exception as e:
+            page["error"] = str(e)
+        return page
+
+    pages = iter(range(document.page_count))
+    stop = False
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending = set()
+
+        def fill():
+            while not stop and len(pending) < 2 * max(1, workers):
+                page_idx = next(pages, None)
+                if page_idx is None:
+                    return
+                # Copy the context so page work logs under the caller's request ID
+                pending.add(pool.submit(contextvars.copy_context().run, process, page_idx))
+
+        fill()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                page = future.result()
+                yield page
+                if early_exit and page_confidence(page.get("result") or {}) >= EARLY_EXIT_CONFIDENCE:
+                    stop = True
+            if stop:
+                for future in pending:
+                    future.cancel()
+            else:
+                fill()
+
+
+def aggregate(pages, page_count, stopped_early=False):
+    """Document-level verdict: every section / special act with the pages it came from."""
+    pages = sorted(pages, key=lambda p: p["page"])
+    sections, acts, templates, messages = {}, {}, {}, []
+
+    for page in pages:
+        result = page.get("result")
+        if not result:
+            continue
+        # Keyword (and phonetic keyword) matches are certain, otherwise the page's template / similarity score
+        keyword_page = result.get('analysis_stage') in KEYWORD_STAGES
+        confidence = 1.0 if keyword_page else float(result.get('confidence_score') or 0.0)
+        for item in result.get('relevant_sections', []):
+            entry = sections.setdefault(item.get('Section'), {**item, "pages": [], "confidence": 0.0})
+            entry["pages"].append(page["page"])
+            entry["confidence"] = max(entry["confidence"], confidence)
+        for act in result.get('special_acts', []):
+            entry = acts.setdefault(act.get('Section'), {**act, "pages": []})
+            entry["pages"].append(page["page"])
+            entry["confidence"] = max(float(entry.get("confidence") or 0.0), float(act.get("confidence") or 0.0))
+        message = result.get('custom_message')
+        if message and message not in messages:
+            messages.append(message)
+        template = result.get('matched_template')
+        if template and not result.get('is_fallback') and not keyword_page:
+            entry = templates.setdefault(template, {"template": template, "confidence": 0.0, "pages": []})
+            entry["pages"].append(page["page"])
+            entry["confidence"] = max(entry["confidence"], float(result.get('confidence_score') or 0.0))
+
+    def ranked(entries):
+        return sorted(entries.values(), key=lambda e: (-e["confidence"], -len(e["pages"]), e["pages"][0]))
+
+    return {
+        "page_count": page_count,
+        "pages_processed": len(pages),
+        "stopped_early": stopped_early,
+        "empty_pages": [p["page"] for p in pages if p.get("empty")],
+        "failed_pages": [p["page"] for p in pages if p.get("error")],
+        "relevant_sections": ranked(sections),
+        "special_acts": ranked(acts),
+        "matched_template": (ranked(templates) or [None])[0],
+        "custom_message": "\n".join(messages),
+        "pages": pages
+    }
+
+
+def analyze_document(engine, document, lang='hi', workers=DOCUMENT_WORKERS, early_exit=False):
+    """Whole-document verdict (the non-streaming form of analyze_pages)."""
+    pages = list(analyze_pages(engine, document, lang, workers, early_exit))
+    return aggregate(pages, document.page_count, stopped_early=len(pages) < document.page_count)
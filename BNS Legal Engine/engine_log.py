@@ -0,0 +1,136 @@
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import atexit
+import random
+import logging
+import contextvars
+import logging.handlers
+
+# --- CONFIGURATION ---
+LOG_LEVEL = os.environ.get("LEGAL_LOG_LEVEL", "INFO").upper()
+# "text" (human readable, like the old console output) or "json" (one object per line)
+LOG_FORMAT = os.environ.get("LEGAL_LOG_FORMAT", "text")
+# Share of requests whose per-request DEBUG detail is logged (0..1)
+LOG_SAMPLE_RATE = float(os.environ.get("LEGAL_LOG_SAMPLE", "0.1"))
+# Log file (appended), default stderr
+LOG_FILE = os.environ.get("LEGAL_LOG_FILE", "")
+
+logger = logging.getLogger("legal_engine")
+logger.propagate = False
+
+_request_id = contextvars.ContextVar("request_id", default="-")
+_sampled = contextvars.ContextVar("sampled", default=False)
+_state = {"listener": None, "detail": False, "sample_rate": LOG_SAMPLE_RATE}
+
+
+class _Formatter(logging.Formatter):
+    def __init__(self, fmt):
+        super().__init__()
+        self.json = fmt == "json"
+
+    def format(self, record):
+        fields = getattr(record, "fields", None) or {}
+        if self.json:
+            return json.dumps({
+                "ts": round(record.created, 3),
+                "level": record.levelname.lower(),
+                "event": record.getMessage(),
+                "request_id": getattr(record, "request_id", "-"),
+                **fields
+            }, ensure_ascii=False, default=str)
+        stamp = time.strftime("%H:%M:%S", time.localtime(record.created))
+        extra = " ".join(f"{key}={value}" for key, value in fields.items())
+        return f"{stamp} {record.levelname:<7} [{getattr(record, 'request_id', '-')}] {record.getMessage()}" + (f" {extra}" if extra else "")
+
+
+def setup(level=LOG_LEVEL, fmt=LOG_FORMAT, sample_rate=LOG_SAMPLE_RATE, stream=None, use_queue=True):
+    """(Re)configures the engine logger.
+
+    Records go through a QueueHandler; formatting and the actual write happen on
+    a QueueListener thread, so the request thread never blocks on stdout/disk.
+    `use_queue=False` writes synchronously (only for comparison benchmarks).
+    """
+    shutdown()
+    if stream is None:
+        stream = open(LOG_FILE, "a", encoding="utf-8") if LOG_FILE else sys.stderr
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(_Formatter(fmt))
+
+    for old in list(logger.handlers):
+        logger.removeHandler(old)
+    if use_queue:
+        records = queue.SimpleQueue()
+        logger.addHandler(logging.handlers.QueueHandler(records))
+        _state["listener"] = logging.handlers.QueueListener(records, handler)
+        _state["listener"].start()
+    else:
+        logger.addHandler(handler)
+    logger.setLevel(level)
+    _state["detail"] = logger.isEnabledFor(logging.DEBUG) and sample_rate > 0
+    _state["sample_rate"] = sample_rate
+
+
+def shutdown():
+    """Flushes pending records and stops the writer thread."""
+    listener = _state["listener"]
+    if listener is not None:
+        _state["listener"] = None
+        listener.stop()
+
+
+atexit.register(shutdown)
+
+
+def start_request(request_id=None):
+    """Binds a request ID (and the sampling decision) to the current context. Returns the ID."""
+    request_id = request_id or uuid.uuid4().hex[:12]
+    _request_id.set(request_id)
+    _sampled.set(_state["detail"] and random.random() < _state["sample_rate"])
+    return request_id
+
+
+def request_id():
+    return _request_id.get()
+
+
+def detail_enabled():
+    """True when per-request DEBUG detail is on and this request was sampled.
+
+    Callers check it before building detail fields, so disabled logging costs a
+    dict lookup and a context variable read.
+    """
+    return _state["detail"] and _sampled.get()
+
+
+def _emit(level, event, fields):
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={"fields": fields, "request_id": _request_id.get()})
+
+
+def debug(event, **fields):
+    _emit(logging.DEBUG, event, fields)
+
+
+def info(event, **fields):
+    _emit(logging.INFO, event, fields)
+
+
+def warning(event, **fields):
+    _emit(logging.WARNING, event, fields)
+
+
+def error(event, **fields):
+    _emit(logging.ERROR, event, fields)
+
+
+def detail(event, **fields):
+    """Per-request DEBUG detail, only for sampled requests."""
+    if detail_enabled():
+        _emit(logging.DEBUG, event, fields)
+
+
+setup()
@@ -0,0 +1,142 @@
+import os
+
+from bm25 import TOKEN_RE
+
+# --- CONFIGURATION ---
+# Allowed edits grow with word length: shorter words must match exactly
+# (too many real words are one edit away from "chor" or "मौत")
+FUZZY_ONE_EDIT_LENGTH = int(os.environ.get("LEGAL_FUZZY_ONE_EDIT_LENGTH", "5"))
+FUZZY_TWO_EDIT_LENGTH = int(os.environ.get("LEGAL_FUZZY_TWO_EDIT_LENGTH", "9"))
+
+
+def max_edits(length):
+    if length >= FUZZY_TWO_EDIT_LENGTH:
+        return 2
+    if length >= FUZZY_ONE_EDIT_LENGTH:
+        return 1
+    return 0
+
+
+def edit_distance(a, b, limit):
+    """Optimal-string-alignment distance (Levenshtein + adjacent swaps), or limit + 1 once it is exceeded."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        row = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            row[j] = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], prev2[j - 2] + 1)
+        if min(row) > limit:
+            return limit + 1
+        prev2, prev = prev, row
+    return prev[-1]
+
+
+def deletes(word, depth):
+    """`word` and every string obtained by deleting up to `depth` characters."""
+    variants, frontier = {word}, {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+class FuzzyKeywordIndex:
+    """Approximate keyword matcher over the keyword rules (symmetric-delete index).
+
+    Keywords are split into words with the same tokenizer as BM25. Every keyword
+    word is indexed under the strings obtained by deleting up to max_edits(len)
+    characters; a text word generates its own deletes and only the keyword words
+    sharing one are verified with a real edit distance. Lookup cost depends on
+    the text word's length, not on the number of rules.
+
+    A multi-word keyword matches when consecutive text words match its words in
+    order. Candidates must also agree on the first character, which keeps
+    ordinary words like "filled" from matching "killed".
+    """
+
+    def __init__(self, rules):
+        self.index = {}       # delete variant -> {keyword word, ...}
+        self.starts = {}      # first keyword word -> [(words, rule_idx, keyword), ...]
+        self.words = set()
+        self.max_depth = 0
+        for rule_idx, rule in enumerate(rules):
+            for keyword in rule[0]:
+                words = tuple(TOKEN_RE.findall(keyword.lower()))
+                if not words:
+                    continue
+                self.starts.setdefault(words[0], []).append((words, rule_idx, keyword))
+                for word in words:
+                    if word in self.words:
+                        continue
+                    self.words.add(word)
+                    depth = max_edits(len(word))
+                    self.max_depth = max(self.max_depth, depth)
+                    for variant in deletes(word, depth):
+                        self.index.setdefault(variant, set()).add(word)
+
+    def __len__(self):
+        return len(self.words)
+
+    def _candidates(self, token):
+        """{keyword word: edits} for the keyword words within reach of `token`."""
+        found = {token: 0} if token in self.words else {}
+        # A keyword word allows at most max_edits(len(keyword)) <= max_edits(len(token) + depth)
+        depth = min(self.max_depth, max_edits(len(token) + self.max_depth))
+        if depth == 0:
+            return found
+        for variant in deletes(token, depth):
+            for word in self.index.get(variant, ()):
+                if word in found or word[0] != token[0]:
+                    continue
+                limit = max_edits(len(word))
+                distance = edit_distance(token, word, limit)
+                if distance <= limit:
+                    found[word] = distance
+        return found
+
+    def match(self, text):
+        """{rule index: match} for rules with a keyword found approximately in `text`.
+
+        A match is {"keyword", "found", "edits", "confidence"} for the closest
+        keyword of the rule; confidence is 1 - edits / len(keyword), so fuzzy
+        hits always rank below exact ones. Exact-only occurrences are left to
+        the Aho-Corasick automaton and not reported here.
+        """
+        tokens = TOKEN_RE.findall(text.lower())
+        cache = {}
+
+        def candidates(token):
+            hit = cache.get(token)
+            if hit is None:
+                hit = cache[token] = self._candidates(token)
+            return hit
+
+        matches = {}
+        for i, token in enumerate(tokens):
+            for first, first_edits in candidates(token).items():
+                for words, rule_idx, keyword in self.starts.get(first, ()):
+                    if i + len(words) > len(tokens):
+                        continue
+                    edits = first_edits
+                    for offset in range(1, len(words)):
+                        word_edits = candidates(tokens[i + offset]).get(words[offset])
+                        if word_edits is None:
+                            break
+                        edits += word_edits
+                    else:
+                        if edits == 0:
+                            continue
+                        confidence = round(1.0 - edits / len(keyword), 3)
+                        best = matches.get(rule_idx)
+                        if best is None or confidence > best["confidence"]:
+                            matches[rule_idx] = {
+                                "keyword": keyword,
+                                "found": " ".join(tokens[i:i + len(words)]),
+                                "edits": edits,
+                                "confidence": confidence
+                            }
+        return matches
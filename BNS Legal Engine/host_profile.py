@@ -0,0 +1,61 @@
+import os
+import sys
+import json
+import platform
+
+# --- CONFIGURATION ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Written by tune_host.py; set LEGAL_HOST_PROFILE=0 to ignore it
+HOST_PROFILE_FILE = os.environ.get("LEGAL_HOST_PROFILE", os.path.join(BASE_DIR, "models", "host-profile.json"))
+PROFILE_FORMAT = 1
+
+
+def host_fingerprint():
+    """What a profile was tuned on; a profile from another machine is not applied."""
+    return {
+        "cpu_count": os.cpu_count(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def save_profile(profile, path=HOST_PROFILE_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"format": PROFILE_FORMAT, "host": host_fingerprint(), **profile}, f, indent=2)
+
+
+def load_profile(path=HOST_PROFILE_FILE, encoder=None):
+    """The tuned profile for this host and encoder, or None (missing, disabled, other format, host or encoder).
+
+    A profile measured with one encoder (e.g. the stub) says nothing about
+    another, so with `encoder` given a profile tuned for a different one is refused.
+
+    Returns (profile, reason) where reason says why nothing was loaded.
+    """
+    if path in ("", "0"):
+        return None, "disabled"
+    if not os.path.exists(path):
+        return None, "missing"
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+    except (OSError, ValueError) as e:
+        return None, f"unreadable: {e}"
+    if profile.get("format") != PROFILE_FORMAT:
+        return None, f"unsupported format {profile.get('format')}"
+    if profile.get("host") != host_fingerprint():
+        return None, "tuned on another host"
+    if encoder is not None and profile.get("encoder") != encoder:
+        return None, f"tuned for the {profile.get('encoder')} encoder, {encoder} is in use"
+    return profile, None
+
+
+def apply_threads(threads):
+    """Sets torch's intra-op thread count if torch is in use. Returns the count now in effect (None without torch)."""
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return None
+    if threads:
+        torch.set_num_threads(int(threads))
+    return torch.get_num_threads()
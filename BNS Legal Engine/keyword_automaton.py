@@ -0,0 +1,67 @@
+from collections import deque
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over the keyword rules.
+
+    Each keyword is stored with the index of the rule it belongs to, so one
+    pass over the text reports every rule that has at least one keyword
+    occurring as a substring (same semantics as `keyword in text.lower()`).
+    The scan state is a plain int, which lets callers resume scanning when
+    more text is appended instead of re-reading what they already saw.
+    """
+
+    def __init__(self, rules):
+        # rules: list of (keyword_list, ...) tuples, matched by rule index
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [set()]
+        for rule_idx, rule in enumerate(rules):
+            for keyword in rule[0]:
+                self._add(keyword.lower(), rule_idx)
+        self._build()
+
+    def _add(self, keyword, rule_idx):
+        if not keyword:
+            return
+        state = 0
+        for ch in keyword:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(set())
+                self.goto[state][ch] = nxt
+            state = nxt
+        self.output[state].add(rule_idx)
+
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.output[nxt] |= self.output[self.fail[nxt]]
+
+    def scan(self, text, state=0, matched=None):
+        """Scans `text` starting from `state`. Returns (new_state, matched_rule_ids)."""
+        if matched is None:
+            matched = set()
+        goto, fail, output = self.goto, self.fail, self.output
+        for ch in text.lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                matched |= output[state]
+        return state, matched
+
+    def match(self, text):
+        """Returns the set of rule indices with a keyword present in `text`."""
+        return self.scan(text)[1]
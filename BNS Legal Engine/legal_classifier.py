@@ -1,222 +1,653 @@
 import json
 import os
+import sys
 import glob
-from sentence_transformers import SentenceTransformer, util
+import hashlib
+import threading
+import time
+import numpy as np
+
+import engine_log as log
+
+# torch / sentence-transformers are imported on demand, the static encoder mode runs without them
+from keyword_automaton import KeywordAutomaton
+from fuzzy_keywords import FuzzyKeywordIndex
+from phonetic_keys import PhoneticKeywordIndex
+from static_encoder import StaticEncoder, StaticEncoderError, StubEncoder, STATIC_ENCODER_DIR
+from template_index import TemplateIndex
+from section_search import SectionSearchIndex
+from batch_planner import encode_planned, ENCODE_TOKEN_BUDGET
+from host_profile import load_profile, apply_threads, HOST_PROFILE_FILE
+from section_store import SectionStore, SectionStoreError, SECTION_STORE_DIR, sources_sha256
+from bm25 import BM25Index, TOKEN_RE, tokenize, lexical_confidence, top_k
 
 # --- CONFIGURATION ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # Files are now in the same directory
 TEMPLATES_DIR = os.path.join(BASE_DIR, "FIR REPORTS")
+# Template categories -> exemplar files and the sections they imply
+TEMPLATE_MANIFEST = os.path.join(BASE_DIR, "template_manifest.json")
 BNS_FILE = os.path.join(BASE_DIR, "bns_hindi.json")
 BNS_FILE_EN = os.path.join(BASE_DIR, "bns.json")
 SPECIAL_ACTS_FILE = os.path.join(BASE_DIR, "special_acts_hindi.json")
 SPECIAL_ACTS_FILE_EN = os.path.join(BASE_DIR, "special_acts.json")
+MODEL_PATH = os.path.join(BASE_DIR, "models", "paraphrase-multilingual-MiniLM-L12-v2")
+# Sentence encoder: "transformer" (model pack or raw MiniLM), "static" (NumPy token
+# embedding table built by build_static_encoder.py, no torch needed) or "stub"
+# (hashed words, no weights at all; load testing only, results are meaningless)
+ENCODER_MODE = os.environ.get("LEGAL_ENCODER", "transformer")
+# Optimized model pack built by build_model_pack.py (set LEGAL_MODEL_PACK=0 to ignore it)
+USE_MODEL_PACK = os.environ.get("LEGAL_MODEL_PACK", "1") != "0"
+# BM25 first stage: answer without the encoder when the lexical match is clear
+# (set LEGAL_LEXICAL_CASCADE=0 for the pure neural path)
+USE_LEXICAL_CASCADE = os.environ.get("LEGAL_LEXICAL_CASCADE", "1") != "0"
+LEXICAL_CONFIDENCE = 0.55 # lexical_confidence() needed to skip the encoder
+LEXICAL_MIN_SCORE = 0.35 # normalized BM25 score for a section / act to be listed
+HYBRID_LEXICAL_WEIGHT = 0.3 # how strongly BM25 evidence boosts the cosine similarity
+# Misspelled keywords ("रिश्वात", "kidnaped") found with the edit-distance index and
+# passed to the hybrid stage as lexical evidence; they never answer on their own,
+# everyday words are too often one edit away ("drums" / "drugs")
+# (set LEGAL_FUZZY_KEYWORDS=0 to disable)
+USE_FUZZY_KEYWORDS = os.environ.get("LEGAL_FUZZY_KEYWORDS", "1") != "0"
+FUZZY_EVIDENCE_WEIGHT = 0.5 # lexical score of a fuzzy match = weight x match confidence
+# Hinglish ("mere ghar me choree ho gayi") matched against the Devanagari keywords
+# by phonetic key (set LEGAL_PHONETIC_KEYWORDS=0 to disable)
+USE_PHONETIC_KEYWORDS = os.environ.get("LEGAL_PHONETIC_KEYWORDS", "1") != "0"
+# Stages that answer without running the encoder
+MODEL_FREE_STAGES = ("keyword", "phonetic", "lexical")
+# Stages that answer from the keyword rules (confidence 1.0, no template match)
+KEYWORD_STAGES = ("keyword", "phonetic")
+
+# BNS keyword rules: (keyword_list, section_nums, custom_msg)
+BNS_KEYWORD_RULES = [
+    # Murder
+    (["murder", "killed", "homicide", "assassination", "fatal attack", "murdered"], [100, 101, 102, 103], "Murder / Homicide"),
+    (["हत्या", "मार डाला", "कत्ल", "मौत", "जान से मारा"], [100, 101, 102, 103], "Murder / Homicide"),
+    
+    # Rape / Sexual Assault
+    (["rape", "sexual assault", "gang rape", "sexual violence", "forced sex"], [63, 64, 65, 66, 70], "Rape / Sexual Assault"),
+    (["बलात्कार", "यौन हमला", "सामूहिक बलात्कार", "जबरदस्ती"], [63, 64, 65, 66, 70], "Rape / Sexual Assault"),
+    
+    # Kidnapping / Abduction
+    (["kidnapping", "abduction", "kidnapped", "missing person", "abducted"], [87, 88, 89], "Kidnapping / Abduction"),
+    (["अपहरण", "अगवा", "गायब"], [87, 88, 89], "Kidnapping / Abduction"),
+    
+    # Theft / Robbery
+    (["theft", "robbery", "burglary", "stolen", "loot", "dacoity", "snatching", "pickpocket"], [305, 306, 307, 309], "Theft / Robbery"),
+    (["चोरी", "लूट", "डकैती", "चोरी हुई", "छीनना", "जेबकतरा"], [305, 306, 307, 309], "Theft / Robbery"),
+    
+    # Fraud / Cheating
+    (["fraud", "cheating", "scam", "defraud", "con", "fake", "forgery", "embezzlement"], [318, 319, 320], "Fraud / Cheating"),
+    (["धोखाधड़ी", "ठगी", "फरेब", "नकली", "जालसाजी"], [318, 319, 320], "Fraud / Cheating"),
+    
+    # Assault / Harassment
+    (["assault", "harassment", "molestation", "eve teasing", "stalking", "beating", "attack"], [74, 75, 76, 77, 78, 79], "Assault / Harassment"),
+    (["हमला", "उत्पीड़न", "छेड़छाड़", "पीछा करना", "मारपीट"], [74, 75, 76, 77, 78, 79], "Assault / Harassment"),
+    
+    # Extortion / Blackmail
+    (["extortion", "blackmail", "ransom", "threatening", "demand money"], [351, 352, 353, 354, 355, 356, 357, 358], "Extortion / Blackmail"),
+    (["जबरन वसूली", "ब्लैकमेल", "फिरौती", "धمकी", "पैसे की मांग"], [351, 352, 353, 354, 355, 356, 357, 358], "Extortion / Blackmail"),
+    
+    # Dowry Death
+    (["dowry death", "bride burning", "dowry murder"], [80], "Dowry Death"),
+    (["दहेज मृत्यु", "दहेज हत्या", "दुल्हन जलाना"], [80], "Dowry Death"),
+    
+    # Cruelty / Domestic Violence
+    (["cruelty", "torture", "domestic abuse", "wife beating", "mental torture"], [85, 86], "Cruelty / Domestic Violence"),
+    (["क्रूरता", "प्रताड़ना", "घरेलू हिंसा", "पत्नी की पिटाई", "मानसिक यातना"], [85, 86], "Cruelty / Domestic Violence"),
+    
+    # Accident / Negligence
+    (["accident", "negligence", "rash driving", "hit and run", "vehicular homicide", "car accident", "drink and drive", "drink drive", "drunk driving", "drunken driving"], [23, 24, 106], "Causing death by negligence / Intoxication"),
+    (["दुर्घटना", "लापरवाही", "तेज ड्राइविंग", "हिट एंड रन", "गाड़ी दुर्घटना", "शराब पीकर वाहन", "शराब पीकर ड्राइविंग", "नशे में गाड़ी"], [23, 24, 106], "Causing death by negligence / Intoxication"),
+    
+    # Hurt / Grievous Hurt
+    (["hurt", "injury", "grievous hurt", "wounded", "beaten", "physical assault"], [115, 117, 118, 124, 125, 126, 127], "Hurt / Grievous Hurt"),
+    (["चोट", "गंभीर चोट", "घायल", "मारपीट", "शारीरिक हमला"], [115, 117, 118, 124, 125, 126, 127], "Hurt / Grievous Hurt"),
+    
+    # Attempt to Murder
+    (["attempt to murder", "tried to kill", "murder attempt", "attack with intent"], [109], "Attempt to Murder"),
+    (["हत्या का प्रयास", "मारने की कोशिश", "जान से मारने की कोशिश"], [109], "Attempt to Murder"),
+    
+    # Defamation
+    (["defamation", "slander", "libel", "false accusation", "reputation damage"], [356], "Defamation"),
+    (["मानहानि", "झूठा आरोप", "बदनामी", "इज्जत खराब"], [356], "Defamation"),
+    
+    # Trespass
+    (["trespass", "illegal entry", "breaking in", "house breaking"], [303, 304], "Trespass / House Breaking"),
+    (["अतिक्रमण", "अवैध प्रवेश", "घर में घुसना"], [303, 304], "Trespass / House Breaking"),
+    
+    # Abetment of Suicide
+    (["suicide", "abetment of suicide", "drove to suicide"], [107, 108], "Abetment of Suicide"),
+    (["आत्महत्या", "आत्महत्या के लिए उकसाना", "आत्महत्या के लिए मजबूर"], [107, 108], "Abetment of Suicide"),
+    
+    # Sedition / Acts Endangering Sovereignty (BNS 152)
+    (["sedition", "treason", "anti-national", "sovereignty"], [152], "Acts endangering sovereignty, unity and integrity of India"),
+    (["राष्ट्रद्रोह", "देशद्रोह", "गद्दारी", "राष्ट्रद्रोद"], [152], "Acts endangering sovereignty, unity and integrity of India"),
+
+    # Riot / Mob Violence
+    (["riot", "mob violence", "unlawful assembly", "public disorder", "lynching"], [189, 190, 191], "Riot / Unlawful Assembly"),
+    (["दंगा", "भीड़ हिंसा", "अवैध जमावड़ा", "भीड़ द्वारा हत्या"], [189, 190, 191], "Riot / Unlawful Assembly"),
+]
+
+# Add backward compatible rules
+BNS_KEYWORD_RULES.extend([
+    (["नौकर कर्मचारी द्वार चोरी", "naukar karmchari dwara chori"], [306], "Theft by clerk or servant."),
+    (["घर में चोरी", "ghar me chori"], [305], "Theft in dwelling house, etc."),
+    (["रास्ते में चीज मिली और उसने लौटा दी नहीं", "raste me chij mili aur usne lauta di nahi"], [314], "Dishonest misappropriation of property."),
+    (["दुर्घटना सामने वाले की वजह से हुई और मौत हो गई", "durghatna samne wale ki wajah se hui aur maut ho gai"], [106], "Causing death by negligence."),
+    (["दुर्घटना में चोट लगी", "durghatna me chot lagi"], [115, 117], "Voluntarily causing hurt / Grievous hurt."),
+    (["सिर्फ जान को खतरा था", "sirf jaan ko khatra tha"], [125], "Act endangering life or personal safety of others."),
+])
+
+# Special acts keyword rules: (keywords_list, act_identifier, lang_filter)
+SPECIAL_ACTS_KEYWORD_RULES = [
+    # IT Act, 2000
+    (["hack", "hacking", "cyber", "cybercrime", "online fraud", "data theft", "phishing", "identity theft", "computer crime"], "IT Act, 2000", "en"),
+    (["हैकिंग", "साइबर", "साइबर अपराध", "ऑनलाइन धोखाधड़ी", "डेटा चोरी", "कंप्यूटर अपराध"], "IT Act, 2000", "hi"),
+    
+    # NDPS Act, 1985
+    (["drugs", "drug", "narcotics", "heroin", "cocaine", "ganja", "charas", "opium", "drug trafficking", "drug possession"], "NDPS Act, 1985", "en"),
+    (["ड्रग्स", "नशीले पदार्थ", "हेरोइन", "कोकीन", "गांजा", "चरस", "अफीम", "नशा"], "NDPS Act, 1985", "hi"),
+    
+    # POCSO Act, 2012
+    (["child abuse", "child sexual", "minor sexual", "child pornography", "pedophile", "child harassment"], "POCSO Act, 2012", "en"),
+    (["बच्चे के साथ यौन", "नाबालिग यौन", "बाल यौन शोषण", "बच्चे के साथ उत्पीड़न"], "POCSO Act, 2012", "hi"),
+    
+    # Prevention of Corruption Act, 1988
+    (["bribe", "bribery", "corruption", "corrupt official", "kickback"], "Prevention of Corruption Act, 1988", "en"),
+    (["रिश्वत", "भ्रष्टाचार", "घूस"], "Prevention of Corruption Act, 1988", "hi"),
+    
+    # Dowry Prohibition Act, 1961
+    (["dowry", "dowry death", "dowry harassment", "dowry demand"], "Dowry Prohibition Act, 1961", "en"),
+    (["दहेज", "दहेज हत्या", "दहेज प्रताड़ना"], "Dowry Prohibition Act, 1961", "hi"),
+    
+    # Wildlife Protection Act, 1972
+    (["wildlife", "poaching", "hunting", "endangered species", "illegal hunting"], "Wildlife Protection Act, 1972", "en"),
+    (["वन्यजीव", "शिकार", "अवैध शिकार"], "Wildlife Protection Act, 1972", "hi"),
+    
+    # PCMA, 2006
+    (["child marriage", "underage marriage", "minor marriage"], "PCMA, 2006", "en"),
+    (["बाल विवाह", "नाबालिग विवाह"], "PCMA, 2006", "hi"),
+    
+    # UAPA, 1967
+    (["terrorism", "terrorist", "terror attack", "unlawful activity"], "UAPA, 1967", "en"),
+    (["आतंकवाद", "आतंकवादी", "आतंकी हमला"], "UAPA, 1967", "hi"),
+    
+    # Domestic Violence Act, 2005
+    (["domestic violence", "marital abuse", "wife beating", "physical abuse wife"], "Domestic Violence Act, 2005", "en"),
+    (["घरेलू हिंसा", "पत्नी प्रताड़ना", "पत्नी की पिटाई"], "Domestic Violence Act, 2005", "hi"),
+    
+    # SC/ST Act, 1989
+    (["caste discrimination", "atrocity", "untouchability", "caste abuse", "dalit harassment", "st st jati wad", "scheduled caste", "scheduled tribe"], "SC/ST Act, 1989", "en"),
+    (["जातिगत भेदभाव", "अत्याचार", "अस्पृश्यता", "अनुसूचित जनजाति", "अनुसूचित जाति", "जाति वाद", "जातिवाद", "छुआछूत", "शिड्युल्ड कास्ट", "शिद्युल्ड ट्राईब", "एट्रोसीटीझ", "दलित"], "SC/ST Act, 1989", "hi"),
+    
+    # IT Act (Added Social Media context for Jatiwad FIR)
+    (["facebook", "social media", "whatsapp", "website", "posted online"], "IT Act, 2000", "en"),
+    (["फेसबुक", "सोशल मीडिया", "व्हाट्सएप", "वेबसाइट", "ऑनलाइन पोस्ट"], "IT Act, 2000", "hi"),
+]
+
+
 class LegalClassifier:
-    def __init__(self):
-        print("Initializing LegalClassifier...")
+    def __init__(self, use_model_pack=USE_MODEL_PACK, lexical_cascade=USE_LEXICAL_CASCADE, encoder=ENCODER_MODE,
+                 fuzzy_keywords=USE_FUZZY_KEYWORDS, phonetic_keywords=USE_PHONETIC_KEYWORDS, host_profile=True):
+        log.info("Initializing LegalClassifier...")
+
+        # Columnar stores (one per act, both languages); the *_data views index them like the JSON lists
+        self.bns_store = self._load_section_store("bns", {"hi": BNS_FILE, "en": BNS_FILE_EN})
+        self.special_acts_store = self._load_section_store("special_acts", {"hi": SPECIAL_ACTS_FILE, "en": SPECIAL_ACTS_FILE_EN})
+        self.bns_data = self.bns_store.view('hi') # Hindi (Default)
+        self.bns_data_en = self.bns_store.view('en') # English
+        self.special_acts_data = self.special_acts_store.view('hi') # Hindi Special Acts
+        self.special_acts_data_en = self.special_acts_store.view('en') # English Special Acts
+        self.templates = self._load_templates()
+
+        self.template_embeddings = None
+        self.bns_embeddings = None # Lazy loaded for fallback
+        self.special_acts_embeddings = None # Lazy loaded for special acts search
+        self.section_index = None # Built on the first section search
+        self.section_index_lock = threading.Lock()
+        self.model_info = {"source": None}
+
+        if encoder == "static":
+            self.model = self._load_static_encoder()
+        elif encoder == "stub":
+            log.warning("⚠ Using the stub encoder: semantic results are not meaningful (load testing only)")
+            self.model = StubEncoder()
+            self.model_info = {"source": "stub", "latency_ms": self.model.latency_ms}
+        # 1. Prefer the optimized model pack (quantized model + precomputed embeddings),
+        # 2. otherwise the raw SentenceTransformer from download_model.py
+        elif not (use_model_pack and self._load_model_pack()):
+            self.model = self._load_raw_model()
+        # Before the first corpus is encoded, so it already runs with the tuned threads
+        self._apply_host_profile(host_profile)
+
+        if self.template_embeddings is None:
+            self.template_embeddings = self._embed_templates()
+        self.template_index = None
+        if self.templates:
+            self.template_index = TemplateIndex(self.template_embeddings, [t['category'] for t in self.templates])
+
+        self.bns_automaton = KeywordAutomaton(BNS_KEYWORD_RULES)
+        self.special_acts_automaton = KeywordAutomaton(SPECIAL_ACTS_KEYWORD_RULES)
+        self.bns_phonetic = self.special_acts_phonetic = None
+        if phonetic_keywords:
+            self.bns_phonetic = PhoneticKeywordIndex(BNS_KEYWORD_RULES)
+            self.special_acts_phonetic = PhoneticKeywordIndex(SPECIAL_ACTS_KEYWORD_RULES)
+        self.bns_fuzzy = self.special_acts_fuzzy = None
+        if fuzzy_keywords:
+            self.bns_fuzzy = FuzzyKeywordIndex(BNS_KEYWORD_RULES)
+            self.special_acts_fuzzy = FuzzyKeywordIndex(SPECIAL_ACTS_KEYWORD_RULES)
+
+        self.lexical_cascade = lexical_cascade
+        if lexical_cascade:
+            self._build_lexical_indexes()
 
-        # 1. Try to load from bundled local path (Enforce Offline)
-        model_path = os.path.join(BASE_DIR, "models", "paraphrase-multilingual-MiniLM-L12-v2")
-        print(f"Loading model from: {model_path}")
+        # Which stage answered each request (see stats())
+        self.stage_counts = {"keyword": 0, "phonetic": 0, "lexical": 0, "hybrid": 0, "neural": 0}
+        self.stats_lock = threading.Lock()
+
+    def _apply_host_profile(self, enabled=True):
+        """Applies the tune_host.py profile: torch threads, bulk token budget, concurrent encodes.
+
+        Explicit environment settings (LEGAL_ENCODE_TOKEN_BUDGET) win over the profile,
+        and a profile tuned with another encoder than the loaded one is ignored.
+        """
+        profile, reason = load_profile(encoder=self.model_info.get("source")) if enabled else (None, "disabled")
+        profile = profile or {}
+        if reason in ("disabled", "missing"):
+            log.info("Host profile not applied", path=HOST_PROFILE_FILE, reason=reason)
+        elif reason:
+            log.warning("⚠ Host profile ignored, re-run tune_host.py", path=HOST_PROFILE_FILE, reason=reason)
+        budget = ENCODE_TOKEN_BUDGET
+        if "LEGAL_ENCODE_TOKEN_BUDGET" not in os.environ and profile.get("encode_token_budget"):
+            budget = int(profile["encode_token_budget"])
+        workers = profile.get("workers")
+        self.encode_token_budget = budget
+        # Caps how many requests run the encoder at once (each one uses intra_op_threads)
+        self.encode_slots = threading.BoundedSemaphore(int(workers)) if workers else None
+        self.tuning = {
+            "profile": HOST_PROFILE_FILE if profile else None,
+            "reason": reason,
+            "created": profile.get("created"),
+            "tuned_encoder": profile.get("encoder"),
+            "intra_op_threads": apply_threads(profile.get("intra_op_threads")),
+            "encode_token_budget": budget,
+            "workers": workers,
+            "document_workers": profile.get("document_workers")
+        }
+        if profile:
+            log.info("✔ Host profile applied", threads=self.tuning["intra_op_threads"],
+                     token_budget=budget, workers=workers)
+
+    def _load_raw_model(self):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ImportError("sentence-transformers is not installed. Install it or set LEGAL_ENCODER=static.")
+        # Load from bundled local path (Enforce Offline)
+        log.info("Loading model", path=MODEL_PATH)
         
-        if os.path.exists(model_path):
+        if os.path.exists(MODEL_PATH):
             try:
-                self.model = SentenceTransformer(model_path, device='cpu', local_files_only=True)
-                print("✔ Model loaded (OFFLINE MODE)")
+                model = SentenceTransformer(MODEL_PATH, device='cpu', local_files_only=True)
+                log.info("✔ Model loaded (OFFLINE MODE)")
             except Exception as e:
-                print(f"⚠ Error loading local model: {e}")
+                log.error("⚠ Error loading local model", error=e)
                 raise e
         else:
-            print("⚠ Model not found locally.")
-            print(f"Please run 'python download_model.py' to download the model to '{model_path}'")
+            log.error("⚠ Model not found locally. Please run 'python download_model.py'", path=MODEL_PATH)
             # We raise error here to stop execution rather than trying to download and failing
-            raise FileNotFoundError(f"Model not found at {model_path}. Please run download_model.py.")
+            raise FileNotFoundError(f"Model not found at {MODEL_PATH}. Please run download_model.py.")
+        self.model_info = {"source": "raw", "path": MODEL_PATH}
+        return model
 
-        self.bns_data = self._load_data(BNS_FILE) # Hindi (Default)
-        self.bns_data_en = self._load_data(BNS_FILE_EN) # English
-        self.special_acts_data = self._load_data(SPECIAL_ACTS_FILE) # Hindi Special Acts
-        self.special_acts_data_en = self._load_data(SPECIAL_ACTS_FILE_EN) # English Special Acts
-        self.templates = self._load_templates()
-        self.template_embeddings = self._embed_templates()
-        self.bns_embeddings = None # Lazy loaded for fallback
-        self.special_acts_embeddings = None # Lazy loaded for special acts search
+    def _load_static_encoder(self):
+        log.info("Loading static encoder", path=STATIC_ENCODER_DIR)
+        try:
+            model = StaticEncoder(STATIC_ENCODER_DIR)
+        except StaticEncoderError as e:
+            log.error(f"⚠ {e}")
+            raise
+        self.model_info = {
+            "source": "static",
+            "path": STATIC_ENCODER_DIR,
+            "dimensions": model.dim,
+            "vocab_size": model.vocab_size,
+            "created": model.manifest.get("created")
+        }
+        log.info("✔ Static encoder loaded", tokens=model.vocab_size, dims=model.dim)
+        return model
 
-    def _load_data(self, filepath):
+    def _load_model_pack(self):
+        """Loads the verified model pack. Returns False (raw model is used) if it is missing or invalid."""
+        from model_pack import load_model_pack, ModelPackError, MODEL_PACK_DIR
+        if not os.path.exists(MODEL_PACK_DIR):
+            return False
+        log.info("Loading model pack", path=MODEL_PACK_DIR)
+        try:
+            self.model, embeddings, manifest = load_model_pack(self._corpus_texts(), MODEL_PACK_DIR)
+        except ModelPackError as e:
+            log.warning("⚠ Model pack rejected, falling back to raw model", error=e)
+            return False
+        self.template_embeddings = self._normalize(embeddings.get('templates'))
+        self.bns_embeddings = self._normalize(embeddings.get('bns'))
+        self.special_acts_embeddings = self._normalize(embeddings.get('special_acts'))
+        self.model_info = {
+            "source": "model_pack",
+            "path": MODEL_PACK_DIR,
+            "quantization": manifest.get("quantization"),
+            "created": manifest.get("created"),
+            "precomputed": sorted(embeddings)
+        }
+        log.info("✔ Model pack loaded", quantization=manifest.get('quantization'),
+                 precomputed=','.join(sorted(embeddings)) or 'none')
+        return True
+
+    def _corpus_texts(self):
+        """The texts behind each embedding matrix, keyed by corpus name."""
+        return {
+            "templates": self._template_texts(),
+            "bns": self._bns_index_texts(),
+            "special_acts": self._special_acts_index_texts()
+        }
+
+    def _template_texts(self):
+        return [t['content'] for t in self.templates]
+
+    def _bns_index_texts(self, data=None):
+        # We build embeddings on HINDI data usually for better alignment with Hindi FIRs
+        # But the model is multilingual. Let's stick to base data (Hindi) for indexing to be consistent.
+        return [
+            f"{item.get('chapter_title', '')} {item.get('section_title', '')} {item.get('section_desc', '')}"
+            for item in (self.bns_data if data is None else data)
+        ]
+
+    def _special_acts_index_texts(self):
+        # Use Hindi data for indexing (multilingual model handles both)
+        return [act.get('section_desc', '') for act in self.special_acts_data]
+
+    def _build_lexical_indexes(self):
+        """BM25 indexes over templates and both languages of the BNS / special acts data."""
+        self.template_bm25 = BM25Index(self._template_texts())
+        # Hindi and English are indexed separately (different vocabularies) and
+        # their scores are merged per section, aligned with the Hindi embedding order.
+        # Both language views are aligned on store rows, so document ids are positions.
+        self.bns_bm25 = [
+            BM25Index(self._bns_index_texts(data))
+            for data in (self.bns_data, self.bns_data_en)
+        ]
+        self.special_acts_bm25 = [
+            BM25Index([f"{act.get('section_title', '')} {act.get('section_desc', '')}" for act in data])
+            for data in (self.special_acts_data, self.special_acts_data_en)
+        ]
+
+    def _lexical_scores(self, input_fir):
+        """Normalized BM25 scores per corpus, aligned with the embedding matrices."""
+        tokens = tokenize(input_fir)
+        return {
+            "templates": self.template_bm25.normalized_scores(tokens),
+            "bns": self._merged_bm25(self.bns_bm25, tokens),
+            "special_acts": self._merged_bm25(self.special_acts_bm25, tokens)
+        }
+
+    @staticmethod
+    def _merged_bm25(indexes, tokens):
+        """Best normalized score per section over the language indexes."""
+        return [max(scores) for scores in zip(*(index.normalized_scores(tokens) for index in indexes))]
+
+    def _count_stage(self, stage):
+        with self.stats_lock:
+            self.stage_counts[stage] += 1
+
+    def stats(self):
+        """Share of requests answered by each stage, and without invoking the model."""
+        with self.stats_lock:
+            counts = dict(self.stage_counts)
+        total = sum(counts.values())
+        model_free = sum(counts[stage] for stage in MODEL_FREE_STAGES)
+        return {
+            "requests": total,
+            "stages": counts,
+            "model_free_share": (model_free / total) if total else 0.0
+        }
+
+    def speech_vocabulary(self):
+        """Phrases a speech recognizer should favour: every keyword rule and section title.
+
+        Phrases are lower-cased and reduced to the tokens the engine itself sees
+        (TOKEN_RE), so a recognized phrase hits the keyword fast path as is. The
+        version is a hash of the phrase list; it changes when the rules or the
+        datasets do.
+        """
+        phrases = set()
+        for keywords, *_ in BNS_KEYWORD_RULES + SPECIAL_ACTS_KEYWORD_RULES:
+            phrases.update(keywords)
+        for store in (self.bns_store, self.special_acts_store):
+            for lang in store.languages:
+                column = store.texts[lang]["section_title"]
+                phrases.update(column[row] for row in range(len(store)) if column.present[row])
+        phrases = sorted({" ".join(TOKEN_RE.findall(p.lower())) for p in phrases} - {""})
+        return {
+            "version": hashlib.sha256("\n".join(phrases).encode('utf-8')).hexdigest()[:12],
+            "phrases": phrases
+        }
+
+    def memory_report(self):
+        """Approximate bytes held by component: model weights, embedding matrices, datasets."""
+        embeddings = {
+            name: int(matrix.nbytes)
+            for name, matrix in (
+                ("templates", self.template_embeddings),
+                ("bns", self.bns_embeddings),
+                ("special_acts", self.special_acts_embeddings)
+            )
+            if matrix is not None
+        }
+        if self.section_index is not None:
+            embeddings["section_index"] = self.section_index.nbytes
+        datasets = {
+            "bns": self.bns_store.nbytes(),
+            "special_acts": self.special_acts_store.nbytes(),
+            "templates": sum(sys.getsizeof(t['content']) for t in self.templates)
+        }
+        model = self._model_nbytes()
+        return {
+            "model": model,
+            "embeddings": embeddings,
+            "datasets": datasets,
+            "total": model + sum(embeddings.values()) + sum(datasets.values())
+        }
+
+    def _model_nbytes(self):
+        if hasattr(self.model, 'nbytes'):
+            return int(self.model.nbytes())
+        total = 0
+        for value in self.model.state_dict().values():
+            # Quantized layers keep their weights as a (weight, bias) tuple
+            for tensor in (value if isinstance(value, (tuple, list)) else (value,)):
+                if hasattr(tensor, 'element_size'):
+                    total += tensor.numel() * tensor.element_size()
+        return total
+
+    def _data_path(self, filepath):
         if not os.path.exists(filepath):
              # Fallback logic for path
              local_path = os.path.join(BASE_DIR, "..", os.path.basename(filepath))
-             if os.path.exists(local_path):
-                 with open(local_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-             return []
-        with open(filepath, 'r', encoding='utf-8') as f:
+             return local_path if os.path.exists(local_path) else None
+        return filepath
+
+    def _load_data(self, filepath):
+        path = self._data_path(filepath)
+        if path is None:
+            return []
+        with open(path, 'r', encoding='utf-8') as f:
             return json.load(f)
 
+    def _load_section_store(self, name, files):
+        """Prebuilt store from build_section_store.py if it matches the JSON files, else parse the JSON."""
+        paths = [path for path in map(self._data_path, files.values()) if path]
+        sources = sources_sha256(paths)
+        store_path = os.path.join(SECTION_STORE_DIR, f"{name}.npz")
+        if os.path.exists(store_path):
+            try:
+                return SectionStore.load(store_path, sources=sources)
+            except SectionStoreError as e:
+                log.warning(f"⚠ {e}, reading the JSON files instead")
+        return SectionStore.from_records(
+            {lang: self._load_data(path) for lang, path in files.items()}, sources=sources
+        )
+
     def _load_templates(self):
+        """Exemplar FIRs with their category index into self.template_categories.
+
+        Categories come from template_manifest.json; a top-level file the manifest
+        does not list becomes its own category without logic.
+        """
         templates = []
         # Check if dir exists, if not try relative match
         search_dir = TEMPLATES_DIR
         if not os.path.exists(search_dir):
             search_dir = os.path.join(BASE_DIR, "..", "FIR REPORTS")
-            
+
+        manifest = self._load_data(TEMPLATE_MANIFEST) or {}
+        self.template_categories = []
+        category_of = {}
+        for category in manifest.get("categories", []):
+            idx = len(self.template_categories)
+            self.template_categories.append({
+                "id": category["id"],
+                "rule": (category.get("sections", []), category.get("message", ""))
+            })
+            for pattern in category.get("files", []):
+                for filepath in sorted(glob.glob(os.path.join(search_dir, pattern))):
+                    category_of.setdefault(os.path.relpath(filepath, search_dir), idx)
+
+        # Top-level files first (in directory order), then exemplars kept in sub folders
         filepaths = glob.glob(os.path.join(search_dir, "*.txt"))
+        filepaths += [
+            os.path.join(search_dir, name) for name in sorted(category_of)
+            if os.path.dirname(name)
+        ]
         for filepath in filepaths:
-            filename = os.path.basename(filepath)
+            filename = os.path.relpath(filepath, search_dir)
+            if filename not in category_of:
+                category_of[filename] = len(self.template_categories)
+                self.template_categories.append({"id": filename, "rule": None})
             with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
-            templates.append({"filename": filename, "content": content})
+            templates.append({"filename": filename, "content": content, "category": category_of[filename]})
         return templates
 
     def _embed_templates(self):
         if not self.templates:
             return None
-        texts = [t['content'] for t in self.templates]
-        return self.model.encode(texts, convert_to_tensor=True)
+        return self._encode(self._template_texts())
+
+    def _encode(self, texts):
+        """Unit-length float32 embeddings, so cosine similarity is a dot product.
+
+        Lists (corpus builds) go through the batch planner: similar lengths are
+        batched together under a token budget instead of padding section
+        descriptions up to the length of the FIR templates.
+        """
+        if isinstance(texts, str):
+            if self.encode_slots is None:
+                return self._normalize(self.model.encode(texts, convert_to_numpy=True))
+            with self.encode_slots:
+                return self._normalize(self.model.encode(texts, convert_to_numpy=True))
+        return self._normalize(encode_planned(self.model, texts, token_budget=self.encode_token_budget))
+
+    @staticmethod
+    def _normalize(embeddings):
+        if embeddings is None:
+            return None
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    @staticmethod
+    def _top_indices(scores, k):
+        """Indices of the k highest scores, best first."""
+        k = min(k, len(scores))
+        idx = np.argpartition(-scores, k - 1)[:k]
+        return idx[np.argsort(-scores[idx], kind='stable')]
 
     def _get_section_details(self, section_num, lang='hi'):
-        data_source = self.bns_data_en if lang == 'en' else self.bns_data
-        for item in data_source:
-            if item.get('Section') == section_num:
-                return item
-        return None
+        return self.bns_store.get(section_num, 'en' if lang == 'en' else 'hi')
+
+    def _fuse_scores(self, scores, lexical_scores):
+        """Hybrid score: lexical evidence pulls the cosine similarity towards 1.
+
+        It never lowers a score, so the existing similarity thresholds keep
+        their meaning for documents BM25 knows nothing about.
+        """
+        if lexical_scores is None:
+            return scores
+        lexical = np.asarray(lexical_scores, dtype=scores.dtype)
+        return scores + HYBRID_LEXICAL_WEIGHT * lexical * (1 - scores)
 
-    def _fallback_search(self, input_embedding, lang='hi'):
-        print(f"Fallback: Performing semantic search on BNS data ({lang})...")
+    def _localize_section(self, matched_item_hi, lang='hi'):
+        """Returns a (Hindi-indexed) BNS item in the requested language."""
+        # Retrieve the item from the requested language dataset
+        # Assuming parallel structure (index 0 in hi == index 0 in en)
+        # If they are not perfectly aligned by index, we must search by Section ID.
+        
+        # Safer: Get Section ID from matched (Hindi) item, then find it in Target Lang
+        target_item = self._get_section_details(matched_item_hi.get('Section'), lang)
+        return target_item if target_item else matched_item_hi # Fallback to Hindi if En missing
+
+    def _special_act_entry(self, act, score):
+        return {
+            'chapter': act.get('chapter', 0),
+            'chapter_title': act.get('chapter_title', ''),
+            'Section': act.get('Section', ''),
+            'section_title': act.get('section_title', ''),
+            'section_desc': act.get('section_desc', ''),
+            'confidence': float(score)
+        }
+
+    def _fallback_search(self, input_embedding, lang='hi', lexical_scores=None):
         # NOTE: Search is always done on semantic meaning. 
         # But we return the result in the requested language.
         
         if self.bns_embeddings is None:
-            # We build embeddings on HINDI data usually for better alignment with Hindi FIRs
-            # But the model is multilingual. Let's stick to base data (Hindi) for indexing to be consistent.
-            texts = [
-                f"{item.get('chapter_title', '')} {item.get('section_title', '')} {item.get('section_desc', '')}"
-                for item in self.bns_data
-            ]
-            self.bns_embeddings = self.model.encode(texts, convert_to_tensor=True)
+            self.bns_embeddings = self._encode(self._bns_index_texts())
         
-        scores = util.cos_sim(input_embedding, self.bns_embeddings)[0]
-        top_results = scores.topk(5)
+        scores = self.bns_embeddings @ input_embedding
+        scores = self._fuse_scores(scores, lexical_scores)
+        top_indices = self._top_indices(scores, 5)
         
         relevant_items = []
-        for score, idx in zip(top_results.values, top_results.indices):
+        for score, idx in zip(scores[top_indices], top_indices):
             if score > 0.3: # Minimum relevance threshold
-                # Retrieve the item from the requested language dataset
-                # Assuming parallel structure (index 0 in hi == index 0 in en)
-                # If they are not perfectly aligned by index, we must search by Section ID.
-                
-                # Safer: Get Section ID from matched (Hindi) item, then find it in Target Lang
-                matched_item_hi = self.bns_data[idx]
-                target_item = self._get_section_details(matched_item_hi.get('Section'), lang)
-                
-                if target_item:
-                    relevant_items.append(target_item)
-                else:
-                     relevant_items.append(matched_item_hi) # Fallback to Hindi if En missing
+                relevant_items.append(self._localize_section(self.bns_data[idx], lang))
+        if log.detail_enabled():
+            log.detail("fallback_search", lang=lang, top_score=round(float(scores[top_indices[0]]), 4),
+                       sections=[item.get('Section') for item in relevant_items])
         return relevant_items
 
     def _get_bns_keyword_matches(self, input_text, lang='hi'):
         """Checks input text for specific keywords and returns list of corresponding section details."""
-        input_lower = input_text.lower()
+        return self._resolve_bns_rules(self.bns_automaton.match(input_text), lang)
+
+    def _resolve_bns_rules(self, rule_ids, lang='hi'):
+        """Turns matched BNS rule indices into (section details, messages)."""
         matched_sections = []
         seen_section_ids = set()
         matched_messages = []
-        
-        # Define rules: (keyword_list, section_nums, custom_msg)
-        rules = [
-            # Murder
-            (["murder", "killed", "homicide", "assassination", "fatal attack", "murdered"], [100, 101, 102, 103], "Murder / Homicide"),
-            (["हत्या", "मार डाला", "कत्ल", "मौत", "जान से मारा"], [100, 101, 102, 103], "Murder / Homicide"),
-            
-            # Rape / Sexual Assault
-            (["rape", "sexual assault", "gang rape", "sexual violence", "forced sex"], [63, 64, 65, 66, 70], "Rape / Sexual Assault"),
-            (["बलात्कार", "यौन हमला", "सामूहिक बलात्कार", "जबरदस्ती"], [63, 64, 65, 66, 70], "Rape / Sexual Assault"),
-            
-            # Kidnapping / Abduction
-            (["kidnapping", "abduction", "kidnapped", "missing person", "abducted"], [87, 88, 89], "Kidnapping / Abduction"),
-            (["अपहरण", "अगवा", "गायब"], [87, 88, 89], "Kidnapping / Abduction"),
-            
-            # Theft / Robbery
-            (["theft", "robbery", "burglary", "stolen", "loot", "dacoity", "snatching", "pickpocket"], [305, 306, 307, 309], "Theft / Robbery"),
-            (["चोरी", "लूट", "डकैती", "चोरी हुई", "छीनना", "जेबकतरा"], [305, 306, 307, 309], "Theft / Robbery"),
-            
-            # Fraud / Cheating
-            (["fraud", "cheating", "scam", "defraud", "con", "fake", "forgery", "embezzlement"], [318, 319, 320], "Fraud / Cheating"),
-            (["धोखाधड़ी", "ठगी", "फरेब", "नकली", "जालसाजी"], [318, 319, 320], "Fraud / Cheating"),
-            
-            # Assault / Harassment
-            (["assault", "harassment", "molestation", "eve teasing", "stalking", "beating", "attack"], [74, 75, 76, 77, 78, 79], "Assault / Harassment"),
-            (["हमला", "उत्पीड़न", "छेड़छाड़", "पीछा करना", "मारपीट"], [74, 75, 76, 77, 78, 79], "Assault / Harassment"),
-            
-            # Extortion / Blackmail
-            (["extortion", "blackmail", "ransom", "threatening", "demand money"], [351, 352, 353, 354, 355, 356, 357, 358], "Extortion / Blackmail"),
-            (["जबरन वसूली", "ब्लैकमेल", "फिरौती", "धمकी", "पैसे की मांग"], [351, 352, 353, 354, 355, 356, 357, 358], "Extortion / Blackmail"),
-            
-            # Dowry Death
-            (["dowry death", "bride burning", "dowry murder"], [80], "Dowry Death"),
-            (["दहेज मृत्यु", "दहेज हत्या", "दुल्हन जलाना"], [80], "Dowry Death"),
-            
-            # Cruelty / Domestic Violence
-            (["cruelty", "torture", "domestic abuse", "wife beating", "mental torture"], [85, 86], "Cruelty / Domestic Violence"),
-            (["क्रूरता", "प्रताड़ना", "घरेलू हिंसा", "पत्नी की पिटाई", "मानसिक यातना"], [85, 86], "Cruelty / Domestic Violence"),
-            
-            # Accident / Negligence
-            (["accident", "negligence", "rash driving", "hit and run", "vehicular homicide", "car accident", "drink and drive", "drink drive", "drunk driving", "drunken driving"], [23, 24, 106], "Causing death by negligence / Intoxication"),
-            (["दुर्घटना", "लापरवाही", "तेज ड्राइविंग", "हिट एंड रन", "गाड़ी दुर्घटना", "शराब पीकर वाहन", "शराब पीकर ड्राइविंग", "नशे में गाड़ी"], [23, 24, 106], "Causing death by negligence / Intoxication"),
-            
-            # Hurt / Grievous Hurt
-            (["hurt", "injury", "grievous hurt", "wounded", "beaten", "physical assault"], [115, 117, 118, 124, 125, 126, 127], "Hurt / Grievous Hurt"),
-            (["चोट", "गंभीर चोट", "घायल", "मारपीट", "शारीरिक हमला"], [115, 117, 118, 124, 125, 126, 127], "Hurt / Grievous Hurt"),
-            
-            # Attempt to Murder
-            (["attempt to murder", "tried to kill", "murder attempt", "attack with intent"], [109], "Attempt to Murder"),
-            (["हत्या का प्रयास", "मारने की कोशिश", "जान से मारने की कोशिश"], [109], "Attempt to Murder"),
-            
-            # Defamation
-            (["defamation", "slander", "libel", "false accusation", "reputation damage"], [356], "Defamation"),
-            (["मानहानि", "झूठा आरोप", "बदनामी", "इज्जत खराब"], [356], "Defamation"),
-            
-            # Trespass
-            (["trespass", "illegal entry", "breaking in", "house breaking"], [303, 304], "Trespass / House Breaking"),
-            (["अतिक्रमण", "अवैध प्रवेश", "घर में घुसना"], [303, 304], "Trespass / House Breaking"),
-            
-            # Abetment of Suicide
-            (["suicide", "abetment of suicide", "drove to suicide"], [107, 108], "Abetment of Suicide"),
-            (["आत्महत्या", "आत्महत्या के लिए उकसाना", "आत्महत्या के लिए मजबूर"], [107, 108], "Abetment of Suicide"),
-            
-            # Sedition / Acts Endangering Sovereignty (BNS 152)
-            (["sedition", "treason", "anti-national", "sovereignty"], [152], "Acts endangering sovereignty, unity and integrity of India"),
-            (["राष्ट्रद्रोह", "देशद्रोह", "गद्दारी", "राष्ट्रद्रोद"], [152], "Acts endangering sovereignty, unity and integrity of India"),
 
-            # Riot / Mob Violence
-            (["riot", "mob violence", "unlawful assembly", "public disorder", "lynching"], [189, 190, 191], "Riot / Unlawful Assembly"),
-            (["दंगा", "भीड़ हिंसा", "अवैध जमावड़ा", "भीड़ द्वारा हत्या"], [189, 190, 191], "Riot / Unlawful Assembly"),
-        ]
+        # Walk the rules in declaration order so the output order does not depend on
+        # where in the text each keyword was found.
+        for rule_idx in sorted(rule_ids):
+            keywords, sections, msg = BNS_KEYWORD_RULES[rule_idx]
+            matched_messages.append(msg)
+            for sec_id in sections:
+                if sec_id not in seen_section_ids:
+                    details = self._get_section_details(sec_id, lang)
+                    if details:
+                        matched_sections.append(details)
+                        seen_section_ids.add(sec_id)
 
-        # Add backward compatible rules
-        rules.extend([
-            (["नौकर कर्मचारी द्वार चोरी", "naukar karmchari dwara chori"], [306], "Theft by clerk or servant."),
-            (["घर में चोरी", "ghar me chori"], [305], "Theft in dwelling house, etc."),
-            (["रास्ते में चीज मिली और उसने लौटा दी नहीं", "raste me chij mili aur usne lauta di nahi"], [314], "Dishonest misappropriation of property."),
-            (["दुर्घटना सामने वाले की वजह से हुई और मौत हो गई", "durghatna samne wale ki wajah se hui aur maut ho gai"], [106], "Causing death by negligence."),
-            (["दुर्घटना में चोट लगी", "durghatna me chot lagi"], [115, 117], "Voluntarily causing hurt / Grievous hurt."),
-            (["सिर्फ जान को खतरा था", "sirf jaan ko khatra tha"], [125], "Act endangering life or personal safety of others."),
-        ])
-
-        for keywords, sections, msg in rules:
-            for keyword in keywords:
-                if keyword in input_lower:
-                    # Found a match, add sections if not already added
-                    matched_messages.append(msg)
-                    for sec_id in sections:
-                        if sec_id not in seen_section_ids:
-                            details = self._get_section_details(sec_id, lang)
-                            if details:
-                                matched_sections.append(details)
-                                seen_section_ids.add(sec_id)
-                    # We match all keywords, so we don't break here to allow multi-label
-                    # But we break the INNER loop (keywords) to avoid processing same rule multiple times for same input
-                    break
-        
         return matched_sections, list(set(matched_messages))
 
     def _get_sections_by_ids(self, section_nums, lang='hi'):
@@ -238,138 +669,161 @@ class LegalClassifier:
 
     def _get_special_acts_matches(self, input_text, lang='hi'):
         """Checks input text for special acts keywords and returns list of corresponding acts."""
-        input_lower = input_text.lower()
+        return self._resolve_special_acts_rules(self.special_acts_automaton.match(input_text), lang)
+
+    def _resolve_special_acts_rules(self, rule_ids, lang='hi'):
+        """Turns matched special-act rule indices into (acts, messages)."""
         matched_acts = []
         seen_act_ids = set()
         matched_messages = []
-        
-        # Define special acts keyword rules: (keywords_list, act_identifier, lang_filter)
-        special_acts_rules = [
-            # IT Act, 2000
-            (["hack", "hacking", "cyber", "cybercrime", "online fraud", "data theft", "phishing", "identity theft", "computer crime"], "IT Act, 2000", "en"),
-            (["हैकिंग", "साइबर", "साइबर अपराध", "ऑनलाइन धोखाधड़ी", "डेटा चोरी", "कंप्यूटर अपराध"], "IT Act, 2000", "hi"),
-            
-            # NDPS Act, 1985
-            (["drugs", "drug", "narcotics", "heroin", "cocaine", "ganja", "charas", "opium", "drug trafficking", "drug possession"], "NDPS Act, 1985", "en"),
-            (["ड्रग्स", "नशीले पदार्थ", "हेरोइन", "कोकीन", "गांजा", "चरस", "अफीम", "नशा"], "NDPS Act, 1985", "hi"),
-            
-            # POCSO Act, 2012
-            (["child abuse", "child sexual", "minor sexual", "child pornography", "pedophile", "child harassment"], "POCSO Act, 2012", "en"),
-            (["बच्चे के साथ यौन", "नाबालिग यौन", "बाल यौन शोषण", "बच्चे के साथ उत्पीड़न"], "POCSO Act, 2012", "hi"),
-            
-            # Prevention of Corruption Act, 1988
-            (["bribe", "bribery", "corruption", "corrupt official", "kickback"], "Prevention of Corruption Act, 1988", "en"),
-            (["रिश्वत", "भ्रष्टाचार", "घूस"], "Prevention of Corruption Act, 1988", "hi"),
-            
-            # Dowry Prohibition Act, 1961
-            (["dowry", "dowry death", "dowry harassment", "dowry demand"], "Dowry Prohibition Act, 1961", "en"),
-            (["दहेज", "दहेज हत्या", "दहेज प्रताड़ना"], "Dowry Prohibition Act, 1961", "hi"),
-            
-            # Wildlife Protection Act, 1972
-            (["wildlife", "poaching", "hunting", "endangered species", "illegal hunting"], "Wildlife Protection Act, 1972", "en"),
-            (["वन्यजीव", "शिकार", "अवैध शिकार"], "Wildlife Protection Act, 1972", "hi"),
-            
-            # PCMA, 2006
-            (["child marriage", "underage marriage", "minor marriage"], "PCMA, 2006", "en"),
-            (["बाल विवाह", "नाबालिग विवाह"], "PCMA, 2006", "hi"),
-            
-            # UAPA, 1967
-            (["terrorism", "terrorist", "terror attack", "unlawful activity"], "UAPA, 1967", "en"),
-            (["आतंकवाद", "आतंकवादी", "आतंकी हमला"], "UAPA, 1967", "hi"),
-            
-            # Domestic Violence Act, 2005
-            (["domestic violence", "marital abuse", "wife beating", "physical abuse wife"], "Domestic Violence Act, 2005", "en"),
-            (["घरेलू हिंसा", "पत्नी प्रताड़ना", "पत्नी की पिटाई"], "Domestic Violence Act, 2005", "hi"),
-            
-            # SC/ST Act, 1989
-            (["caste discrimination", "atrocity", "untouchability", "caste abuse", "dalit harassment", "st st jati wad", "scheduled caste", "scheduled tribe"], "SC/ST Act, 1989", "en"),
-            (["जातिगत भेदभाव", "अत्याचार", "अस्पृश्यता", "अनुसूचित जनजाति", "अनुसूचित जाति", "जाति वाद", "जातिवाद", "छुआछूत", "शिड्युल्ड कास्ट", "शिद्युल्ड ट्राईब", "एट्रोसीटीझ", "दलित"], "SC/ST Act, 1989", "hi"),
-            
-            # IT Act (Added Social Media context for Jatiwad FIR)
-            (["facebook", "social media", "whatsapp", "website", "posted online"], "IT Act, 2000", "en"),
-            (["फेसबुक", "सोशल मीडिया", "व्हाट्सएप", "वेबसाइट", "ऑनलाइन पोस्ट"], "IT Act, 2000", "hi"),
-        ]
-        
-        for keywords, act_id, rule_lang in special_acts_rules:
-            for keyword in keywords:
-                if keyword in input_lower:
-                    if act_id not in seen_act_ids:
-                        # Find the act in the appropriate data source
-                        data_source = self.special_acts_data_en if lang == 'en' else self.special_acts_data
-                        matching_act = None
-                        for act in data_source:
-                            if act.get('Section') == act_id:
-                                matching_act = act
-                                break
-                        
-                        if matching_act:
-                            matched_acts.append({
-                                "chapter": matching_act.get('chapter', 0),
-                                "chapter_title": matching_act.get('chapter_title', ''),
-                                "Section": matching_act.get('Section', ''),
-                                "section_title": matching_act.get('section_title', ''),
-                                "section_desc": matching_act.get('section_desc', ''),
-                                "confidence": 1.0
-                            })
-                            seen_act_ids.add(act_id)
-                            matched_messages.append(f"Special Act Found: {act_id}")
-                    break # Break keyword loop, move to next rule
-        
+
+        for rule_idx in sorted(rule_ids):
+            keywords, act_id, rule_lang = SPECIAL_ACTS_KEYWORD_RULES[rule_idx]
+            if act_id in seen_act_ids:
+                continue
+            # Find the act in the appropriate language
+            matching_act = self.special_acts_store.get(act_id, 'en' if lang == 'en' else 'hi')
+
+            if matching_act:
+                matched_acts.append({
+                    "chapter": matching_act.get('chapter', 0),
+                    "chapter_title": matching_act.get('chapter_title', ''),
+                    "Section": matching_act.get('Section', ''),
+                    "section_title": matching_act.get('section_title', ''),
+                    "section_desc": matching_act.get('section_desc', ''),
+                    "confidence": 1.0
+                })
+                seen_act_ids.add(act_id)
+                matched_messages.append(f"Special Act Found: {act_id}")
+
         return matched_acts, matched_messages
 
-    def _search_special_acts(self, input_embedding, lang='hi'):
+    def _search_special_acts(self, input_embedding, lang='hi', lexical_scores=None):
         """Search for relevant special acts based on input text."""
-        print(f"Searching special acts ({lang})...")
-        
+
         # Build embeddings if not already done
         if self.special_acts_embeddings is None:
-            # Use Hindi data for indexing (multilingual model handles both)
-            texts = [act.get('section_desc', '') for act in self.special_acts_data]
-            self.special_acts_embeddings = self.model.encode(texts, convert_to_tensor=True)
+            self.special_acts_embeddings = self._encode(self._special_acts_index_texts())
         
         # Perform similarity search
-        scores = util.cos_sim(input_embedding, self.special_acts_embeddings)[0]
-        top_results = scores.topk(3)  # Get top 3 matches
+        scores = self.special_acts_embeddings @ input_embedding
+        scores = self._fuse_scores(scores, lexical_scores)
+        top_indices = self._top_indices(scores, 3)  # Get top 3 matches
         
         relevant_acts = []
         data_source = self.special_acts_data_en if lang == 'en' else self.special_acts_data
         
-        for score, idx in zip(top_results.values, top_results.indices):
+        for score, idx in zip(scores[top_indices], top_indices):
             if score > 0.4:  # Threshold for special acts
-                act = data_source[idx]
-                relevant_acts.append({
-                    'chapter': act.get('chapter', 0),
-                    'chapter_title': act.get('chapter_title', ''),
-                    'Section': act.get('Section', ''),
-                    'section_title': act.get('section_title', ''),
-                    'section_desc': act.get('section_desc', ''),
-                    'confidence': float(score)
-                })
-        
+                relevant_acts.append(self._special_act_entry(data_source[idx], score))
+        if log.detail_enabled():
+            log.detail("special_acts_search", lang=lang, top_score=round(float(scores[top_indices[0]]), 4),
+                       acts=[act['Section'] for act in relevant_acts])
         return relevant_acts
 
 
+    def _section_search_index(self):
+        """Chapter-partitioned index over the BNS and special acts embeddings, built on first use."""
+        with self.section_index_lock:
+            if self.section_index is None:
+                if self.bns_embeddings is None:
+                    self.bns_embeddings = self._encode(self._bns_index_texts())
+                if self.special_acts_embeddings is None:
+                    self.special_acts_embeddings = self._encode(self._special_acts_index_texts())
+                self.section_index = SectionSearchIndex({
+                    "bns": (self.bns_store, self.bns_embeddings),
+                    "special_acts": (self.special_acts_store, self.special_acts_embeddings)
+                })
+                log.info("✔ Section search index built", sections=len(self.section_index),
+                         partitions=len(self.section_index.starts))
+            return self.section_index
+
+    def search_sections(self, query, lang='hi', k=10, offset=0, acts=None, chapters=None, min_score=None):
+        """Sections ranked by similarity to `query`, one page (ranks offset+1 .. offset+k) at a time.
+
+        Unlike the classify() fallback there is no fixed cut-off or result cap.
+        `acts` ('bns', 'special_acts') and `chapters` (chapter numbers) restrict
+        the search; only the matching chapters are scored. Raises ValueError for
+        an unknown act.
+        """
+        index = self._section_search_index()
+        unknown = [act for act in acts or () if act not in index.acts]
+        if unknown:
+            raise ValueError(f"Unknown act: {', '.join(unknown)} (known: {', '.join(index.acts)})")
+        lexical = None
+        if self.lexical_cascade:
+            tokens = tokenize(query)
+            lexical = {
+                act: self._merged_bm25(indexes, tokens)
+                for act, indexes in (("bns", self.bns_bm25), ("special_acts", self.special_acts_bm25))
+                if acts is None or act in acts
+            }
+        found = index.search(self._encode(query), k, offset, acts, chapters, lexical, self._fuse_scores, min_score)
+
+        stores = {"bns": self.bns_store, "special_acts": self.special_acts_store}
+        results = []
+        for rank, (act, row, score) in enumerate(found["hits"], start=offset + 1):
+            store = stores[act]
+            item = store.row(row, 'en' if lang == 'en' else 'hi') or store.row(row, store.languages[0])
+            results.append({**item, "act": act, "score": score, "rank": rank})
+        return {
+            "total": found["total"],
+            "results": results,
+            "partitions_scored": found["partitions_scored"],
+            "sections_scored": found["rows_scored"]
+        }
+
     def classify(self, input_fir, lang='hi'):
         if not self.templates:
             return {"error": "No templates found"}
+        if not log.detail_enabled():
+            return self._classify(input_fir, lang)
+
+        start = time.perf_counter()
+        result = self._classify(input_fir, lang)
+        log.detail("classify", lang=lang, chars=len(input_fir), stage=result.get('analysis_stage'),
+                   template=result.get('matched_template'),
+                   sections=[s.get('Section') for s in result.get('relevant_sections', [])],
+                   ms=round((time.perf_counter() - start) * 1000, 2))
+        return result
+
+    def _classify(self, input_fir, lang='hi'):
+        # 1. Check all keyword rules (BNS and Special Acts)
+        result = self._keyword_result(
+            self.bns_automaton.match(input_fir),
+            self.special_acts_automaton.match(input_fir),
+            lang
+        )
+
+        # If we found any keyword matches, we can optionally perform deeper semantic search 
+        # or just return. For now, if we match keywords, we assume high confidence and return.
+        # However, user requested "multiple keywords" which we handled.
+        
+        if result['special_acts'] or result['relevant_sections']:
+             self._count_stage("keyword")
+             return result
 
+        return self._semantic_classify(input_fir, lang)
+
+    def _keyword_result(self, bns_rule_ids, special_rule_ids, lang='hi'):
+        """Builds the keyword-stage result from matched rule indices."""
         result = {
             "matched_template": "Keyword/Semantic Analysis",
             "confidence_score": 0.0,
             "relevant_sections": [],
             "special_acts": [],
             "custom_message": "",
-            "is_fallback": False
+            "is_fallback": False,
+            "analysis_stage": "keyword"
         }
-        
-        # 1. Check all keyword rules (BNS and Special Acts)
-        special_acts, special_msgs = self._get_special_acts_matches(input_fir, lang)
+
+        special_acts, special_msgs = self._resolve_special_acts_rules(special_rule_ids, lang)
         if special_acts:
             result['special_acts'].extend(special_acts)
             result['custom_message'] += "; ".join(special_msgs)
             result['confidence_score'] = 1.0
 
-        bns_sections, bns_msgs = self._get_bns_keyword_matches(input_fir, lang)
+        bns_sections, bns_msgs = self._resolve_bns_rules(bns_rule_ids, lang)
         if bns_sections:
             result['relevant_sections'].extend(bns_sections)
             if result['custom_message']: 
@@ -377,20 +831,134 @@ class LegalClassifier:
             result['custom_message'] += "; ".join(bns_msgs)
             result['confidence_score'] = 1.0
 
-        # If we found any keyword matches, we can optionally perform deeper semantic search 
-        # or just return. For now, if we match keywords, we assume high confidence and return.
-        # However, user requested "multiple keywords" which we handled.
-        
-        if result['special_acts'] or result['relevant_sections']:
-             return result
+        return result
+
+    def _phonetic_result(self, input_fir, lang='hi'):
+        """Keyword result from the phonetic-key automata (Hinglish), None without a match."""
+        bns_rule_ids = self.bns_phonetic.match(input_fir)
+        special_rule_ids = self.special_acts_phonetic.match(input_fir)
+        if not bns_rule_ids and not special_rule_ids:
+            return None
+        result = self._keyword_result(bns_rule_ids, special_rule_ids, lang)
+        if not result['relevant_sections'] and not result['special_acts']:
+            return None
+        result['analysis_stage'] = "phonetic"
+        return result
+
+    def _fuzzy_evidence(self, input_fir, lexical):
+        """`lexical` with the sections / acts of approximately matched keyword rules raised
+        to FUZZY_EVIDENCE_WEIGHT x the match confidence, and the matches; (lexical, None)
+        when nothing is close.
+
+        A fuzzy match is only evidence for the hybrid stage: alone it lifts a
+        section over the fallback threshold (0.3) only if its cosine is already ~0.2.
+        """
+        bns_matches = self.bns_fuzzy.match(input_fir)
+        special_matches = self.special_acts_fuzzy.match(input_fir)
+        if not bns_matches and not special_matches:
+            return lexical, None
+
+        if lexical is None:
+            lexical = {
+                "templates": [0.0] * len(self.templates),
+                "bns": [0.0] * len(self.bns_store),
+                "special_acts": [0.0] * len(self.special_acts_store)
+            }
+        bns, special_acts = list(lexical["bns"]), list(lexical["special_acts"])
+        for rule_idx, match in bns_matches.items():
+            for sec_id in BNS_KEYWORD_RULES[rule_idx][1]:
+                row = self.bns_store.position.get(sec_id)
+                if row is not None:
+                    bns[row] = max(bns[row], FUZZY_EVIDENCE_WEIGHT * match['confidence'])
+        for rule_idx, match in special_matches.items():
+            row = self.special_acts_store.position.get(SPECIAL_ACTS_KEYWORD_RULES[rule_idx][1])
+            if row is not None:
+                special_acts[row] = max(special_acts[row], FUZZY_EVIDENCE_WEIGHT * match['confidence'])
+        matches = list(bns_matches.values()) + list(special_matches.values())
+        return {**lexical, "bns": bns, "special_acts": special_acts}, matches
 
+    def _semantic_classify(self, input_fir, lang='hi'):
+        """Everything after the keyword stage: phonetic keywords and BM25 first, the encoder only when needed."""
+        if self.bns_phonetic is not None:
+            result = self._phonetic_result(input_fir, lang)
+            if result is not None:
+                self._count_stage("phonetic")
+                return result
+
+        lexical = None
+        if self.lexical_cascade:
+            lexical = self._lexical_scores(input_fir)
+            result = self._lexical_classify(lexical, lang)
+            if result is not None:
+                self._count_stage("lexical")
+                return result
+
+        fuzzy_matches = None
+        if self.bns_fuzzy is not None:
+            lexical, fuzzy_matches = self._fuzzy_evidence(input_fir, lexical)
+
+        self._count_stage("hybrid" if lexical else "neural")
+        result = self._neural_classify(input_fir, lang, lexical)
+        if fuzzy_matches:
+            result['fuzzy_matches'] = fuzzy_matches
+        return result
+
+    def _lexical_classify(self, lexical, lang='hi'):
+        """Answers from the BM25 scores alone. Returns None when the match is not clear enough."""
+        templates = top_k(lexical["templates"], 2)
+        template_confidence = lexical_confidence(templates)
+        if template_confidence >= LEXICAL_CONFIDENCE:
+            best_match_file = self.templates[templates[0][0]]['filename']
+            rule = self._template_rule(templates[0][0])
+            if rule is None:
+                return None # Template without logic needs the semantic BNS fallback
+            section_nums, message = rule
+            return {
+                "matched_template": best_match_file,
+                "confidence_score": float(template_confidence),
+                "relevant_sections": self._get_sections_by_ids(section_nums, lang),
+                "custom_message": message,
+                "is_fallback": False,
+                "special_acts": self._lexical_special_acts(lexical, lang),
+                "analysis_stage": "lexical"
+            }
+
+        sections = top_k(lexical["bns"], 5)
+        section_confidence = lexical_confidence(sections)
+        if section_confidence >= LEXICAL_CONFIDENCE:
+            return {
+                "matched_template": "Manual Analysis (Fallback)",
+                "confidence_score": float(section_confidence),
+                "relevant_sections": [
+                    self._localize_section(self.bns_data[idx], lang)
+                    for idx, score in sections if score >= LEXICAL_MIN_SCORE
+                ],
+                "custom_message": "",
+                "is_fallback": True,
+                "special_acts": self._lexical_special_acts(lexical, lang),
+                "analysis_stage": "lexical"
+            }
+        return None
+
+    def _lexical_special_acts(self, lexical, lang='hi'):
+        data_source = self.special_acts_data_en if lang == 'en' else self.special_acts_data
+        return [
+            self._special_act_entry(data_source[idx], score)
+            for idx, score in top_k(lexical["special_acts"], 3) if score >= LEXICAL_MIN_SCORE
+        ]
+
+    def _template_rule(self, template_idx):
+        """(section_nums, custom_message) for a matched template, None if no logic is defined."""
+        return self.template_categories[self.templates[template_idx]['category']]["rule"]
+
+    def _neural_classify(self, input_fir, lang='hi', lexical=None):
+        """Template matching with the encoder (fused with BM25 scores when given)."""
         # 2. Template Matching (Fallback if no keywords)
-        input_embedding = self.model.encode(input_fir, convert_to_tensor=True)
-        scores = util.cos_sim(input_embedding, self.template_embeddings)[0]
-        
-        best_score_idx = scores.argmax().item()
+        input_embedding = self._encode(input_fir)
+        best_score_idx, best_score = self.template_index.search(
+            input_embedding, lexical["templates"] if lexical else None, self._fuse_scores
+        )
         best_match_file = self.templates[best_score_idx]['filename']
-        best_score = scores[best_score_idx].item()
         
         result = {
             "matched_template": best_match_file,
@@ -398,11 +966,12 @@ class LegalClassifier:
             "relevant_sections": [],
             "custom_message": "",
             "is_fallback": False,
-            "special_acts": []  # Initialize special acts field
+            "special_acts": [],  # Initialize special acts field
+            "analysis_stage": "hybrid" if lexical else "neural"
         }
 
         # Search for special acts
-        special_acts = self._search_special_acts(input_embedding, lang)
+        special_acts = self._search_special_acts(input_embedding, lang, lexical["special_acts"] if lexical else None)
         result['special_acts'] = special_acts
 
         # Threshold check for fallback
@@ -410,7 +979,7 @@ class LegalClassifier:
             result["is_fallback"] = True
             result["matched_template"] = "Manual Analysis (Fallback)"
             
-            fallback_items = self._fallback_search(input_embedding, lang)
+            fallback_items = self._fallback_search(input_embedding, lang, lexical["bns"] if lexical else None)
             if not fallback_items:
                  result["custom_message"] = "No specific legal procedure found for this case."
             else:
@@ -418,33 +987,17 @@ class LegalClassifier:
             return result
 
         # Rule Logic
-        section_nums = []
-        
-        if best_match_file == "Saman Lost FIR .txt":
-            result["custom_message"] = "FIR Should be written.\\nNote: misused, this section will be applied under Bhartiya Nyaya Sanhita."
-            section_nums = [314]
-            
-        elif best_match_file in ["Normal No FIR .txt", "Holi Nibandh .txt", "No FIR Normal .txt"]:
-            result["custom_message"] = "No Legal Things should be done for it."
-            return result # Return early, no sections
-
-        elif best_match_file == "Fight Ladai Jhagda FIR.txt":
-            section_nums = [125, 130, 131]
-            
-        elif best_match_file == "Thief Report FIR.txt":
-            section_nums = [305, 307, 309, 353, 356]
-            
-        elif best_match_file == "FIR.txt":
-            section_nums = [152, 197, 196]
-            
-        else:
+        rule = self._template_rule(best_score_idx)
+        if rule is None:
              # Default fallback if file matched but no rule?
              result["is_fallback"] = True
              result["matched_template"] = f"{best_match_file} (No Logic Defined)"
-             fallback_items = self._fallback_search(input_embedding, lang)
+             fallback_items = self._fallback_search(input_embedding, lang, lexical["bns"] if lexical else None)
              result["relevant_sections"] = fallback_items
              return result
 
+        section_nums, result["custom_message"] = rule
+
         # Populate section details
         result["relevant_sections"] = self._get_sections_by_ids(section_nums, lang)
         
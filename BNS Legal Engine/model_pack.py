@@ -0,0 +1,131 @@
+import os
+import json
+import time
+import hashlib
+
+import numpy as np
+import torch
+
+from batch_planner import encode_planned
+import engine_log as log
+
+# --- CONFIGURATION ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PACK_DIR = os.path.join(BASE_DIR, "models", "model-pack")
+MANIFEST_FILE = "manifest.json"
+MODEL_FILE = "model.pt"
+PACK_FORMAT = 1
+
+
+class ModelPackError(Exception):
+    """Raised when a model pack is missing, incomplete or fails verification."""
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def texts_sha256(texts):
+    """Fingerprint of a corpus, used to detect embeddings built from stale data."""
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(text.encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def quantize_model(model):
+    """Dynamic int8 quantization of every Linear layer (CPU inference only)."""
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def build_model_pack(model, corpora, out_dir=MODEL_PACK_DIR, source_model="", quantize=True):
+    """Writes an optimized model plus precomputed corpus embeddings to `out_dir`.
+
+    `corpora` maps a corpus name to its list of texts (exactly what the
+    classifier would encode). The embeddings are computed with the packed
+    (quantized) model so they match what it produces at query time.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    model = model.to('cpu').eval()
+    if quantize:
+        model = quantize_model(model)
+
+    files = {}
+    model_path = os.path.join(out_dir, MODEL_FILE)
+    torch.save(model, model_path)
+    files[MODEL_FILE] = file_sha256(model_path)
+
+    corpus_entries = {}
+    for name, texts in corpora.items():
+        embeddings = encode_planned(model, texts)
+        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        filename = f"{name}.npy"
+        path = os.path.join(out_dir, filename)
+        np.save(path, embeddings)
+        files[filename] = file_sha256(path)
+        corpus_entries[name] = {
+            "file": filename,
+            "count": len(texts),
+            "source_sha256": texts_sha256(texts)
+        }
+
+    manifest = {
+        "format": PACK_FORMAT,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "source_model": source_model,
+        "quantization": "dynamic-int8" if quantize else "none",
+        "torch_version": torch.__version__,
+        "files": files,
+        "corpora": corpus_entries
+    }
+    with open(os.path.join(out_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_model_pack(corpora, pack_dir=MODEL_PACK_DIR):
+    """Loads and verifies a model pack.
+
+    Every file is checked against the manifest checksum *before* it is
+    unpickled. Corpus embeddings whose source texts changed since the pack was
+    built are skipped (the caller rebuilds them with the packed model).
+    Returns (model, {corpus_name: embedding matrix}, manifest).
+    """
+    manifest_path = os.path.join(pack_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise ModelPackError(f"No model pack at {pack_dir}")
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("format") != PACK_FORMAT:
+        raise ModelPackError(f"Unsupported model pack format: {manifest.get('format')}")
+
+    files = manifest.get("files", {})
+    if MODEL_FILE not in files:
+        raise ModelPackError("Manifest does not list a model file")
+    for filename, expected in files.items():
+        path = os.path.join(pack_dir, filename)
+        if not os.path.exists(path):
+            raise ModelPackError(f"Missing file in model pack: {filename}")
+        if file_sha256(path) != expected:
+            raise ModelPackError(f"Checksum mismatch for {filename}")
+
+    # Checksums are verified above so a truncated or half-copied pack never gets unpickled
+    try:
+        model = torch.load(os.path.join(pack_dir, MODEL_FILE), map_location='cpu', weights_only=False)
+    except Exception as e:
+        raise ModelPackError(f"Could not load packed model (built with torch {manifest.get('torch_version')}): {e}")
+    model.eval()
+
+    embeddings = {}
+    for name, texts in corpora.items():
+        entry = manifest.get("corpora", {}).get(name)
+        if not entry or entry.get("source_sha256") != texts_sha256(texts):
+            log.warning("⚠ Model pack embeddings are stale, they will be recomputed", corpus=name, pack=pack_dir)
+            continue
+        embeddings[name] = np.load(os.path.join(pack_dir, entry["file"]))
+    return model, embeddings, manifest
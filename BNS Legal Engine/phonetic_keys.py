@@ -0,0 +1,188 @@
+import os
+import re
+import unicodedata
+
+from keyword_automaton import KeywordAutomaton
+
+# --- CONFIGURATION ---
+# Keywords whose key is shorter than this are left to the exact rules
+# (two-letter keys would match too many ordinary words)
+PHONETIC_MIN_KEY = int(os.environ.get("LEGAL_PHONETIC_MIN_KEY", "3"))
+# Keywords with a shorter key are matched on the strict key, which keeps a
+# spoken final 'a': without it मौत (death) and "mota" (fat) share the key "mot"
+PHONETIC_STRICT_KEY = int(os.environ.get("LEGAL_PHONETIC_STRICT_KEY", "5"))
+# Common words never keyed: they share a key with a keyword ("ghus" = entered
+# vs घूस = bribe, "cot" vs चोट) or differ from one only by the final vowel
+PHONETIC_STOPWORDS = {"mota", "moti", "mote", "chota", "choti", "chote", "ghus", "coat", "cot"}
+# Latin-script text is only keyed when it has this many Romanized Hindi function
+# words; plain English would otherwise hit short keys ("coat" -> "cot" = चोट)
+HINGLISH_MIN_MARKERS = 2
+HINGLISH_MARKERS = {
+    "hai", "hain", "tha", "thi", "ki", "ka", "ke", "ne", "ko", "se", "aur", "mein", "mai",
+    "mera", "meri", "mere", "mujhe", "hamara", "hamare", "humare", "humne", "hamne", "apna",
+    "apni", "apne", "usne", "unhone", "uska", "uske", "uski", "unka", "unki", "unke",
+    "hua", "hui", "hue", "hona", "hota", "hoti",
+    "gaya", "gayi", "gaye", "kiya", "kar", "diya", "di", "liya", "raha", "rahi", "nahi",
+    "nahin", "bhi", "wala", "wale", "wali", "ek", "koi", "kuch", "kal", "abhi",
+}
+
+CONSONANTS = {
+    'क': 'k', 'ख': 'kh', 'ग': 'g', 'घ': 'gh', 'ङ': 'n',
+    'च': 'ch', 'छ': 'chh', 'ज': 'j', 'झ': 'jh', 'ञ': 'n',
+    'ट': 't', 'ठ': 'th', 'ड': 'd', 'ढ': 'dh', 'ण': 'n',
+    'त': 't', 'थ': 'th', 'द': 'd', 'ध': 'dh', 'न': 'n',
+    'प': 'p', 'फ': 'ph', 'ब': 'b', 'भ': 'bh', 'म': 'm',
+    'य': 'y', 'र': 'r', 'ल': 'l', 'व': 'v',
+    'श': 'sh', 'ष': 'sh', 'स': 's', 'ह': 'h',
+}
+VOWELS = {
+    'अ': 'a', 'आ': 'aa', 'इ': 'i', 'ई': 'ii', 'उ': 'u', 'ऊ': 'uu', 'ऋ': 'ri',
+    'ए': 'e', 'ऐ': 'ai', 'ओ': 'o', 'औ': 'au', 'ऑ': 'o', 'ऍ': 'e',
+}
+MATRAS = {
+    'ा': 'aa', 'ि': 'i', 'ी': 'ii', 'ु': 'u', 'ू': 'uu', 'ृ': 'ri',
+    'े': 'e', 'ै': 'ai', 'ो': 'o', 'ौ': 'au', 'ॉ': 'o', 'ॅ': 'e',
+}
+NASALS = {'ं': 'n', 'ँ': 'n', 'ः': 'h'}
+VIRAMA = '्'
+NUKTA = '़'
+
+WORD_RE = re.compile(r"[a-zऀ-ॣ०-ॿ]+")
+# Spelling variants folded together, applied in order
+ROMAN_RULES = [
+    (re.compile(r"ee|ii|y(?=$)"), "i"),
+    (re.compile(r"oo|uu"), "u"),
+    (re.compile(r"ai|ay(?=$)"), "e"),
+    (re.compile(r"au|ou"), "o"),
+    (re.compile(r"ck|q"), "k"),
+    (re.compile(r"x"), "ks"),
+    (re.compile(r"z"), "j"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"f"), "ph"),
+    (re.compile(r"m(?=[bp])"), "n"),
+]
+# Aspiration is rarely written consistently: chh / ch / c, kh / k, bh / b ...
+# (applied after the vowels are dropped, so "apharan" and "apaharan" agree)
+ASPIRATES = re.compile(r"([kgcjtdpbsr])h+")
+
+
+def is_devanagari(text):
+    return any('ऀ' <= ch <= 'ॿ' for ch in text)
+
+
+def looks_hinglish(text):
+    """True for Devanagari text, or Latin text with enough Romanized Hindi function words."""
+    if is_devanagari(text):
+        return True
+    markers = 0
+    for word in WORD_RE.findall(text.lower()):
+        markers += word in HINGLISH_MARKERS
+        if markers >= HINGLISH_MIN_MARKERS:
+            return True
+    return False
+
+
+def transliterate(word):
+    """Rough romanization of a Devanagari word (inherent 'a' kept, nukta ignored)."""
+    out = []
+    for ch in unicodedata.normalize('NFD', word):
+        if ch in CONSONANTS:
+            out.append(CONSONANTS[ch] + 'a')
+        elif ch in MATRAS or ch == VIRAMA:
+            if out and out[-1].endswith('a'):
+                out[-1] = out[-1][:-1]
+            out.append(MATRAS.get(ch, ''))
+        elif ch in VOWELS:
+            out.append(VOWELS[ch])
+        elif ch in NASALS:
+            out.append(NASALS[ch])
+        elif ch != NUKTA:
+            out.append(ch)
+    return ''.join(out)
+
+
+def word_key(word, strict=False):
+    """Phonetic key of one word, Devanagari or Romanized.
+
+    Long and short vowels, aspirated and plain consonants, retroflex and dental
+    letters collapse to one letter, doubled letters to one, and every 'a' after
+    the first letter is dropped: Romanized Hindi writes the (often unspoken)
+    inherent vowel inconsistently, so chori / chorī / choree / चोरी all become
+    "cori" and maarpeet / marpit / मारपीट become "mrpit".
+
+    The strict key keeps a spoken word-final 'a' (आ, or a written final "a";
+    the silent inherent vowel of a final Devanagari consonant is removed), so
+    मौत / maut -> "mot" but mota -> "mota", and हमला / hamla -> "hmla".
+    """
+    if is_devanagari(word):
+        word = transliterate(word)
+        if strict and re.search(r"[^a]a$", word):
+            word = word[:-1]
+    word = ''.join(ch for ch in unicodedata.normalize('NFKD', word.lower()) if not unicodedata.combining(ch))
+    for pattern, replacement in ROMAN_RULES:
+        word = pattern.sub(replacement, word)
+    final = 'a' if strict and len(word) > 1 and word.endswith('a') else ''
+    word = word[:len(word) - len(final)]
+    word = word[:1] + word[1:].replace('a', '') + final
+    word = ASPIRATES.sub(r"\1", word)
+    return re.sub(r'(.)\1+', r'\1', word)
+
+
+def phonetic_key(text, strict=False, stopwords=()):
+    """Space-separated keys of the words of `text`, padded with spaces for whole-word matching.
+
+    Words in `stopwords` are keyed as "-", which matches no keyword.
+    """
+    words = WORD_RE.findall(''.join(
+        ch for ch in unicodedata.normalize('NFKD', text.lower()) if not unicodedata.combining(ch) or is_devanagari(ch)
+    ))
+    return " " + " ".join("-" if w in stopwords else word_key(w, strict) for w in words) + " "
+
+
+def is_devanagari_keyword(keyword):
+    """Devanagari letters and spaces only (a stray letter of another script would key as noise)."""
+    return all(ch == ' ' or 'ऀ' <= ch <= 'ॿ' for ch in keyword) and is_devanagari(keyword)
+
+
+class PhoneticKeywordIndex:
+    """KeywordAutomatons over the phonetic keys of the Devanagari keywords.
+
+    Rule indexes are the same as in the exact automaton. Keys are matched as
+    whole words, so "चोरी" matches "chori", "choree" or "chorī" in Hinglish
+    text (and "चोरि" in Devanagari) but not "chorus". Keywords with a key
+    shorter than `strict_key` are matched on strict keys (see word_key()), and
+    words in `stopwords` never match. English text without Romanized Hindi
+    words is not keyed at all (see looks_hinglish()).
+    """
+
+    def __init__(self, rules, min_key=PHONETIC_MIN_KEY, strict_key=PHONETIC_STRICT_KEY, stopwords=PHONETIC_STOPWORDS):
+        self.stopwords = frozenset(stopwords)
+        loose, strict = [], []
+        self.size = 0
+        for rule in rules:
+            loose_keys, strict_keys = set(), set()
+            for keyword in rule[0]:
+                if not is_devanagari_keyword(keyword):
+                    continue
+                key = phonetic_key(keyword)
+                if len(key.strip()) < min_key:
+                    continue
+                if len(key.strip()) < strict_key:
+                    strict_keys.add(phonetic_key(keyword, strict=True))
+                else:
+                    loose_keys.add(key)
+            self.size += len(loose_keys) + len(strict_keys)
+            loose.append((sorted(loose_keys),))
+            strict.append((sorted(strict_keys),))
+        self.automaton = KeywordAutomaton(loose)
+        self.strict_automaton = KeywordAutomaton(strict)
+
+    def __len__(self):
+        return self.size
+
+    def match(self, text):
+        """Rule indices with a keyword present in `text` by phonetic key."""
+        if not looks_hinglish(text):
+            return set()
+        return (self.automaton.match(phonetic_key(text, stopwords=self.stopwords))
+                | self.strict_automaton.match(phonetic_key(text, strict=True, stopwords=self.stopwords)))
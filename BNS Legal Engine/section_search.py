@@ -0,0 +1,110 @@
+import numpy as np
+
+
+class SectionSearchIndex:
+    """Exact semantic search over several acts, partitioned by (act, chapter).
+
+    The embeddings of every act are stored in one matrix, grouped so that each
+    chapter of each act is a contiguous block (a partition). Act and chapter
+    filters select partitions, and only their blocks are scored; adjacent
+    blocks are scored with a single matrix product. Every selected section is
+    scored, so results and totals are exactly those of a full scan; an
+    unfiltered query is one flat scan. Embeddings must be unit-normalized.
+    """
+
+    def __init__(self, acts):
+        """`acts` is {name: (SectionStore, embeddings aligned with its rows)}."""
+        self.acts = list(acts)
+        blocks, rows, part_act, part_chapter, starts, ends = [], [], [], [], [], []
+        offset = 0
+        for act_id, (store, embeddings) in enumerate(acts.values()):
+            order = np.argsort(store.row_chapter, kind='stable')
+            chapters = store.row_chapter[order]
+            _, first, counts = np.unique(chapters, return_index=True, return_counts=True)
+            for start, count in zip(first.tolist(), counts.tolist()):
+                part_act.append(act_id)
+                part_chapter.append(int(store.chapter_numbers[chapters[start]]))
+                starts.append(offset + start)
+                ends.append(offset + start + count)
+            blocks.append(np.asarray(embeddings, dtype=np.float32)[order])
+            rows.append(order)
+            offset += len(order)
+
+        self.matrix = np.concatenate(blocks)
+        self.rows = np.concatenate(rows)                      # store row of each matrix row
+        self.part_act = np.array(part_act, dtype=np.int32)
+        self.part_chapter = np.array(part_chapter, dtype=np.int64)
+        self.starts = np.array(starts, dtype=np.int64)
+        self.ends = np.array(ends, dtype=np.int64)
+        self.row_act = np.repeat(self.part_act, self.ends - self.starts)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def nbytes(self):
+        return int(self.matrix.nbytes + self.rows.nbytes + self.row_act.nbytes)
+
+    def select(self, acts=None, chapters=None):
+        """Partition ids matching the filters (None = no filter)."""
+        mask = np.ones(len(self.starts), dtype=bool)
+        if acts is not None:
+            mask &= np.isin(self.part_act, [self.acts.index(act) for act in acts])
+        if chapters is not None:
+            mask &= np.isin(self.part_chapter, list(chapters))
+        return np.flatnonzero(mask)
+
+    def search(self, query, k=10, offset=0, acts=None, chapters=None, lexical=None, fuse=None, min_score=None):
+        """Ranked sections for a unit-length query embedding.
+
+        `lexical` ({act: dense scores aligned with the store rows}) is combined
+        with `fuse(scores, lexical)`. Returns {"hits": [(act, store row,
+        score)] for ranks offset..offset+k, "total": sections matching the
+        filters (and scoring at least min_score), "partitions_scored",
+        "rows_scored"}.
+        """
+        parts = self.select(acts, chapters)
+        index, scores = self._score(query, parts, lexical, fuse)
+        scored = len(index)
+        if min_score is not None:
+            keep = scores >= min_score
+            index, scores = index[keep], scores[keep]
+
+        n = min(offset + k, len(scores))
+        if n <= 0:
+            top = np.empty(0, dtype=np.int64)
+        else:
+            top = np.argpartition(-scores, n - 1)[:n] if n < len(scores) else np.arange(len(scores))
+            # Ties broken by position so pages never overlap
+            top = top[np.lexsort((index[top], -scores[top]))][offset:]
+        return {
+            "hits": [
+                (self.acts[self.row_act[i]], int(self.rows[i]), float(s))
+                for i, s in zip(index[top].tolist(), scores[top].tolist())
+            ],
+            "total": len(scores),
+            "partitions_scored": len(parts),
+            "rows_scored": scored
+        }
+
+    def _score(self, query, parts, lexical, fuse):
+        """(matrix rows, scores) of the sections of `parts`."""
+        if not len(parts):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        # Adjacent partitions (e.g. a whole act) become one range, one matrix product
+        parts = np.sort(parts)
+        breaks = np.flatnonzero(self.starts[parts[1:]] != self.ends[parts[:-1]]) + 1
+        ranges = list(zip(self.starts[parts[np.r_[0, breaks]]].tolist(),
+                          self.ends[parts[np.r_[breaks - 1, len(parts) - 1]]].tolist()))
+        index = np.concatenate([np.arange(start, end) for start, end in ranges])
+        scores = np.concatenate([self.matrix[start:end] @ query for start, end in ranges])
+        if lexical is not None:
+            # Only the acts being scored need lexical scores
+            dense = np.zeros(len(index), dtype=np.float32)
+            row_act = self.row_act[index]
+            for act_id, act in enumerate(self.acts):
+                members = row_act == act_id
+                if act in lexical and members.any():
+                    dense[members] = np.asarray(lexical[act], dtype=np.float32)[self.rows[index[members]]]
+            scores = fuse(scores, dense)
+        return index, scores
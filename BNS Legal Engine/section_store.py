@@ -0,0 +1,267 @@
+import os
+import sys
+import json
+import hashlib
+from collections.abc import Sequence
+
+import numpy as np
+
+# --- CONFIGURATION ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SECTION_STORE_DIR = os.path.join(BASE_DIR, "models", "section-store")
+STORE_FORMAT = 1
+TEXT_FIELDS = ("section_title", "section_desc")
+
+
+class SectionStoreError(Exception):
+    """Raised when a prebuilt section store is unreadable, stale or of another format."""
+
+
+def sources_sha256(paths):
+    """Fingerprint of the JSON files a store was built from (bytes only, no parsing)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+class TextColumn:
+    """Strings packed into one UTF-8 buffer plus offsets; missing values are None."""
+
+    def __init__(self, blob, offsets, present):
+        self.blob = blob          # uint8
+        self.offsets = offsets    # int64, len(rows) + 1
+        self.present = present    # bool
+
+    @classmethod
+    def from_strings(cls, values):
+        encoded = [(v or '').encode('utf-8') for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(e) for e in encoded])
+        blob = np.frombuffer(b''.join(encoded), dtype=np.uint8).copy()
+        return cls(blob, offsets, np.array([v is not None for v in values], dtype=bool))
+
+    def __getitem__(self, row):
+        if not self.present[row]:
+            return None
+        return self.blob[self.offsets[row]:self.offsets[row + 1]].tobytes().decode('utf-8')
+
+    @property
+    def nbytes(self):
+        return self.blob.nbytes + self.offsets.nbytes + self.present.nbytes
+
+
+class SectionStore:
+    """Columnar, read-only store of one act (BNS or special acts) in several languages.
+
+    Rows are sections, in the order of the first language's file (the order the
+    embedding matrices use). Chapters live in a chapter table (number + title per
+    language) referenced by a small integer per row, section titles/descriptions
+    are per-language UTF-8 text columns, and section keys are a numeric array when
+    every key is a number (BNS) or interned strings otherwise (special acts).
+    `row()` rebuilds the original JSON record on demand.
+    """
+
+    def __init__(self, languages, sections, row_chapter, chapter_numbers, chapter_titles, texts, sources=None):
+        self.languages = tuple(languages)
+        self.sections = sections
+        self.row_chapter = row_chapter
+        self.chapter_numbers = chapter_numbers
+        self.chapter_titles = chapter_titles    # {lang: [title per chapter]}
+        self.texts = texts                      # {lang: {field: TextColumn}}
+        self.sources = sources
+        keys = self.sections.tolist() if isinstance(self.sections, np.ndarray) else self.sections
+        self.position = {key: row for row, key in enumerate(keys)}
+
+    @classmethod
+    def from_records(cls, records_by_lang, sources=None):
+        """Builds a store from {lang: [json record, ...]}; sections are matched across languages by key."""
+        # A language without any record (missing file) is left out entirely
+        languages = [lang for lang, records in records_by_lang.items() if records]
+        keys, seen, by_lang = [], set(), {}
+        for lang in languages:
+            by_lang[lang] = {}
+            for item in records_by_lang[lang]:
+                key = item.get('Section')
+                by_lang[lang].setdefault(key, item)
+                if key not in seen:
+                    seen.add(key)
+                    keys.append(key)
+
+        chapters, row_chapter = {}, []
+        for key in keys:
+            first = next(by_lang[lang][key] for lang in languages if key in by_lang[lang])
+            titles = tuple(
+                by_lang[lang][key].get('chapter_title', '') if key in by_lang[lang] else None
+                for lang in languages
+            )
+            chapter = (first.get('chapter', 0), titles)
+            row_chapter.append(chapters.setdefault(chapter, len(chapters)))
+
+        if all(isinstance(key, int) and not isinstance(key, bool) for key in keys):
+            sections = np.array(keys, dtype=np.int64)
+        else:
+            sections = [sys.intern(str(key)) for key in keys]
+
+        ordered = sorted(chapters, key=chapters.get)
+        return cls(
+            languages,
+            sections,
+            np.array(row_chapter, dtype=np.int32),
+            np.array([number for number, _ in ordered], dtype=np.int64),
+            {
+                lang: [sys.intern(titles[i]) if titles[i] is not None else None for _, titles in ordered]
+                for i, lang in enumerate(languages)
+            },
+            {
+                lang: {
+                    field: TextColumn.from_strings([
+                        by_lang[lang][key].get(field, '') if key in by_lang[lang] else None for key in keys
+                    ])
+                    for field in TEXT_FIELDS
+                }
+                for lang in languages
+            },
+            sources
+        )
+
+    def __len__(self):
+        return len(self.sections)
+
+    def key(self, row):
+        key = self.sections[row]
+        return int(key) if isinstance(self.sections, np.ndarray) else key
+
+    def has(self, row, lang):
+        return lang in self.texts and bool(self.texts[lang][TEXT_FIELDS[0]].present[row])
+
+    def row(self, row, lang):
+        """The original JSON record of `row` in `lang`, None if that language lacks it."""
+        if not self.has(row, lang):
+            return None
+        chapter = self.row_chapter[row]
+        columns = self.texts[lang]
+        return {
+            "chapter": int(self.chapter_numbers[chapter]),
+            "chapter_title": self.chapter_titles[lang][chapter],
+            "Section": self.key(row),
+            "section_title": columns["section_title"][row],
+            "section_desc": columns["section_desc"][row]
+        }
+
+    def get(self, section, lang):
+        """Record of a section by its key (e.g. 303 or 'IT Act, 2000'), None if unknown."""
+        row = self.position.get(section)
+        return None if row is None else self.row(row, lang)
+
+    def view(self, lang):
+        return SectionView(self, lang)
+
+    def nbytes(self):
+        """Approximate memory held by the store (arrays exactly, Python strings by sys.getsizeof)."""
+        total = self.row_chapter.nbytes + self.chapter_numbers.nbytes + sys.getsizeof(self.position)
+        if isinstance(self.sections, np.ndarray):
+            total += self.sections.nbytes
+        else:
+            total += sys.getsizeof(self.sections) + sum(sys.getsizeof(s) for s in set(self.sections))
+        for titles in self.chapter_titles.values():
+            total += sys.getsizeof(titles) + sum(sys.getsizeof(t) for t in titles if t is not None)
+        for columns in self.texts.values():
+            total += sum(column.nbytes for column in columns.values())
+        return total
+
+    # --- Prebuilt binary file (numpy .npz, no pickle) ---
+
+    def save(self, path):
+        arrays = {
+            "row_chapter": self.row_chapter,
+            "chapter_numbers": self.chapter_numbers,
+        }
+        meta = {
+            "format": STORE_FORMAT,
+            "languages": list(self.languages),
+            "sources": self.sources,
+            "chapter_titles": self.chapter_titles,
+        }
+        if isinstance(self.sections, np.ndarray):
+            arrays["sections"] = self.sections
+        else:
+            meta["sections"] = list(self.sections)
+        for lang, columns in self.texts.items():
+            for field, column in columns.items():
+                arrays[f"{lang}.{field}.blob"] = column.blob
+                arrays[f"{lang}.{field}.offsets"] = column.offsets
+                arrays[f"{lang}.{field}.present"] = column.present
+        arrays["meta"] = np.frombuffer(json.dumps(meta, ensure_ascii=False).encode('utf-8'), dtype=np.uint8)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path, sources=None):
+        """Loads a prebuilt store. With `sources`, refuses a store built from other JSON files."""
+        try:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in data.files}
+            meta = json.loads(arrays.pop("meta").tobytes().decode('utf-8'))
+        except (OSError, ValueError, KeyError) as e:
+            raise SectionStoreError(f"Unreadable section store {path}: {e}")
+        if meta.get("format") != STORE_FORMAT:
+            raise SectionStoreError(f"Unsupported section store format: {meta.get('format')}")
+        if sources is not None and meta.get("sources") != sources:
+            raise SectionStoreError(f"Section store {os.path.basename(path)} is stale (source JSON changed)")
+
+        languages = meta["languages"]
+        sections = arrays["sections"] if "sections" in arrays else [sys.intern(s) for s in meta["sections"]]
+        return cls(
+            languages,
+            sections,
+            arrays["row_chapter"],
+            arrays["chapter_numbers"],
+            {
+                lang: [sys.intern(t) if t is not None else None for t in titles]
+                for lang, titles in meta["chapter_titles"].items()
+            },
+            {
+                lang: {
+                    field: TextColumn(
+                        arrays[f"{lang}.{field}.blob"],
+                        arrays[f"{lang}.{field}.offsets"],
+                        arrays[f"{lang}.{field}.present"]
+                    )
+                    for field in TEXT_FIELDS
+                }
+                for lang in languages
+            },
+            meta.get("sources")
+        )
+
+
+class SectionView(Sequence):
+    """One language of a SectionStore, usable like the old list of JSON records.
+
+    Indexes are store rows (aligned with the embedding matrices); a row missing
+    in this language falls back to the store's first language.
+    """
+
+    def __init__(self, store, lang):
+        self.store = store
+        self.lang = lang
+
+    def __len__(self):
+        return len(self.store)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        row = int(row)
+        if row < 0:
+            row += len(self.store)
+        if not 0 <= row < len(self.store):
+            raise IndexError(row)
+        return self.store.row(row, self.lang) or self.store.row(row, self.store.languages[0])
+
+    def get(self, section):
+        return self.store.get(section, self.lang)
@@ -0,0 +1,144 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+
+import numpy as np
+
+from bm25 import tokenize
+
+# --- CONFIGURATION ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_ENCODER_DIR = os.path.join(BASE_DIR, "models", "static-encoder")
+MANIFEST_FILE = "manifest.json"
+EMBEDDINGS_FILE = "token_embeddings.npy"
+WEIGHTS_FILE = "token_weights.npy"
+TOKENIZER_FILE = "tokenizer.json"
+STATIC_FORMAT = 1
+MAX_TOKENS = 512
+# Stub encoder (load testing without weights): width of the vectors and the
+# simulated per-call encoder cost
+STUB_DIMENSIONS = 384
+STUB_LATENCY_MS = float(os.environ.get("LEGAL_STUB_LATENCY_MS", "0"))
+
+
+class StaticEncoderError(Exception):
+    """Raised when the static encoder artifact is missing or fails verification."""
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class StaticEncoder:
+    """Sentence encoder made of a per-token embedding table, no transformer at query time.
+
+    Every vocabulary token was run through the full model once (see
+    build_static_encoder.py). Encoding a sentence is a tokenizer call, a table
+    lookup and a weighted mean, all in NumPy. The `encode()` signature follows
+    SentenceTransformer.encode so LegalClassifier can use either one.
+    """
+
+    def __init__(self, path=STATIC_ENCODER_DIR):
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            raise StaticEncoderError(f"No static encoder at {path}. Please run build_static_encoder.py.")
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format") != STATIC_FORMAT:
+            raise StaticEncoderError(f"Unsupported static encoder format: {self.manifest.get('format')}")
+        for filename, expected in self.manifest.get("files", {}).items():
+            file_path = os.path.join(path, filename)
+            if not os.path.exists(file_path) or _sha256(file_path) != expected:
+                raise StaticEncoderError(f"Static encoder file missing or corrupted: {filename}")
+
+        # tokenizers is the small Rust tokenizer package, it does not pull in torch
+        from tokenizers import Tokenizer
+        self.tokenizer = Tokenizer.from_file(os.path.join(path, TOKENIZER_FILE))
+        self.tokenizer.no_padding()
+        self.tokenizer.no_truncation()
+        # Memory-mapped: only the rows of tokens that actually occur get paged in
+        self.embeddings = np.load(os.path.join(path, EMBEDDINGS_FILE), mmap_mode='r')
+        self.weights = np.load(os.path.join(path, WEIGHTS_FILE))
+        self.dim = self.embeddings.shape[1]
+        self.vocab_size = self.embeddings.shape[0]
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def nbytes(self):
+        # The table is memory-mapped, this is its mapped size, not what is resident
+        return self.embeddings.nbytes + self.weights.nbytes
+
+    def encode(self, sentences, batch_size=256, convert_to_numpy=True, convert_to_tensor=False,
+               normalize_embeddings=False, show_progress_bar=False, **kwargs):
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        out = np.zeros((len(sentences), self.dim), dtype=np.float32)
+        for start in range(0, len(sentences), batch_size):
+            batch = sentences[start:start + batch_size]
+            for row, encoding in enumerate(self.tokenizer.encode_batch(batch, add_special_tokens=False)):
+                ids = [i for i in encoding.ids[:MAX_TOKENS] if i < self.vocab_size]
+                if not ids:
+                    continue
+                ids = np.asarray(ids)
+                weights = self.weights[ids]
+                total = weights.sum()
+                if total <= 0:
+                    continue
+                out[start + row] = (weights[:, None] * self.embeddings[ids].astype(np.float32)).sum(axis=0) / total
+
+        if normalize_embeddings:
+            norms = np.linalg.norm(out, axis=1, keepdims=True)
+            out = out / np.maximum(norms, 1e-12)
+        if convert_to_tensor:
+            import torch
+            out = torch.from_numpy(out)
+        return out[0] if single else out
+
+
+class StubEncoder:
+    """Weight-free stand-in for the sentence encoder, for load tests only.
+
+    Words are hashed onto fixed random vectors, so texts that share words are
+    similar and the keyword / template / fallback paths are all exercised, but
+    the scores mean nothing legally. `latency_ms` sleeps on every encode call to
+    emulate the cost of a real model.
+    """
+
+    BUCKETS = 4096
+
+    def __init__(self, dim=STUB_DIMENSIONS, latency_ms=STUB_LATENCY_MS):
+        self.dim = dim
+        self.latency_ms = latency_ms
+        self.table = np.random.default_rng(0).standard_normal((self.BUCKETS, dim)).astype(np.float32)
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def nbytes(self):
+        return self.table.nbytes
+
+    def encode(self, sentences, convert_to_numpy=True, normalize_embeddings=False, **kwargs):
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        out = np.zeros((len(sentences), self.dim), dtype=np.float32)
+        for row, sentence in enumerate(sentences):
+            buckets = [zlib.crc32(token.encode('utf-8')) % self.BUCKETS for token in tokenize(sentence)]
+            if buckets:
+                out[row] = self.table[buckets].mean(axis=0)
+
+        if normalize_embeddings:
+            out = out / np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-12)
+        return out[0] if single else out
@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+
+# --- CONFIGURATION ---
+# Categories whose exemplars are scored for each query
+TEMPLATE_TOP_CATEGORIES = int(os.environ.get("LEGAL_TEMPLATE_TOP_CATEGORIES", "3"))
+# Up to this many exemplars a flat scan is cheaper than the two-stage search
+TEMPLATE_FLAT_LIMIT = int(os.environ.get("LEGAL_TEMPLATE_FLAT_LIMIT", "256"))
+
+
+class TemplateIndex:
+    """Two-level nearest-template search: category centroids, then exemplars.
+
+    Exemplar embeddings are stored grouped by category so each category is one
+    contiguous block. A query is scored against the (unit-length) centroid of
+    every category, and only the exemplars of the best `top_categories` are
+    scored. Below `flat_limit` exemplars every template is scored directly.
+    Embeddings must be unit-normalized.
+    """
+
+    def __init__(self, embeddings, categories, top_categories=TEMPLATE_TOP_CATEGORIES, flat_limit=TEMPLATE_FLAT_LIMIT):
+        self.embeddings = embeddings
+        self.top_categories = top_categories
+        self.flat = len(categories) <= flat_limit
+
+        categories = np.asarray(categories, dtype=np.int64)
+        self.order = np.argsort(categories, kind='stable')
+        self.grouped = embeddings[self.order]
+        _, starts, counts = np.unique(categories[self.order], return_index=True, return_counts=True)
+        self.starts = starts
+        self.bounds = list(zip(starts.tolist(), (starts + counts).tolist()))
+        centroids = np.add.reduceat(self.grouped, starts, axis=0) / counts[:, None]
+        self.centroids = (centroids / np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)).astype(np.float32)
+
+    def __len__(self):
+        return len(self.order)
+
+    def search(self, query, lexical=None, fuse=None):
+        """(template index, score) of the best template for a unit-length query embedding.
+
+        `lexical` (dense per-template scores) is combined with `fuse(scores,
+        lexical)`; a category's lexical score is the best of its exemplars.
+        """
+        if lexical is not None:
+            lexical = np.asarray(lexical, dtype=np.float32)
+        if self.flat:
+            scores = self.embeddings @ query
+            if lexical is not None:
+                scores = fuse(scores, lexical)
+            best = int(scores.argmax())
+            return best, float(scores[best])
+
+        category_scores = self.centroids @ query
+        if lexical is not None:
+            category_scores = fuse(category_scores, np.maximum.reduceat(lexical[self.order], self.starts))
+        k = min(self.top_categories, len(self.bounds))
+        top = np.argpartition(-category_scores, k - 1)[:k]
+
+        best, best_score = None, None
+        for category in top:
+            start, end = self.bounds[category]
+            scores = self.grouped[start:end] @ query
+            members = self.order[start:end]
+            if lexical is not None:
+                scores = fuse(scores, lexical[members])
+            i = int(scores.argmax())
+            score, idx = float(scores[i]), int(members[i])
+            # Same tie-break as a flat argmax: the lowest template index wins
+            if best is None or score > best_score or (score == best_score and idx < best):
+                best, best_score = idx, score
+        return best, best_score
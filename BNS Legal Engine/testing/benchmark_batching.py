@@ -0,0 +1,91 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batch_planner import encode_planned, plan_batches, padding_stats, token_lengths, ENCODE_TOKEN_BUDGET
+
+# Usage: python testing/benchmark_batching.py [--repeat 3] [--requests 400] [--token-budget N]
+#
+# Corpus builds (templates, BNS, special acts) and a bulk encode of load-test
+# traffic, with the old call (one model.encode over the natural order:
+# sorted by characters, 32 texts per batch) and with the length-aware batch
+# planner. Reports wall time, padding efficiency (real / padded tokens) and the
+# largest difference between the two sets of embeddings.
+# Needs the transformer encoder (model pack or raw model): the static and stub
+# encoders do not pad.
+
+DEFAULT_BATCH = 32   # SentenceTransformer.encode default
+
+
+def natural_plan(texts, lengths):
+    """The batches SentenceTransformer.encode forms by itself."""
+    order = np.argsort([-len(t) for t in texts], kind='stable')
+    return [order[i:i + DEFAULT_BATCH] for i in range(0, len(order), DEFAULT_BATCH)]
+
+
+def unit(x):
+    x = np.asarray(x, dtype=np.float32)
+    return x / np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-12)
+
+
+def timed(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    from legal_classifier import LegalClassifier
+    from load_test import build_traffic
+
+    def arg(name, default):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    repeat = int(arg('--repeat', '3'))
+    budget = int(arg('--token-budget', str(ENCODE_TOKEN_BUDGET)))
+
+    lc = LegalClassifier(lexical_cascade=False)
+    model = lc.model
+    workloads = dict(lc._corpus_texts())
+    workloads["bulk traffic"] = [text for _, text, _ in build_traffic(int(arg('--requests', '400')))]
+
+    if token_lengths(model, ["probe"]) is None:
+        print("The loaded encoder has no tokenizer (static / stub): nothing to plan.")
+        return
+
+    print("="*86)
+    print(f"Bulk encode: natural order vs length-aware planner (token budget {budget}, best of {repeat})")
+    print("="*86)
+    print(f"{'workload':15}{'texts':>7}{'natural s':>11}{'planned s':>11}{'speedup':>9}"
+          f"{'pad eff nat':>13}{'pad eff plan':>14}{'max diff':>10}")
+    totals = [0.0, 0.0]
+    for name, texts in workloads.items():
+        if not texts:
+            continue
+        lengths = token_lengths(model, texts)
+        real, natural_padded = padding_stats(lengths, natural_plan(texts, lengths))
+        _, planned_padded = padding_stats(lengths, plan_batches(lengths, budget))
+
+        natural_s, natural = timed(lambda: model.encode(texts, convert_to_numpy=True), repeat)
+        planned_s, planned = timed(lambda: encode_planned(model, texts, token_budget=budget), repeat)
+        diff = float(np.abs(unit(natural) - unit(planned)).max())
+        totals[0] += natural_s
+        totals[1] += planned_s
+        print(f"{name:15}{len(texts):>7}{natural_s:>11.3f}{planned_s:>11.3f}{natural_s / planned_s:>8.2f}x"
+              f"{real / natural_padded:>13.1%}{real / planned_padded:>14.1%}{diff:>10.1e}")
+    print("-"*86)
+    print(f"{'total':15}{'':>7}{totals[0]:>11.3f}{totals[1]:>11.3f}{totals[0] / totals[1]:>8.2f}x")
+    print("="*86)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import os
+import sys
+import glob
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from legal_classifier import LegalClassifier, TEMPLATES_DIR, MODEL_FREE_STAGES
+
+# Usage: python testing/benchmark_cascade.py
+#
+# Runs the same requests through classify() with the stages between the exact
+# keywords and the encoder (phonetic keywords, fuzzy evidence, BM25) enabled
+# and disabled (pure neural path) and reports the share answered without the
+# encoder, latency, and how often both paths agree.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def build_requests():
+    requests = []
+    with open(os.path.join(HERE, 'keyword_test_summary.json'), encoding='utf-8') as f:
+        requests.extend((item['input'], 'en') for item in json.load(f))
+    for path in sorted(glob.glob(os.path.join(TEMPLATES_DIR, '*.txt'))):
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        # Full template, and a partial re-typed copy as officers usually paste
+        requests.append((content, 'hi'))
+        requests.append((content[len(content) // 4: 3 * len(content) // 4], 'hi'))
+    requests.extend([
+        ("पड़ोसी ने मेरी जमीन पर कब्जा कर लिया है और दीवार बना दी", 'hi'),
+        ("Two groups fought near the market over parking", 'en'),
+        ("someone keeps sending me threatening messages", 'en'),
+        ("my bag was lost in the bus, nothing else happened", 'en'),
+        ("counterfeit currency notes were found in his shop", 'en'),
+        ("public servant disobeying direction of law", 'en'),
+        ("होली के त्योहार पर रंग खेलने का आनंद", 'hi'),
+        ("लोक सेवक द्वारा कानून के निर्देश की अवज्ञा", 'hi'),
+    ])
+    return requests
+
+
+def signature(result):
+    """What the user sees: template, sections and special acts."""
+    return (
+        result.get('matched_template'),
+        tuple(s.get('Section') for s in result.get('relevant_sections', [])),
+        tuple(a.get('Section') for a in result.get('special_acts', []))
+    )
+
+
+def run(lc, requests, cascade):
+    """Classifies `requests`; without `cascade` only the exact keywords and the encoder
+    run (BM25, phonetic and fuzzy stages off), the pure neural reference."""
+    indexes = (lc.bns_phonetic, lc.special_acts_phonetic, lc.bns_fuzzy, lc.special_acts_fuzzy)
+    lc.lexical_cascade = cascade
+    if not cascade:
+        lc.bns_phonetic = lc.special_acts_phonetic = lc.bns_fuzzy = lc.special_acts_fuzzy = None
+    results, latencies = [], []
+    try:
+        for text, lang in requests:
+            t0 = time.perf_counter()
+            results.append(lc.classify(text, lang=lang))
+            latencies.append((time.perf_counter() - t0) * 1000)
+    finally:
+        lc.bns_phonetic, lc.special_acts_phonetic, lc.bns_fuzzy, lc.special_acts_fuzzy = indexes
+    return results, latencies
+
+
+def summarize(latencies):
+    ordered = sorted(latencies)
+    return sum(ordered) / len(ordered), ordered[len(ordered) // 2], ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+def main():
+    lc = LegalClassifier(lexical_cascade=True)
+    requests = build_requests()
+
+    # Warm up lazy embeddings so neither run pays for them
+    run(lc, requests[:3], False)
+
+    neural, neural_lat = run(lc, requests, False)
+    cascade, cascade_lat = run(lc, requests, True)
+
+    stages = {}
+    for result in cascade:
+        stage = result.get('analysis_stage', '?')
+        stages[stage] = stages.get(stage, 0) + 1
+    model_free = sum(stages.get(stage, 0) for stage in MODEL_FREE_STAGES)
+
+    agree = [signature(a) == signature(b) for a, b in zip(neural, cascade)]
+    lexical_agree = [ok for ok, r in zip(agree, cascade) if r.get('analysis_stage') == 'lexical']
+
+    print("="*70)
+    print(f"BM25 cascade benchmark ({len(requests)} requests)")
+    print("="*70)
+    print(f"Stages (cascade on): {stages}")
+    print(f"Answered without the encoder: {model_free}/{len(requests)} ({model_free / len(requests):.1%})")
+    for name, lat in (("neural only", neural_lat), ("cascade", cascade_lat)):
+        mean, p50, p95 = summarize(lat)
+        print(f"{name:12} latency: mean {mean:7.2f} ms | p50 {p50:7.2f} ms | p95 {p95:7.2f} ms")
+    print(f"Agreement with neural only: {sum(agree)}/{len(agree)} ({sum(agree) / len(agree):.1%})")
+    if lexical_agree:
+        print(f"  of which lexical answers : {sum(lexical_agree)}/{len(lexical_agree)}")
+    print("-"*70)
+    for (text, lang), a, b in zip(requests, neural, cascade):
+        if signature(a) != signature(b):
+            print(f"DIFF [{b.get('analysis_stage')}] {text[:40]!r}")
+            print(f"   neural : {signature(a)}")
+            print(f"   cascade: {signature(b)}")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document_analysis import PdfDocument, analyze_document
+
+# Usage: python testing/benchmark_documents.py [--pdf FILE] [--pages 40]
+#
+# Where the time of a PDF upload goes, by worker count: text extraction alone
+# (pypdf, each thread with its own reader, as analyze_pages does), classification
+# of the extracted pages alone, and the whole analyze_document(). pypdf is pure
+# Python and holds the GIL, so extraction is expected not to speed up with more
+# threads; only the classification (the encoder releases the GIL) overlaps.
+# Without --pdf the one-page PDF in test_output/ is repeated to --pages pages.
+# Works with any encoder (LEGAL_ENCODER=stub without model weights).
+
+WORKERS = [1, 2, 4]
+HERE = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_PDF = os.path.join(HERE, "test_output", "Extracted_Text_20260111_222839.pdf")
+
+
+def repeated_pdf(path, pages):
+    """The pages of `path` repeated until the document has `pages` pages."""
+    from pypdf import PdfReader, PdfWriter
+    reader, writer = PdfReader(path), PdfWriter()
+    for i in range(pages):
+        writer.add_page(reader.pages[i % len(reader.pages)])
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def timed_map(fn, items, workers):
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(fn, items))
+    return (time.perf_counter() - t0) * 1000, results
+
+
+def main():
+    from legal_classifier import LegalClassifier
+
+    pages = int(sys.argv[sys.argv.index('--pages') + 1]) if '--pages' in sys.argv else 40
+    if '--pdf' in sys.argv:
+        with open(sys.argv[sys.argv.index('--pdf') + 1], 'rb') as f:
+            data = f.read()
+    else:
+        data = repeated_pdf(SAMPLE_PDF, pages)
+
+    lc = LegalClassifier()
+    count = PdfDocument(data).page_count
+    texts = [PdfDocument(data).page_text(i) for i in range(count)]
+    lc.classify(texts[0], lang='hi')   # warm up
+
+    print("="*78)
+    print(f"PDF analysis: {count} pages, {os.cpu_count()} cores (ms per document)")
+    print("="*78)
+    print(f"{'workers':>8}{'extract':>10}{'speedup':>9} |{'classify':>10}{'speedup':>9} |{'analyze':>10}{'speedup':>9}")
+    base = None
+    for workers in WORKERS:
+        document = PdfDocument(data)
+        extract_ms, extracted = timed_map(document.page_text, range(count), workers)
+        assert extracted == texts
+        classify_ms, _ = timed_map(lambda text: lc.classify(text, lang='hi'), texts, workers)
+        t0 = time.perf_counter()
+        analyze_document(lc, PdfDocument(data), lang='hi', workers=workers)
+        analyze_ms = (time.perf_counter() - t0) * 1000
+        base = base or (extract_ms, classify_ms, analyze_ms)
+        print(f"{workers:>8}{extract_ms:>10.1f}{base[0] / extract_ms:>8.2f}x |"
+              f"{classify_ms:>10.1f}{base[1] / classify_ms:>8.2f}x |{analyze_ms:>10.1f}{base[2] / analyze_ms:>8.2f}x")
+    print("="*78)
+
+
+if __name__ == "__main__":
+    main()
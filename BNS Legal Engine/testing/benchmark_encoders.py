@@ -0,0 +1,165 @@
+import os
+import sys
+import json
+import glob
+import time
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Usage: python testing/benchmark_encoders.py [--queries N] [--variants raw,pack,static]
+#
+# Compares the raw fp32 model with the optimized model pack (build_model_pack.py)
+# and the static token embedding encoder (build_static_encoder.py).
+# Each variant runs in its own process so load time and memory are not shared.
+# Reports load time, per-query latency, resident memory and top-k agreement
+# with the raw model.
+
+TOP_K = 5
+VARIANTS = {
+    # variant: (LegalClassifier kwargs, expected model_info source)
+    'raw': ({'use_model_pack': False, 'encoder': 'transformer'}, 'raw'),
+    'pack': ({'use_model_pack': True, 'encoder': 'transformer'}, 'model_pack'),
+    'static': ({'encoder': 'static'}, 'static'),
+}
+HEADERS = {'raw': 'raw fp32', 'pack': 'model pack', 'static': 'static'}
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def rss_mb():
+    """Resident set size of this process in MB (Linux /proc, else peak RSS)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def build_queries(limit):
+    from legal_classifier import TEMPLATES_DIR
+    queries = []
+    with open(os.path.join(HERE, 'keyword_test_summary.json'), encoding='utf-8') as f:
+        queries.extend(item['input'] for item in json.load(f))
+    for path in sorted(glob.glob(os.path.join(TEMPLATES_DIR, '*.txt'))):
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        queries.append(content)
+        queries.append(content[:300])
+    queries.extend([
+        "मेरे घर से रात में सोने के गहने और नकद गायब हो गए",
+        "Two groups fought near the market and one man was injured",
+        "someone is sending me threatening messages on my phone",
+        "पड़ोसी ने मेरी जमीन पर कब्जा कर लिया है",
+        "my bag was lost in the bus, nothing else happened",
+    ])
+    return queries[:limit]
+
+
+def run_variant(variant, limit):
+    from legal_classifier import LegalClassifier
+
+    queries = build_queries(limit)
+    base_rss = rss_mb()
+    start = time.perf_counter()
+    lc = LegalClassifier(lexical_cascade=False, **VARIANTS[variant][0])
+    # Force every corpus embedding to exist, like a warmed up server
+    if lc.bns_embeddings is None:
+        lc.bns_embeddings = lc._encode(lc._bns_index_texts())
+    if lc.special_acts_embeddings is None:
+        lc.special_acts_embeddings = lc._encode(lc._special_acts_index_texts())
+    load_s = time.perf_counter() - start
+    loaded_rss = rss_mb()
+
+    latencies, top_bns, top_template = [], [], []
+    lc._encode(queries[0])  # warm up
+    for query in queries:
+        t0 = time.perf_counter()
+        emb = lc._encode(query)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        top_bns.append(lc._top_indices(lc.bns_embeddings @ emb, TOP_K).tolist())
+        top_template.append(int((lc.template_embeddings @ emb).argmax()))
+
+    latencies.sort()
+    return {
+        "variant": variant,
+        "source": lc.model_info.get("source"),
+        "load_s": load_s,
+        "rss_mb": loaded_rss,
+        "rss_delta_mb": loaded_rss - base_rss,
+        "latency_p50_ms": latencies[len(latencies) // 2],
+        "latency_p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "top_bns": top_bns,
+        "top_template": top_template
+    }
+
+
+def main():
+    limit = 200
+    if '--queries' in sys.argv:
+        limit = int(sys.argv[sys.argv.index('--queries') + 1])
+
+    if '--variant' in sys.argv:
+        variant = sys.argv[sys.argv.index('--variant') + 1]
+        print("@@RESULT@@" + json.dumps(run_variant(variant, limit)))
+        return
+
+    variants = ['raw', 'pack', 'static']
+    if '--variants' in sys.argv:
+        variants = sys.argv[sys.argv.index('--variants') + 1].split(',')
+    if 'raw' not in variants:
+        variants.insert(0, 'raw')  # the reference for agreement
+
+    results = {}
+    for variant in variants:
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--variant', variant, '--queries', str(limit)],
+            capture_output=True, text=True, encoding='utf-8'
+        )
+        line = next((l for l in proc.stdout.splitlines() if l.startswith("@@RESULT@@")), None)
+        if line is None:
+            print(f"⚠ Variant '{variant}' failed (skipped):\n{proc.stdout[-1000:]}\n{proc.stderr[-1000:]}")
+            continue
+        result = json.loads(line[len("@@RESULT@@"):])
+        if result['source'] != VARIANTS[variant][1]:
+            print(f"⚠ Variant '{variant}' fell back to '{result['source']}' (skipped). "
+                  f"Run build_model_pack.py / build_static_encoder.py first.")
+            continue
+        results[variant] = result
+
+    if 'raw' not in results:
+        print("⚠ The raw model is required as the reference.")
+        sys.exit(1)
+
+    raw = results['raw']
+    names = list(results)
+    n = len(raw['top_bns'])
+
+    print("="*70)
+    print(f"Encoder benchmark ({n} queries)")
+    print("="*70)
+    print(f"{'':24}" + "".join(f"{HEADERS[v]:>14}" for v in names))
+    print(f"{'Load + corpus ready':24}" + "".join(f"{results[v]['load_s']:>13.2f}s" for v in names))
+    print(f"{'Query latency p50':24}" + "".join(f"{results[v]['latency_p50_ms']:>12.2f}ms" for v in names))
+    print(f"{'Query latency p95':24}" + "".join(f"{results[v]['latency_p95_ms']:>12.2f}ms" for v in names))
+    print(f"{'RSS after load':24}" + "".join(f"{results[v]['rss_mb']:>12.0f}MB" for v in names))
+    print(f"{'RSS added by engine':24}" + "".join(f"{results[v]['rss_delta_mb']:>12.0f}MB" for v in names))
+    for variant in names[1:]:
+        other = results[variant]
+        top1 = sum(a[0] == b[0] for a, b in zip(raw['top_bns'], other['top_bns'])) / n
+        overlap = sum(len(set(a) & set(b)) / TOP_K for a, b in zip(raw['top_bns'], other['top_bns'])) / n
+        template = sum(a == b for a, b in zip(raw['top_template'], other['top_template'])) / n
+        print("-"*70)
+        print(f"{HEADERS[variant]} vs raw fp32")
+        print(f"  Top-1 BNS section agreement : {top1:.1%}")
+        print(f"  Top-{TOP_K} BNS overlap          : {overlap:.1%}")
+        print(f"  Best template agreement     : {template:.1%}")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
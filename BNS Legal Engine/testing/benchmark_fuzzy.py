@@ -0,0 +1,208 @@
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bm25 import TOKEN_RE
+from keyword_automaton import KeywordAutomaton
+from fuzzy_keywords import FuzzyKeywordIndex, edit_distance, max_edits
+from legal_classifier import BNS_KEYWORD_RULES, SPECIAL_ACTS_KEYWORD_RULES
+from document_analysis import page_confidence, EARLY_EXIT_CONFIDENCE
+from load_test import HINDI_FILLER, ENGLISH_FILLER, FALLBACK_EVENTS
+
+# Usage: python testing/benchmark_fuzzy.py
+#
+# 1. Scaling: the real keyword rules padded with synthetic keywords up to
+#    SIZES words; per-text latency of the symmetric-delete index vs checking
+#    the edit distance to every keyword word (naive, only up to NAIVE_LIMIT).
+# 2. Recall on the real rules: keywords with random typos inside filler
+#    sentences, rules found by the exact automaton vs the fuzzy index, and
+#    false hits of the fuzzy index on keyword-free texts.
+# 3. Everyday English and Hinglish with words one edit away from a keyword
+#    ("drums" / "drugs"): fuzzy index hits, and what classify() makes of them
+#    (sections of the matched rule listed, confident enough to end a document
+#    analysis early). Needs an encoder: run with LEGAL_ENCODER=stub without
+#    model weights.
+
+SIZES = [250, 1000, 10000, 50000]
+NAIVE_LIMIT = 10000
+TEXTS = 200
+RULES = BNS_KEYWORD_RULES + SPECIAL_ACTS_KEYWORD_RULES
+# Ordinary sentences whose words are close to crime keywords: random / ransom,
+# drums / drugs, betting / beating, stacking / stalking, ganna / ganja ...
+NON_LEGAL_TEXTS = [
+    "some random people came to my house",
+    "the drums were playing at the wedding",
+    "he was betting on cricket",
+    "workers were stacking boxes",
+    "he was scratching his head",
+    "the kids were drawing pictures",
+    "we are planning a trip to goa",
+    "my brother was fighting a cold all week",
+    "the shop was closed for the festival",
+    "we watched a thriller movie last night",
+    "wo ganna kha raha tha",
+    "mera dost drums bajata hai",
+    "hum sab cricket match dekh rahe the",
+    "usne naya phone kharida aur bahut khush tha",
+    "meri maa ne kheer banayi thi",
+    "bachche park mein khel rahe the",
+    "wo roz subah jogging karta hai",
+    "shaadi mein band baja aur sab naache",
+]
+DEVANAGARI = [chr(c) for c in range(0x0915, 0x0939)] + list("ािीुूेैोौं्")
+LATIN = "abcdefghijklmnopqrstuvwxyz"
+
+
+def typo(word, rng):
+    """`word` with max_edits(len(word)) random edits (substitute / delete / insert / swap)."""
+    alphabet = DEVANAGARI if any('ऀ' <= ch <= 'ॿ' for ch in word) else LATIN
+    for _ in range(max_edits(len(word))):
+        i = rng.randrange(1, len(word))   # keep the first letter, as typos usually do
+        kind = rng.choice("sdit")
+        if kind == "s":
+            word = word[:i] + rng.choice(alphabet) + word[i + 1:]
+        elif kind == "d":
+            word = word[:i] + word[i + 1:]
+        elif kind == "i":
+            word = word[:i] + rng.choice(alphabet) + word[i:]
+        elif i + 1 < len(word):
+            word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word
+
+
+def synthetic_rules(count, rng):
+    """The real rules plus single-word synthetic rules until there are `count` keyword words."""
+    rules = list(RULES)
+    words = len(FuzzyKeywordIndex(rules))
+    while words < count:
+        alphabet = DEVANAGARI if rng.random() < 0.5 else LATIN
+        rules.append(([''.join(rng.choice(alphabet) for _ in range(rng.randint(4, 12)))],))
+        words += 1
+    return rules
+
+
+def misspelled_text(rng):
+    """(text, rule index, keyword) with one keyword of the real rules misspelled."""
+    while True:
+        rule_idx = rng.randrange(len(RULES))
+        keyword = rng.choice(RULES[rule_idx][0])
+        words = TOKEN_RE.findall(keyword.lower())
+        fuzzable = [i for i, w in enumerate(words) if max_edits(len(w))]
+        if fuzzable:
+            break
+    i = rng.choice(fuzzable)
+    words[i] = typo(words[i], rng)
+    hindi = any('ऀ' <= ch <= 'ॿ' for ch in keyword)
+    filler = rng.sample(HINDI_FILLER if hindi else ENGLISH_FILLER, 2)
+    return f"{filler[0]} {' '.join(words)} {filler[1]}", rule_idx, keyword
+
+
+def naive_match(keyword_words, text):
+    found = set()
+    for token in TOKEN_RE.findall(text.lower()):
+        for word in keyword_words:
+            limit = max_edits(len(word))
+            if edit_distance(token, word, limit) <= limit:
+                found.add(word)
+    return found
+
+
+def scaling():
+    rng = random.Random(0)
+    texts = [misspelled_text(rng)[0] for _ in range(TEXTS)]
+    print("="*70)
+    print(f"Fuzzy keyword lookup scaling ({TEXTS} texts of ~{sum(len(t.split()) for t in texts) // TEXTS} words)")
+    print("="*70)
+    print(f"{'keywords':>10}{'build s':>10}{'index ms':>12}{'naive ms':>12}")
+    for size in SIZES:
+        rules = synthetic_rules(size, rng)
+        t0 = time.perf_counter()
+        index = FuzzyKeywordIndex(rules)
+        build = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for text in texts:
+            index.match(text)
+        index_ms = (time.perf_counter() - t0) / len(texts) * 1000
+
+        naive = "-"
+        if size <= NAIVE_LIMIT:
+            sample = texts[:20]
+            t0 = time.perf_counter()
+            for text in sample:
+                naive_match(index.words, text)
+            naive = f"{(time.perf_counter() - t0) / len(sample) * 1000:.2f}"
+        print(f"{len(index):>10}{build:>10.2f}{index_ms:>12.3f}{naive:>12}")
+
+
+def recall():
+    rng = random.Random(1)
+    automaton = KeywordAutomaton(RULES)
+    index = FuzzyKeywordIndex(RULES)
+    exact = fuzzy = 0
+    confidences = []
+    for _ in range(TEXTS):
+        text, rule_idx, _ = misspelled_text(rng)
+        if rule_idx in automaton.match(text):
+            exact += 1
+        hit = index.match(text).get(rule_idx)
+        if hit:
+            fuzzy += 1
+            confidences.append(hit["confidence"])
+
+    clean = HINDI_FILLER + ENGLISH_FILLER + [event for event, _ in FALLBACK_EVENTS]
+    false_hits = {text: index.match(text) for text in clean}
+    false_hits = {text: hits for text, hits in false_hits.items() if hits}
+
+    print("-"*70)
+    print(f"Misspelled keywords ({TEXTS} texts, typo in one keyword word of >= 5 letters)")
+    print(f"  exact automaton finds the rule: {exact / TEXTS:6.1%}")
+    print(f"  fuzzy index finds the rule:     {fuzzy / TEXTS:6.1%}  "
+          f"(mean confidence {sum(confidences) / max(1, len(confidences)):.2f})")
+    print(f"False fuzzy hits on {len(clean)} keyword-free texts: {len(false_hits)}")
+    for text, hits in false_hits.items():
+        print(f"  {text[:40]!r}: {[hit['keyword'] + ' <- ' + hit['found'] for hit in hits.values()]}")
+
+
+def non_legal():
+    from legal_classifier import LegalClassifier
+    lc = LegalClassifier()
+    index = FuzzyKeywordIndex(RULES)
+    hits = {text: index.match(text) for text in NON_LEGAL_TEXTS}
+    hits = {text: found for text, found in hits.items() if found}
+    listed, settled = [], []
+    for text in NON_LEGAL_TEXTS:
+        result = lc.classify(text)
+        sections = {s.get('Section') for s in result.get('relevant_sections', [])}
+        acts = {a.get('Section') for a in result.get('special_acts', [])}
+        fuzzy_sections = {sec for idx in lc.bns_fuzzy.match(text) for sec in BNS_KEYWORD_RULES[idx][1]}
+        fuzzy_acts = {SPECIAL_ACTS_KEYWORD_RULES[idx][1] for idx in lc.special_acts_fuzzy.match(text)}
+        if sections & fuzzy_sections or acts & fuzzy_acts:
+            listed.append(text)
+        if page_confidence(result) >= EARLY_EXIT_CONFIDENCE:
+            settled.append(text)
+
+    print("-"*70)
+    print(f"Everyday texts near keywords ({len(NON_LEGAL_TEXTS)} English / Hinglish)")
+    print(f"  fuzzy index hits (evidence only):       {len(hits)}")
+    for text, found in hits.items():
+        print(f"    {text[:40]!r}: {[hit['keyword'] + ' <- ' + hit['found'] for hit in found.values()]}")
+    print(f"  classify() lists the matched rule:      {len(listed)}")
+    print(f"  confidence >= {EARLY_EXIT_CONFIDENCE} (ends a document early): {len(settled)}")
+    for text in sorted(set(listed) | set(settled)):
+        print(f"    {text}")
+
+
+def main():
+    scaling()
+    recall()
+    non_legal()
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from legal_classifier import KEYWORD_STAGES
+from load_test import ENGLISH_FILLER, FALLBACK_EVENTS
+
+# Usage: python testing/benchmark_hinglish.py [--repeat 5]
+#
+# Classifies the Romanized Hindi complaints of hinglish_test_set.json with the
+# phonetic keyword index off and on: share answered by the keyword stages
+# (exact + phonetic), share with the expected section / act, latency per
+# request, and phonetic hits on plain English texts and on everyday Hinglish
+# without any offence (words one vowel away from a keyword). Run it with
+# LEGAL_ENCODER=stub on a machine without model weights (latency of the
+# texts that miss the keywords is then not representative).
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Non-legal Hinglish with near-collisions: mota / मोटा (fat) vs मौत (death),
+# chota (small) vs चोट (injury), ghus (entered) vs घूस (bribe), coat vs चोट ...
+NON_LEGAL_HINGLISH = [
+    "वह मोटा आदमी है",
+    "mera dost bahut mota hai aur wo khush hai",
+    "uski moti kitaab mere bag mein hai",
+    "mera chota bhai school gaya hai",
+    "usne mujhe chota sa gift diya hai",
+    "मेरा छोटा भाई खेल रहा है",
+    "wo bheed mein ghus gaya aur photo li",
+    "baarish mein mera coat geela ho gaya hai",
+    "meri beti ki shaadi mein bahut maza aaya",
+    "kal hum mandir gaye the aur prasad liya",
+    "hamara ghar naya hai aur bahut sundar hai",
+    "mujhe chai ke saath namkeen pasand hai",
+    "hum kal train se dilli ja rahe hain",
+    "mere papa ki dukaan par bahut bheed thi",
+    "uska naam ganesh hai aur wo dentist hai",
+]
+
+
+def found_expected(result, expected):
+    if expected is None:
+        return result.get('analysis_stage') not in KEYWORD_STAGES
+    if isinstance(expected, int):
+        return any(s.get('Section') == expected for s in result.get('relevant_sections', []))
+    return any(a.get('Section') == expected for a in result.get('special_acts', []))
+
+
+def run(lc, cases, repeat):
+    outcome = []
+    for case in cases:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = lc.classify(case['input'], lang='en')
+        outcome.append({
+            "ms": (time.perf_counter() - start) / repeat * 1000,
+            "stage": result.get('analysis_stage'),
+            "correct": found_expected(result, case['expected'])
+        })
+    return outcome
+
+
+def main():
+    from legal_classifier import LegalClassifier
+    repeat = int(sys.argv[sys.argv.index('--repeat') + 1]) if '--repeat' in sys.argv else 5
+
+    with open(os.path.join(HERE, 'hinglish_test_set.json'), encoding='utf-8') as f:
+        cases = json.load(f)
+    legal = [case for case in cases if case['expected'] is not None]
+
+    lc = LegalClassifier()
+    phonetic = (lc.bns_phonetic, lc.special_acts_phonetic)
+    lc.classify(cases[0]['input'])   # warm up (lazy corpus embeddings)
+
+    print("="*70)
+    print(f"Hinglish keyword matching ({len(legal)} complaints with a legal keyword, "
+          f"{len(cases) - len(legal)} without)")
+    print("="*70)
+    print(f"{'phonetic':>9}{'keyword hit':>13}{'correct':>10}{'mean ms':>10}{'p95 ms':>10}")
+    for mode in ('off', 'on'):
+        lc.bns_phonetic, lc.special_acts_phonetic = phonetic if mode == 'on' else (None, None)
+        outcome = run(lc, cases, repeat)
+        hits = sum(o['stage'] in KEYWORD_STAGES for o, c in zip(outcome, cases) if c['expected'] is not None)
+        correct = sum(o['correct'] for o in outcome)
+        latencies = sorted(o['ms'] for o in outcome)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"{mode:>9}{hits / len(legal):>13.1%}{correct / len(cases):>10.1%}"
+              f"{sum(latencies) / len(latencies):>10.2f}{p95:>10.2f}")
+        if mode == 'on':
+            misses = [c['input'] for o, c in zip(outcome, cases) if not o['correct']]
+
+    print("-"*70)
+    print("Not matched with the phonetic index:")
+    for text in misses or ["(none)"]:
+        print(f"  {text}")
+    english = ENGLISH_FILLER + [event for event, lang in FALLBACK_EVENTS if lang == 'en']
+    def phonetic_hits(texts):
+        return [text for text in texts if lc.bns_phonetic.match(text) or lc.special_acts_phonetic.match(text)]
+
+    print(f"Phonetic hits on {len(english)} plain English texts: {len(phonetic_hits(english))}")
+    false_hits = phonetic_hits(NON_LEGAL_HINGLISH)
+    print(f"Phonetic hits on {len(NON_LEGAL_HINGLISH)} non-legal Hinglish texts: {len(false_hits)}")
+    for text in false_hits:
+        print(f"  {text}")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Usage: python testing/benchmark_logging.py [--requests N] [--stub]
+#
+# Per-request latency of /api/analyze (Flask test client) under different
+# logging setups, all writing to a real file:
+#   sync       every record written on the request thread (what print() did)
+#   async      queue-backed, per-request detail for every request
+#   sampled    queue-backed, detail for LEGAL_LOG_SAMPLE of requests (10%)
+#   info       queue-backed, access log only (default level)
+#   off        WARNING and above only
+# Also times a bare disabled detail() call.
+
+import engine_log as log
+
+VARIANTS = [
+    # name, level, sample rate, queue
+    ("sync", "DEBUG", 1.0, False),
+    ("async", "DEBUG", 1.0, True),
+    ("sampled", "DEBUG", 0.1, True),
+    ("info", "INFO", 0.1, True),
+    ("off", "WARNING", 0.0, True),
+]
+
+
+def main():
+    count = int(sys.argv[sys.argv.index('--requests') + 1]) if '--requests' in sys.argv else 500
+    if '--stub' in sys.argv:
+        os.environ['LEGAL_ENCODER'] = 'stub'
+
+    from load_test import build_traffic
+    from app import app
+    client = app.test_client()
+    traffic = build_traffic(count, seed=1)
+    for _, text, lang in traffic[:20]:  # warm up lazy embeddings
+        client.post('/api/analyze', json={'fir_text': text, 'language': lang})
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, level, sample, use_queue in VARIANTS:
+            path = os.path.join(tmp, f"{name}.log")
+            with open(path, "a", encoding="utf-8") as stream:
+                log.setup(level=level, fmt="json", sample_rate=sample, stream=stream, use_queue=use_queue)
+                latencies = []
+                for _, text, lang in traffic:
+                    t0 = time.perf_counter()
+                    client.post('/api/analyze', json={'fir_text': text, 'language': lang})
+                    latencies.append((time.perf_counter() - t0) * 1000)
+                log.shutdown()
+            latencies.sort()
+            with open(path, encoding="utf-8") as f:
+                lines = sum(1 for _ in f)
+            results.append((name, sum(latencies) / len(latencies), latencies[len(latencies) // 2],
+                            latencies[int(len(latencies) * 0.95)], lines))
+
+    log.setup(level="WARNING", sample_rate=0.0)
+    n = 1_000_000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        if log.detail_enabled():
+            log.detail("x", a=1)
+    disabled_ns = (time.perf_counter() - t0) / n * 1e9
+
+    print("="*70)
+    print(f"Logging overhead ({count} /api/analyze requests, records written to a file)")
+    print("="*70)
+    print(f"{'variant':10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'log lines':>12}")
+    for name, mean, p50, p95, lines in results:
+        print(f"{name:10}{mean:>10.3f}{p50:>10.3f}{p95:>10.3f}{lines:>12}")
+    print("-"*70)
+    print(f"Disabled detail check: {disabled_ns:.0f} ns per call")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
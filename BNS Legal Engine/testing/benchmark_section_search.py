@@ -0,0 +1,94 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from section_search import SectionSearchIndex
+
+# Usage: python testing/benchmark_section_search.py [--queries 200] [--k 10]
+#
+# Section search latency as more legal codes are indexed. Extra codes are
+# synthetic copies of the BNS (same chapters, perturbed embeddings) added to
+# the real BNS + special acts index. For each size, three query kinds:
+# unfiltered, one act, one chapter of one act. Each kind is run as a full
+# scan with the filter applied afterwards (what a flat index does) and with
+# the chapter-partitioned index. Every result (first and second page) and
+# every total is checked against the full scan: the index must be exact.
+# Works with any encoder (LEGAL_ENCODER=stub without model weights).
+
+CODES = [0, 9, 49, 99]
+NOISE = 0.6
+
+
+def unit(x):
+    return (x / np.maximum(np.linalg.norm(x, axis=-1, keepdims=True), 1e-12)).astype(np.float32)
+
+
+def full_scan(index, query, k, acts=None, chapters=None):
+    """Every section scored, then filtered: the baseline."""
+    scores = index.matrix @ query
+    mask = np.ones(len(scores), dtype=bool)
+    if acts is not None:
+        mask &= np.isin(index.row_act, [index.acts.index(act) for act in acts])
+    if chapters is not None:
+        mask &= np.isin(np.repeat(index.part_chapter, index.ends - index.starts), chapters)
+    candidates = np.flatnonzero(mask)
+    top = candidates[np.argsort(-scores[candidates], kind='stable')[:k]]
+    return [(index.acts[index.row_act[i]], int(index.rows[i])) for i in top]
+
+
+def timed(fn, queries):
+    t0 = time.perf_counter()
+    results = [fn(q) for q in queries]
+    return (time.perf_counter() - t0) / len(queries) * 1000, results
+
+
+def main():
+    from legal_classifier import LegalClassifier
+    from load_test import build_traffic
+
+    def arg(name, default):
+        return int(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+
+    k = arg('--k', 10)
+    lc = LegalClassifier(lexical_cascade=False)
+    base = lc._section_search_index()
+    bns = lc.bns_embeddings
+    queries = lc._encode([text for _, text, _ in build_traffic(arg('--queries', 200))])
+    rng = np.random.default_rng(0)
+
+    print("="*84)
+    print(f"Section search: full scan + filter vs chapter-partitioned index (top {k}, mean ms per query)")
+    print("="*84)
+    print(f"{'sections':>9}{'partitions':>11} | {'unfiltered':>10}{'index':>8} | "
+          f"{'one act':>8}{'index':>8} | {'one chapter':>12}{'index':>8}")
+    for extra in CODES:
+        acts = {"bns": (lc.bns_store, bns), "special_acts": (lc.special_acts_store, lc.special_acts_embeddings)}
+        for i in range(extra):
+            acts[f"code_{i}"] = (lc.bns_store, unit(bns + NOISE * unit(rng.standard_normal(bns.shape))))
+        index = SectionSearchIndex(acts) if extra else base
+
+        def hits(found):
+            return [(act, row) for act, row, _ in found["hits"]]
+
+        scan_ms, exact = timed(lambda q: full_scan(index, q, 2 * k), queries)
+        index_ms, found = timed(lambda q: index.search(q, k), queries)
+        pages = [hits(index.search(q, k, offset=k)) for q in queries]
+        assert all(a[:k] == hits(b) and b["total"] == len(index) for a, b in zip(exact, found))
+        assert all(a[k:] == b for a, b in zip(exact, pages)), "second page differs from the full scan"
+        act_scan_ms, act_exact = timed(lambda q: full_scan(index, q, k, acts=["bns"]), queries)
+        act_ms, act_found = timed(lambda q: hits(index.search(q, k, acts=["bns"])), queries)
+        chapter_scan_ms, chapter_exact = timed(lambda q: full_scan(index, q, k, ["bns"], [17]), queries)
+        chapter_ms, chapter_found = timed(lambda q: hits(index.search(q, k, acts=["bns"], chapters=[17])), queries)
+        assert act_exact == act_found and chapter_exact == chapter_found
+        print(f"{len(index):>9}{len(index.starts):>11} | {scan_ms:>10.3f}{index_ms:>8.3f} | "
+              f"{act_scan_ms:>8.3f}{act_ms:>8.3f} | {chapter_scan_ms:>12.3f}{chapter_ms:>8.3f}")
+    print("="*84)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from template_index import TemplateIndex
+
+# Usage: python testing/benchmark_template_index.py [--skip-engine]
+#
+# 1. Synthetic scaling: clustered unit vectors (categories ~ sqrt(exemplars)),
+#    flat scan vs centroid-then-exemplar search: latency and top-1 agreement.
+# 2. The real templates: matched template of every benchmark request with the
+#    flat scan and with the two-stage search forced on.
+
+DIM = 384
+SIZES = [8, 100, 1000, 10000, 50000]
+QUERIES = 300
+
+
+def unit(x):
+    return (x / np.linalg.norm(x, axis=-1, keepdims=True)).astype(np.float32)
+
+
+def synthetic(n, rng):
+    n_categories = max(6, int(np.sqrt(n)))
+    centers = unit(rng.standard_normal((n_categories, DIM)))
+    categories = rng.integers(0, n_categories, n)
+    categories[:n_categories if n >= n_categories else n] = np.arange(min(n, n_categories))
+    exemplars = unit(centers[categories] + 1.5 * unit(rng.standard_normal((n, DIM))))
+    picks = rng.integers(0, n, QUERIES)
+    queries = unit(exemplars[picks] + 0.8 * unit(rng.standard_normal((QUERIES, DIM))))
+    return exemplars, categories, queries
+
+
+def timed(index, queries):
+    results = []
+    t0 = time.perf_counter()
+    for q in queries:
+        results.append(index.search(q)[0])
+    return (time.perf_counter() - t0) / len(queries) * 1000, results
+
+
+def scaling():
+    rng = np.random.default_rng(0)
+    print("="*70)
+    print("Template search scaling (synthetic clustered embeddings)")
+    print("="*70)
+    print(f"{'exemplars':>10}{'categories':>12}{'flat ms':>10}{'2-stage ms':>12}{'agreement':>12}")
+    for n in SIZES:
+        exemplars, categories, queries = synthetic(n, rng)
+        flat_ms, flat = timed(TemplateIndex(exemplars, categories, flat_limit=n), queries)
+        tree_ms, tree = timed(TemplateIndex(exemplars, categories, flat_limit=0), queries)
+        agreement = sum(a == b for a, b in zip(flat, tree)) / len(queries)
+        print(f"{n:>10}{len(set(categories.tolist())):>12}{flat_ms:>10.3f}{tree_ms:>12.3f}{agreement:>12.1%}")
+
+
+def engine():
+    from legal_classifier import LegalClassifier
+    from benchmark_cascade import build_requests
+
+    lc = LegalClassifier(lexical_cascade=False)
+    requests = build_requests()
+    outcome = {}
+    for mode in ('flat', 'two-stage'):
+        lc.template_index.flat = (mode == 'flat')
+        outcome[mode] = [lc.classify(text, lang=lang).get('matched_template') for text, lang in requests]
+    agree = sum(a == b for a, b in zip(outcome['flat'], outcome['two-stage']))
+    print("-"*70)
+    print(f"Real templates ({len(lc.templates)} exemplars, {len(lc.template_categories)} categories, "
+          f"{len(requests)} requests)")
+    print(f"Matched template agreement flat vs two-stage: {agree}/{len(requests)}")
+    for (text, _), a, b in zip(requests, outcome['flat'], outcome['two-stage']):
+        if a != b:
+            print(f"  DIFF {text[:40]!r}: {a} -> {b}")
+
+
+def main():
+    scaling()
+    if '--skip-engine' not in sys.argv:
+        engine()
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+import os
+import sys
+import glob
+import json
+import time
+import random
+import threading
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Usage:
+#   python testing/load_test.py [--stub] [--concurrency 1,4,8] [--requests 400]
+#   python testing/load_test.py --url http://127.0.0.1:5000 --concurrency 16
+#
+# Replays a mix of /api/analyze traffic against app.py and reports throughput,
+# p50/p95/p99 latency and error rate per concurrency level.
+#   in-process (default): Flask test client, one engine shared by all workers
+#   --url               : a running server (start it with LEGAL_ENCODER=stub to
+#                         load test without model weights)
+#   --stub              : in-process only, use the weight-free stub encoder
+#   --stub-latency-ms N : simulated encoder cost per call for the stub
+#   --json PATH         : also write the raw report as JSON
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Share of each traffic category in the replayed mix
+TRAFFIC_MIX = {
+    "keyword": 0.35,     # text containing a legal keyword (answered by the automaton)
+    "template": 0.35,    # FIR reports as typed/OCR'd by stations, full or partial
+    "fallback": 0.30,    # narratives with no keyword, served by the semantic search
+}
+
+HINDI_FILLER = [
+    "कल शाम को मैं अपने परिवार के साथ घर पर था।",
+    "यह घटना गांव के मुख्य बाजार के पास हुई।",
+    "मैंने आसपास के लोगों से भी पूछताछ की।",
+    "मैं इस मामले में उचित कार्रवाई का अनुरोध करता हूं।",
+    "घटना के समय वहां कुछ लोग मौजूद थे।",
+]
+ENGLISH_FILLER = [
+    "Yesterday evening I was at home with my family.",
+    "The incident took place near the main market of the village.",
+    "I asked the people nearby about what happened.",
+    "I request you to take appropriate action in this matter.",
+    "A few people were present at the time of the incident.",
+]
+FALLBACK_EVENTS = [
+    ("पड़ोसी ने मेरी जमीन पर दीवार बना दी और रास्ता बंद कर दिया।", 'hi'),
+    ("दुकानदार ने पैसे लेकर सामान नहीं दिया और अब फोन नहीं उठाता।", 'hi'),
+    ("होली के त्योहार पर हमने रंग खेला और मिठाई बांटी।", 'hi'),
+    ("लोक सेवक ने कानून के निर्देश की अवज्ञा की।", 'hi'),
+    ("My neighbour built a wall on my land and blocked the road.", 'en'),
+    ("The shopkeeper took the money but never delivered the goods.", 'en'),
+    ("Counterfeit currency notes were found in his shop.", 'en'),
+    ("My bag was left in the bus and I could not find it later.", 'en'),
+]
+
+
+def percentile(ordered, p):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def build_traffic(count, seed=0):
+    """[(category, text, lang), ...] drawn from the FIR reports, the keyword test
+    inputs and synthetic FIRs, in TRAFFIC_MIX proportions."""
+    from legal_classifier import TEMPLATES_DIR, BNS_KEYWORD_RULES, SPECIAL_ACTS_KEYWORD_RULES
+    from keyword_automaton import KeywordAutomaton
+
+    rng = random.Random(seed)
+    automata = [KeywordAutomaton(BNS_KEYWORD_RULES), KeywordAutomaton(SPECIAL_ACTS_KEYWORD_RULES)]
+
+    def has_keyword(text):
+        return any(automaton.match(text) for automaton in automata)
+
+    def narrative(event, lang, sentences):
+        filler = HINDI_FILLER if lang == 'hi' else ENGLISH_FILLER
+        parts = rng.sample(filler, min(sentences, len(filler))) + [event]
+        rng.shuffle(parts)
+        return " ".join(parts)
+
+    with open(os.path.join(HERE, 'keyword_test_summary.json'), encoding='utf-8') as f:
+        keyword_inputs = [item['input'] for item in json.load(f)]
+
+    def keyword_request():
+        if rng.random() < 0.3:
+            return rng.choice(keyword_inputs), 'en'
+        keywords, *_ = rng.choice(BNS_KEYWORD_RULES + SPECIAL_ACTS_KEYWORD_RULES)
+        keyword = rng.choice(keywords)
+        lang = 'hi' if any('ऀ' <= ch <= 'ॿ' for ch in keyword) else 'en'
+        # Short (one line) or long (a full complaint around the keyword)
+        return narrative(keyword, lang, rng.choice([0, 1, 4])), lang
+
+    reports = []
+    for path in sorted(glob.glob(os.path.join(TEMPLATES_DIR, '*.txt'))):
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            reports.append(f.read())
+
+    def template_request():
+        content = rng.choice(reports)
+        start = rng.randint(0, len(content) // 3)
+        end = rng.randint(start + len(content) // 3, len(content))
+        return (content if rng.random() < 0.4 else content[start:end]), 'hi'
+
+    def fallback_request():
+        for _ in range(20):
+            event, lang = rng.choice(FALLBACK_EVENTS)
+            text = narrative(event, lang, rng.choice([0, 2, 4]))
+            if not has_keyword(text):
+                return text, lang
+        return "होली के त्योहार पर हमने रंग खेला।", 'hi'
+
+    makers = {"keyword": keyword_request, "template": template_request, "fallback": fallback_request}
+    categories = rng.choices(list(TRAFFIC_MIX), weights=list(TRAFFIC_MIX.values()), k=count)
+    return [(category, *makers[category]()) for category in categories]
+
+
+class InProcessClient:
+    """Flask test client around app.py (one per worker thread, one shared engine)."""
+
+    def __init__(self):
+        from app import app
+        self.app = app
+        self.local = threading.local()
+
+    def post(self, payload):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        response = client.post('/api/analyze', json=payload)
+        return response.status_code, response.get_json(silent=True)
+
+    def get(self, path):
+        response = self.app.test_client().get(path)
+        return response.get_json(silent=True)
+
+
+class HttpClient:
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+
+    def post(self, payload):
+        req = urllib.request.Request(
+            self.url + '/api/analyze',
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=60) as resp:
+                return resp.status, json.loads(resp.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+    def get(self, path):
+        try:
+            with urllib.request.urlopen(self.url + path, timeout=10) as resp:
+                return json.loads(resp.read().decode('utf-8'))
+        except (urllib.error.URLError, ValueError):
+            return None
+
+
+def run_level(client, traffic, concurrency):
+    """Closed loop: `concurrency` workers send the requests back to back."""
+    records = []
+    lock = threading.Lock()
+    cursor = iter(traffic)
+
+    def worker():
+        while True:
+            with lock:
+                item = next(cursor, None)
+            if item is None:
+                return
+            category, text, lang = item
+            t0 = time.perf_counter()
+            try:
+                status, body = client.post({'fir_text': text, 'language': lang})
+                error = None if status == 200 else f"HTTP {status}"
+            except Exception as e:
+                body, error = None, type(e).__name__
+            latency = (time.perf_counter() - t0) * 1000
+            stage = (body or {}).get('analysis_stage') if isinstance(body, dict) else None
+            with lock:
+                records.append({"category": category, "lang": lang, "chars": len(text),
+                                "latency_ms": latency, "error": error, "stage": stage})
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    elapsed = time.perf_counter() - start
+    return records, elapsed
+
+
+def summarize(records, elapsed):
+    latencies = sorted(r['latency_ms'] for r in records)
+    errors = [r for r in records if r['error']]
+    return {
+        "requests": len(records),
+        "errors": len(errors),
+        "error_rate": len(errors) / len(records) if records else 0.0,
+        "throughput_rps": len(records) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "max_ms": latencies[-1] if latencies else 0.0,
+    }
+
+
+def main():
+    def arg(name, default):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    levels = [int(c) for c in arg('--concurrency', '1,4,8').split(',')]
+    count = int(arg('--requests', '400'))
+    url = arg('--url', None)
+
+    if '--stub' in sys.argv:
+        if url:
+            print("⚠ --stub only applies in-process, start the server with LEGAL_ENCODER=stub instead.")
+        os.environ['LEGAL_ENCODER'] = 'stub'
+        os.environ['LEGAL_STUB_LATENCY_MS'] = arg('--stub-latency-ms', os.environ.get('LEGAL_STUB_LATENCY_MS', '0'))
+
+    traffic = build_traffic(count, seed=int(arg('--seed', '0')))
+    client = HttpClient(url) if url else InProcessClient()
+
+    # Warm up (lazy corpus embeddings, first request overheads)
+    run_level(client, traffic[:min(10, len(traffic))], 1)
+    engine_info = client.get('/api/stats') or {}
+
+    report = {"target": url or "in-process", "mix": TRAFFIC_MIX, "levels": []}
+    print("="*78)
+    print(f"Load test: {count} requests per level against {report['target']}")
+    print("Mix: " + ", ".join(f"{name} {share:.0%}" for name, share in TRAFFIC_MIX.items()))
+    if engine_info.get('model_free_share') is not None:
+        print(f"Engine stats endpoint reachable (model-free share so far {engine_info['model_free_share']:.0%})")
+    print("="*78)
+    print(f"{'conc':>5}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errors':>10}")
+    for concurrency in levels:
+        records, elapsed = run_level(client, traffic, concurrency)
+        overall = summarize(records, elapsed)
+        by_category = {
+            category: summarize([r for r in records if r['category'] == category], elapsed)
+            for category in TRAFFIC_MIX
+        }
+        stages = {}
+        for r in records:
+            stages[r['stage']] = stages.get(r['stage'], 0) + 1
+        report["levels"].append({"concurrency": concurrency, "overall": overall,
+                                 "categories": by_category, "stages": stages})
+        print(f"{concurrency:>5}{overall['throughput_rps']:>10.1f}{overall['p50_ms']:>10.1f}"
+              f"{overall['p95_ms']:>10.1f}{overall['p99_ms']:>10.1f}{overall['max_ms']:>10.1f}"
+              f"{overall['error_rate']:>9.1%}")
+
+    last = report["levels"][-1]
+    print("-"*78)
+    print(f"Per category at concurrency {last['concurrency']}:")
+    for category, summary in last["categories"].items():
+        print(f"  {category:10} n={summary['requests']:<5} p50 {summary['p50_ms']:7.1f} ms | "
+              f"p95 {summary['p95_ms']:7.1f} ms | p99 {summary['p99_ms']:7.1f} ms | errors {summary['errors']}")
+    print(f"Stages: {last['stages']}")
+    print("="*78)
+
+    if '--json' in sys.argv:
+        with open(arg('--json', None), 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Usage: python testing/memory_report.py [--stub]
+#
+# Memory held by the engine per component (model, embedding matrices, datasets),
+# and the datasets as the old lists of JSON dicts vs the columnar section store.
+# --stub uses the weight-free stub encoder (no model needed).
+
+
+def deep_sizeof(obj, seen=None):
+    """sys.getsizeof over containers, each object counted once."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def kb(n):
+    return f"{n / 1024:10.1f} KB"
+
+
+def main():
+    if '--stub' in sys.argv:
+        os.environ['LEGAL_ENCODER'] = 'stub'
+    from legal_classifier import LegalClassifier, BNS_FILE, BNS_FILE_EN, SPECIAL_ACTS_FILE, SPECIAL_ACTS_FILE_EN
+
+    lc = LegalClassifier()
+    # Force every corpus embedding to exist, like a warmed up server
+    if lc.bns_embeddings is None:
+        lc.bns_embeddings = lc._encode(lc._bns_index_texts())
+    if lc.special_acts_embeddings is None:
+        lc.special_acts_embeddings = lc._encode(lc._special_acts_index_texts())
+    report = lc.memory_report()
+
+    print("="*60)
+    print(f"Engine memory by component (encoder: {lc.model_info.get('source')})")
+    print("="*60)
+    print(f"{'model':32}{kb(report['model'])}")
+    for name, size in report['embeddings'].items():
+        print(f"{'embeddings / ' + name:32}{kb(size)}")
+    for name, size in report['datasets'].items():
+        print(f"{'datasets / ' + name:32}{kb(size)}")
+    print(f"{'total':32}{kb(report['total'])}")
+
+    print("-"*60)
+    print("Datasets: JSON dict lists vs columnar store")
+    for name, files, store in (
+        ("bns", (BNS_FILE, BNS_FILE_EN), lc.bns_store),
+        ("special_acts", (SPECIAL_ACTS_FILE, SPECIAL_ACTS_FILE_EN), lc.special_acts_store),
+    ):
+        lists = []
+        for path in files:
+            with open(path, 'r', encoding='utf-8') as f:
+                lists.append(json.load(f))
+        as_json = deep_sizeof(lists)
+        print(f"  {name:14} json {kb(as_json)} | store {kb(store.nbytes())} | {store.nbytes() / as_json:6.1%}")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import os
+import glob
+
+from legal_classifier import LegalClassifier, TEMPLATES_DIR
+from document_analysis import TextDocument, analyze_document
+
+print("Testing Page-Level Document Analysis")
+print("="*50)
+
+lc = LegalClassifier()
+
+# A "document" of FIR reports, one per page (form feed separated), with an
+# obvious keyword page in the middle
+pages = []
+for path in sorted(glob.glob(os.path.join(TEMPLATES_DIR, '*.txt'))):
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        pages.append(f.read())
+pages.insert(3, "आरोपी ने रात में घर में घुसकर चोरी की और मोबाइल ले गया")
+pages.insert(5, "   ")  # blank page, like a scan without a text layer
+document = TextDocument("\f".join(pages))
+
+verdict = analyze_document(lc, document, lang='hi', workers=4)
+print(f"Pages: {verdict['page_count']} | processed: {verdict['pages_processed']} | empty: {verdict['empty_pages']}")
+print(f"Template: {verdict['matched_template']}")
+for section in verdict['relevant_sections'][:8]:
+    print(f"  - Section {section['Section']:<5} conf {section['confidence']:.2f} pages {section['pages']}")
+
+# Pages must be classified exactly like a single request
+same = all(
+    page['result'] == lc.classify(pages[page['page'] - 1], lang='hi')
+    for page in verdict['pages'] if page.get('result')
+)
+print(f"\nPage results == classify(page): {same}")
+
+# Early exit: with one worker, stops at the first page with high-confidence sections
+early = analyze_document(lc, document, lang='hi', workers=1, early_exit=True)
+print(f"Early exit: processed {early['pages_processed']}/{early['page_count']} pages, stopped_early={early['stopped_early']}")
+print(f"Early exit sections: {[(s['Section'], s['pages']) for s in early['relevant_sections']]}")
+
+print("\n" + "="*50)
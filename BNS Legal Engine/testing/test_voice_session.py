@@ -0,0 +1,34 @@
+from legal_classifier import LegalClassifier
+from voice_session import VoiceSession
+
+print("Testing Incremental Voice Session")
+print("="*50)
+
+lc = LegalClassifier()
+
+# Segments as they would arrive from the speech service, the keyword
+# "ghar me chori" is split across two segments on purpose.
+segments = ["kal raat", "hamare ghar me", "chori ho gayi", "aur mobile bhi le gaye"]
+
+session = VoiceSession(lc, lang='hi', debounce=0.2)
+for segment in segments:
+    snap = session.append(segment)
+    sections = [str(s.get('Section')) for s in (snap['result'] or {}).get('relevant_sections', [])]
+    print(f"+ '{segment}' -> stage={snap['stage']} sections={', '.join(sections) or '-'}")
+
+final = session.close()
+incremental = final['result']
+full = lc.classify(final['text'], lang='hi')
+
+same = [s.get('Section') for s in incremental['relevant_sections']] == [s.get('Section') for s in full['relevant_sections']]
+print(f"\nFull text: '{final['text']}'")
+print(f"Incremental == full classify: {same}")
+
+# No keyword at all -> semantic stage runs once after the debounce
+session = VoiceSession(lc, lang='en', debounce=0.2)
+session.append("the neighbours were shouting")
+session.append("late in the night")
+final = session.close()
+print(f"\nSemantic stage: {final['stage']} | template: {final['result'].get('matched_template')}")
+
+print("\n" + "="*50)
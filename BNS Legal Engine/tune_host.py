@@ -0,0 +1,145 @@
+import os
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Usage: python tune_host.py [--quick] [--out PATH]
+#        python tune_host.py --stub --out PATH
+#
+# Benchmarks the encoder on this machine and writes models/host-profile.json,
+# which LegalClassifier and app.py apply at startup (reported at /healthz):
+#   intra_op_threads     torch threads per encode
+#   workers              requests allowed to run the encoder at once
+#   document_workers     pages of one document classified in parallel
+#   encode_token_budget  padded tokens per bulk encoder batch (batch_planner.py)
+# Every (threads, workers) pair up to twice the core count is run as a closed
+# loop of single-text encodes; the pair with the best throughput whose p95
+# stays within LATENCY_SLACK of the best single-request p95 wins.
+# The profile records the encoder it was measured with and is only applied
+# to that encoder.
+#   --stub   tune the pipeline with the weight-free stub encoder (no torch,
+#            no tokenizer: only the worker count is meaningful). Needs --out,
+#            a stub profile must not replace the real one
+#   --quick  fewer requests per measurement
+
+LATENCY_SLACK = 1.5
+TOKEN_BUDGETS = [2048, 4096, 8192, 16384, 32768]
+
+
+def powers_of_two(limit):
+    values, n = [], 1
+    while n < limit:
+        values.append(n)
+        n *= 2
+    return values + [limit]
+
+
+def percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] if ordered else 0.0
+
+
+def closed_loop(model, queries, workers):
+    """`workers` threads encode `queries` back to back. Returns (requests/s, p50 ms, p95 ms)."""
+    latencies, lock = [], threading.Lock()
+    cursor = iter(queries)
+
+    def worker():
+        while True:
+            with lock:
+                text = next(cursor, None)
+            if text is None:
+                return
+            t0 = time.perf_counter()
+            model.encode(text, convert_to_numpy=True)
+            with lock:
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _ in range(workers):
+            pool.submit(worker)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return len(queries) / elapsed, percentile(latencies, 0.5), percentile(latencies, 0.95)
+
+
+def main():
+    out = sys.argv[sys.argv.index('--out') + 1] if '--out' in sys.argv else None
+    if '--stub' in sys.argv:
+        if out is None:
+            print("⚠ --stub measures a sleep, not the model: pass --out PATH (the default profile is left alone)")
+            sys.exit(1)
+        os.environ['LEGAL_ENCODER'] = 'stub'
+        os.environ.setdefault('LEGAL_STUB_LATENCY_MS', '20')
+    quick = '--quick' in sys.argv
+
+    from legal_classifier import LegalClassifier
+    from batch_planner import encode_planned, token_lengths
+    from host_profile import save_profile, apply_threads, HOST_PROFILE_FILE
+
+    print("Loading encoder and corpora...")
+    # The current profile must not cap the measurements
+    lc = LegalClassifier(lexical_cascade=False, fuzzy_keywords=False, phonetic_keywords=False, host_profile=False)
+    corpora = lc._corpus_texts()
+    # Query mix: section texts (short) and template excerpts (long)
+    sections = corpora["bns"][::max(1, len(corpora["bns"]) // 48)]
+    templates = [t[:1500] for t in corpora["templates"]]
+    queries = (sections + templates) * (1 if quick else 3)
+    bulk = corpora["bns"][:120 if quick else None] + corpora["templates"]
+
+    cores = os.cpu_count() or 1
+    uses_torch = apply_threads(None) is not None
+    thread_options = powers_of_two(cores) if uses_torch else [None]
+
+    print("="*70)
+    print(f"Tuning on {cores} cores, encoder {lc.model_info.get('source')}, {len(queries)} requests per run")
+    print("="*70)
+    print(f"{'threads':>8}{'workers':>9}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    runs = []
+    closed_loop(lc.model, queries[:5], 1)   # warm up
+    for threads in thread_options:
+        apply_threads(threads)
+        for workers in powers_of_two(max(1, 2 * cores // (threads or 1))):
+            rps, p50, p95 = closed_loop(lc.model, queries, workers)
+            runs.append({"threads": threads, "workers": workers, "rps": rps, "p50_ms": p50, "p95_ms": p95})
+            print(f"{threads or '-':>8}{workers:>9}{rps:>10.1f}{p50:>10.1f}{p95:>10.1f}")
+
+    best_single = min(r["p95_ms"] for r in runs if r["workers"] == 1)
+    eligible = [r for r in runs if r["p95_ms"] <= LATENCY_SLACK * best_single] or runs
+    chosen = max(eligible, key=lambda r: (r["rps"], -r["workers"]))
+
+    apply_threads(chosen["threads"])
+    print("-"*70)
+    budgets, best_budget = [], None
+    if token_lengths(lc.model, ["probe"]) is None:
+        # Without a tokenizer nothing is planned: every budget would measure the same
+        print("Encoder has no tokenizer: token budget not tuned")
+    else:
+        print(f"{'token budget':>13}{'texts/s':>10}")
+        for budget in TOKEN_BUDGETS:
+            t0 = time.perf_counter()
+            encode_planned(lc.model, bulk, token_budget=budget)
+            rate = len(bulk) / (time.perf_counter() - t0)
+            budgets.append({"token_budget": budget, "texts_per_s": rate})
+            print(f"{budget:>13}{rate:>10.1f}")
+        best_budget = max(budgets, key=lambda b: b["texts_per_s"])["token_budget"]
+
+    profile = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "encoder": lc.model_info.get("source"),
+        "intra_op_threads": chosen["threads"],
+        "workers": chosen["workers"],
+        "document_workers": chosen["workers"],
+        "encode_token_budget": best_budget,
+        "measurements": {"concurrency": runs, "token_budgets": budgets}
+    }
+    save_profile(profile, out or HOST_PROFILE_FILE)
+    print("="*70)
+    print(f"✔ Profile written to {out or HOST_PROFILE_FILE}: threads {chosen['threads'] or '-'}, "
+          f"workers {chosen['workers']}, token budget {best_budget or '-'} "
+          f"({chosen['rps']:.1f} req/s, p95 {chosen['p95_ms']:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
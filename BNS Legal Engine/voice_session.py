@@ -0,0 +1,215 @@
+import queue
+import threading
+import time
+import uuid
+
+# --- CONFIGURATION ---
+# Semantic re-scoring waits for a pause of this many seconds in the dictation...
+SEMANTIC_DEBOUNCE_SECONDS = 1.5
+# ...but never lets new text sit unscored for longer than this.
+SEMANTIC_MAX_DELAY_SECONDS = 5.0
+# Sessions with no activity for this long are dropped.
+SESSION_IDLE_TIMEOUT_SECONDS = 15 * 60
+
+
+class VoiceSession:
+    """Incremental classification state for one dictation.
+
+    Recognized segments are appended as they arrive from the speech service.
+    Only the new text is fed through the keyword automata (their scan state is
+    kept here), so the keyword stage costs O(len(segment)) per update. The
+    semantic stage (encoder + similarity searches) only runs when no keyword
+    rule has fired, and is debounced so it re-scores once per pause instead of
+    once per segment. Every change is pushed to subscribers as an event.
+    """
+
+    def __init__(self, engine, lang='hi', debounce=SEMANTIC_DEBOUNCE_SECONDS,
+                 max_delay=SEMANTIC_MAX_DELAY_SECONDS):
+        self.engine = engine
+        self.lang = lang
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.session_id = uuid.uuid4().hex
+        self.segments = []
+        self.text = ""
+        self.version = 0
+        self.last_activity = time.time()
+        self.closed = False
+
+        # Keyword stage state
+        self.bns_state = 0
+        self.special_acts_state = 0
+        self.bns_rule_ids = set()
+        self.special_rule_ids = set()
+        self.keyword_result = None
+
+        # Semantic stage state
+        self.semantic_result = None
+        self.semantic_version = 0
+        self.pending_since = None
+        self.timer = None
+
+        self.subscribers = []
+        self.lock = threading.RLock()
+
+    def append(self, segment):
+        """Adds a recognized segment and returns the provisional snapshot."""
+        segment = segment.strip()
+        with self.lock:
+            if self.closed:
+                raise ValueError("Session is closed")
+            self.last_activity = time.time()
+            if not segment:
+                return self.snapshot()
+
+            # Segments are joined with a space, the separator goes through the
+            # automata too so keywords spanning two segments are still found.
+            new_text = f" {segment}" if self.text else segment
+            self.text += new_text
+            self.segments.append(segment)
+            self.version += 1
+
+            self.bns_state, self.bns_rule_ids = self.engine.bns_automaton.scan(
+                new_text, self.bns_state, self.bns_rule_ids)
+            self.special_acts_state, self.special_rule_ids = self.engine.special_acts_automaton.scan(
+                new_text, self.special_acts_state, self.special_rule_ids)
+
+            if self.bns_rule_ids or self.special_rule_ids:
+                self.keyword_result = self.engine._keyword_result(
+                    self.bns_rule_ids, self.special_rule_ids, self.lang)
+                self._cancel_timer()
+            else:
+                self._schedule_semantic()
+
+            snapshot = self.snapshot()
+        self._publish(snapshot)
+        return snapshot
+
+    def _schedule_semantic(self):
+        now = time.time()
+        if self.pending_since is None:
+            self.pending_since = now
+        delay = min(self.debounce, max(0.0, self.pending_since + self.max_delay - now))
+        self._cancel_timer()
+        self.timer = threading.Timer(delay, self._run_semantic)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def _cancel_timer(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def _run_semantic(self):
+        with self.lock:
+            if self.closed or self.keyword_result is not None:
+                return
+            text, version = self.text, self.version
+            self.timer = None
+        # Run the encoder outside the lock so new segments are not blocked by it
+        result = self.engine._semantic_classify(text, self.lang)
+        with self.lock:
+            if version < self.semantic_version:
+                return
+            self.semantic_result = result
+            self.semantic_version = version
+            if version == self.version:
+                self.pending_since = None
+            snapshot = self.snapshot()
+        self._publish(snapshot)
+
+    def flush(self):
+        """Runs any pending semantic re-score now (used when dictation ends)."""
+        with self.lock:
+            pending = self.keyword_result is None and self.semantic_version < self.version
+            self._cancel_timer()
+        if pending:
+            self._run_semantic()
+        return self.snapshot()
+
+    def snapshot(self):
+        with self.lock:
+            if self.keyword_result is not None:
+                result, stage = self.keyword_result, "keyword"
+            elif self.semantic_result is not None:
+                result, stage = self.semantic_result, "semantic"
+            else:
+                result, stage = None, "pending"
+            return {
+                "session_id": self.session_id,
+                "language": self.lang,
+                "version": self.version,
+                "segments": len(self.segments),
+                "text": self.text,
+                "stage": stage,
+                "provisional": not self.closed,
+                "semantic_pending": self.keyword_result is None and self.semantic_version < self.version,
+                "result": result
+            }
+
+    def subscribe(self):
+        q = queue.Queue()
+        with self.lock:
+            self.subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self.lock:
+            if q in self.subscribers:
+                self.subscribers.remove(q)
+
+    def _publish(self, event):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for q in subscribers:
+            q.put(event)
+
+    def close(self, flush=True):
+        """Finalizes the session and returns the final (non-provisional) snapshot."""
+        if flush:
+            self.flush()
+        with self.lock:
+            self.closed = True
+            self._cancel_timer()
+            snapshot = self.snapshot()
+        self._publish(snapshot)
+        # None tells event streams to finish
+        self._publish(None)
+        return snapshot
+
+
+class VoiceSessionManager:
+    """Keeps the live dictation sessions of one engine, keyed by session id."""
+
+    def __init__(self, engine, idle_timeout=SESSION_IDLE_TIMEOUT_SECONDS):
+        self.engine = engine
+        self.idle_timeout = idle_timeout
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def create(self, lang='hi'):
+        self.expire_idle()
+        session = VoiceSession(self.engine, lang=lang)
+        with self.lock:
+            self.sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id):
+        with self.lock:
+            return self.sessions.get(session_id)
+
+    def close(self, session_id):
+        with self.lock:
+            session = self.sessions.pop(session_id, None)
+        if session is None:
+            return None
+        return session.close()
+
+    def expire_idle(self):
+        cutoff = time.time() - self.idle_timeout
+        with self.lock:
+            stale = [s for s in self.sessions.values() if s.last_activity < cutoff]
+            for session in stale:
+                del self.sessions[session.session_id]
+        for session in stale:
+            session.close(flush=False)
@@ -0,0 +1,199 @@
+"""Per-utterance latency of the listening loop, measured on WAV fixtures.
+
+Compares the old fixed loop (20 reads of 4000 frames, stop on the first Vosk
+result) with the energy end-pointer from endpointing.py. Each fixture is a
+16 kHz mono 16-bit WAV; an optional `<name>.json` next to it may give the true
+`speech_end_ms`, otherwise it is estimated from the audio.
+
+    python bench_endpointing.py fixtures/                # VAD only
+    python bench_endpointing.py fixtures/ --model model  # with Vosk decoding
+    python bench_endpointing.py --synthetic 10 fixtures/ # generate fixtures first
+"""
+import os
+import sys
+import json
+import glob
+import math
+import time
+import wave
+import random
+import argparse
+from array import array
+
+from endpointing import EnergyEndpointer, capture_utterance, frame_rms, CHUNK_FRAMES, SAMPLE_RATE, FRAME_MS
+
+LEGACY_CHUNK_FRAMES = 4000
+LEGACY_CHUNKS = 20
+
+
+def read_wav(path):
+    with wave.open(path, 'rb') as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2 or wf.getframerate() != SAMPLE_RATE:
+            raise ValueError(f"{path}: expected 16 kHz mono 16-bit PCM")
+        return wf.readframes(wf.getnframes())
+
+
+def chunk_reader(pcm, frames):
+    """Returns a read_chunk() callable that walks through `pcm` like a microphone."""
+    step = frames * 2
+    state = {"offset": 0}
+    def read_chunk():
+        start = state["offset"]
+        state["offset"] += step
+        return pcm[start:start + step]
+    return read_chunk, state
+
+
+def estimate_speech_end(pcm):
+    """Last 20 ms frame that is clearly louder than the quietest part of the file."""
+    samples = array('h')
+    samples.frombytes(pcm)
+    n = SAMPLE_RATE * FRAME_MS // 1000
+    energies = [frame_rms(samples[i:i + n]) for i in range(0, len(samples) - n + 1, n)]
+    if not energies:
+        return 0
+    floor = sorted(energies)[len(energies) // 10]
+    threshold = max(300.0, floor * 3.0)
+    voiced = [i for i, e in enumerate(energies) if e > threshold]
+    return (voiced[-1] + 1) * FRAME_MS if voiced else 0
+
+
+def new_recognizer(model):
+    if model is None:
+        return None
+    from vosk import KaldiRecognizer
+    return KaldiRecognizer(model, SAMPLE_RATE)
+
+
+def run_legacy(pcm, model):
+    """The original loop from offline_app.listen()."""
+    rec = new_recognizer(model)
+    read_chunk, state = chunk_reader(pcm, LEGACY_CHUNK_FRAMES)
+    text = ""
+    t0 = time.perf_counter()
+    for _ in range(LEGACY_CHUNKS):
+        data = read_chunk()
+        if not data:
+            break
+        if rec is not None and rec.AcceptWaveform(data):
+            res = json.loads(rec.Result())
+            if res['text']:
+                text = res['text']
+                break
+    if rec is not None and not text:
+        text = json.loads(rec.FinalResult())['text']
+    elapsed = time.perf_counter() - t0
+    stopped_ms = min(state["offset"], len(pcm)) // 2 * 1000 // SAMPLE_RATE
+    return stopped_ms, elapsed, text
+
+
+def run_vad(pcm, model):
+    rec = new_recognizer(model)
+    read_chunk, state = chunk_reader(pcm, CHUNK_FRAMES)
+    t0 = time.perf_counter()
+    text, info = capture_utterance(rec, read_chunk, EnergyEndpointer())
+    elapsed = time.perf_counter() - t0
+    stopped_ms = min(state["offset"], len(pcm)) // 2 * 1000 // SAMPLE_RATE
+    return stopped_ms, elapsed, text, info
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    idx = min(len(values) - 1, int(math.ceil(pct / 100.0 * len(values))) - 1)
+    return values[max(0, idx)]
+
+
+def write_synthetic_fixtures(directory, count, seed=7):
+    """Speech-like fixtures: voiced bursts with short pauses, then a long tail of room noise."""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    for i in range(count):
+        samples = array('h')
+        def noise(ms):
+            for _ in range(SAMPLE_RATE * ms // 1000):
+                samples.append(int(rng.gauss(0, 40)))
+        def burst(ms):
+            f0 = rng.uniform(110, 220)
+            total = SAMPLE_RATE * ms // 1000
+            for t in range(total):
+                env = math.sin(math.pi * t / total) * (0.6 + 0.4 * math.sin(2 * math.pi * 4 * t / SAMPLE_RATE))
+                v = sum(math.sin(2 * math.pi * f0 * h * t / SAMPLE_RATE) / h for h in (1, 2, 3))
+                samples.append(int(max(-32767, min(32767, 6000 * env * v + rng.gauss(0, 40)))))
+
+        noise(rng.randint(300, 1200))
+        # Utterances from ~1 s to ~12 s, with pauses shorter than the hangover
+        for _ in range(rng.randint(2, 24)):
+            burst(rng.randint(250, 500))
+            noise(rng.randint(60, 300))
+        speech_end_ms = len(samples) * 1000 // SAMPLE_RATE
+        noise(3000)
+
+        path = os.path.join(directory, f"synthetic_{i:02d}.wav")
+        with wave.open(path, 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(SAMPLE_RATE)
+            wf.writeframes(samples.tobytes())
+        with open(path[:-4] + ".json", 'w') as f:
+            json.dump({"speech_end_ms": speech_end_ms}, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures", help="Directory of 16 kHz mono WAV files")
+    parser.add_argument("--model", help="Vosk model directory (decode text as well)")
+    parser.add_argument("--synthetic", type=int, default=0, help="Generate N synthetic fixtures into the directory first")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        write_synthetic_fixtures(args.fixtures, args.synthetic)
+
+    model = None
+    if args.model:
+        from vosk import Model
+        model = Model(args.model)
+
+    paths = sorted(glob.glob(os.path.join(args.fixtures, "*.wav")))
+    if not paths:
+        print(f"No WAV fixtures found in {args.fixtures}")
+        sys.exit(1)
+
+    print(f"{'fixture':28} {'speech_end':>10} | {'legacy stop':>11} {'latency':>8} | {'vad stop':>8} {'latency':>8} {'reason':>14}")
+    print("-" * 100)
+    legacy_latency, vad_latency, vad_cpu = [], [], []
+    legacy_cut, vad_cut = 0, 0
+    for path in paths:
+        pcm = read_wav(path)
+        sidecar = path[:-4] + ".json"
+        if os.path.exists(sidecar):
+            with open(sidecar) as f:
+                speech_end = json.load(f)["speech_end_ms"]
+        else:
+            speech_end = estimate_speech_end(pcm)
+
+        l_stop, _, _ = run_legacy(pcm, model)
+        v_stop, v_elapsed, _, info = run_vad(pcm, model)
+
+        # Latency = how long after the speaker stopped the capture ended.
+        # Negative means the capture ended mid-sentence.
+        l_lat, v_lat = l_stop - speech_end, v_stop - speech_end
+        legacy_latency.append(l_lat)
+        vad_latency.append(v_lat)
+        vad_cpu.append(v_elapsed * 1000)
+        legacy_cut += l_lat < 0
+        vad_cut += v_lat < 0
+        print(f"{os.path.basename(path)[:28]:28} {speech_end:>8}ms | {l_stop:>9}ms {l_lat:>6}ms | {v_stop:>6}ms {v_lat:>6}ms {info['reason']:>14}")
+
+    n = len(paths)
+    print("-" * 100)
+    for name, lat, cut in (("legacy", legacy_latency, legacy_cut), ("vad", vad_latency, vad_cut)):
+        waits = [x for x in lat if x >= 0]
+        print(f"{name:7} cut off: {cut}/{n}  wait after speech: mean {sum(waits) / max(1, len(waits)):.0f} ms, "
+              f"p50 {percentile(waits, 50):.0f} ms, p95 {percentile(waits, 95):.0f} ms")
+    print(f"vad processing cost: mean {sum(vad_cpu) / n:.1f} ms per utterance ({'with' if model else 'without'} Vosk decoding)")
+
+
+if __name__ == "__main__":
+    main()
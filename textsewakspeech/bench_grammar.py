@@ -0,0 +1,119 @@
+"""Open vocabulary vs legal grammar: decode speed and legal keyword recall on WAV fixtures.
+
+Each fixture is a 16 kHz mono 16-bit WAV with a reference transcript in
+`<name>.txt` next to it. The legal phrases (keywords and section titles) that
+occur in the reference are the expected keywords; recall is the share of them
+found in the recognized text, false hits are phrases recognized but not said.
+The vocabulary comes from a running legal engine, or from a saved JSON file.
+
+    python bench_grammar.py fixtures/ --model model
+    python bench_grammar.py fixtures/ --model model --vocabulary legal_grammar.json
+    python bench_grammar.py fixtures/ --model model --engine http://localhost:5000
+"""
+import os
+import sys
+import json
+import glob
+import time
+import argparse
+
+from vosk import Model, KaldiRecognizer
+
+from bench_endpointing import read_wav, chunk_reader, percentile
+from endpointing import CHUNK_FRAMES, SAMPLE_RATE
+from legal_grammar import Grammar, GrammarRecognizer, fetch_vocabulary, model_words, GRAMMAR_CACHE_FILE
+
+
+def decode(rec, pcm):
+    """Whole-file decode in microphone-sized chunks. Returns (text, seconds)."""
+    read_chunk, _ = chunk_reader(pcm, CHUNK_FRAMES)
+    segments = []
+    t0 = time.perf_counter()
+    while True:
+        data = read_chunk()
+        if not data:
+            break
+        if rec.AcceptWaveform(data):
+            segments.append(json.loads(rec.Result()).get("text", ""))
+    segments.append(json.loads(rec.FinalResult()).get("text", ""))
+    return " ".join(s for s in segments if s), time.perf_counter() - t0
+
+
+def found_phrases(text, phrases):
+    """Phrases occurring in `text` as whole words."""
+    padded = f" {' '.join(text.lower().split())} "
+    return {p for p in phrases if f" {p} " in padded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures", help="Directory of 16 kHz mono WAV files with <name>.txt references")
+    parser.add_argument("--model", default="model", help="Vosk model directory")
+    parser.add_argument("--vocabulary", default=GRAMMAR_CACHE_FILE, help="Saved /api/vocabulary JSON")
+    parser.add_argument("--engine", help="Fetch the vocabulary from this legal engine URL instead")
+    args = parser.parse_args()
+
+    if args.engine:
+        vocabulary = fetch_vocabulary(args.engine.rstrip("/"))
+    elif os.path.exists(args.vocabulary):
+        with open(args.vocabulary, encoding="utf-8") as f:
+            vocabulary = json.load(f)
+    else:
+        vocabulary = None
+    if not vocabulary:
+        print("No legal vocabulary: start the legal engine and pass --engine, or pass --vocabulary")
+        sys.exit(1)
+
+    paths = [p for p in sorted(glob.glob(os.path.join(args.fixtures, "*.wav"))) if os.path.exists(p[:-4] + ".txt")]
+    if not paths:
+        print(f"No WAV fixtures with .txt references found in {args.fixtures}")
+        sys.exit(1)
+
+    model = Model(args.model)
+    t0 = time.perf_counter()
+    grammar = Grammar(vocabulary["phrases"], model_words(args.model), vocabulary.get("version"))
+    KaldiRecognizer(model, SAMPLE_RATE, grammar.json)
+    compile_ms = (time.perf_counter() - t0) * 1000
+    print(f"Grammar {grammar.version}: {len(grammar.phrases)} phrases, {len(grammar.dropped)} dropped "
+          f"(not in the model vocabulary), first recognizer {compile_ms:.0f} ms")
+
+    # Recall is measured on what a grammar can express at all
+    phrases = set(vocabulary["phrases"])
+    modes = {
+        "open": lambda: KaldiRecognizer(model, SAMPLE_RATE),
+        "legal": lambda: GrammarRecognizer(KaldiRecognizer(model, SAMPLE_RATE, grammar.json)),
+    }
+    totals = {mode: {"rtf": [], "expected": 0, "hits": 0, "false": 0, "create_ms": []} for mode in modes}
+
+    print(f"{'fixture':28} {'audio':>7} | {'open rtf':>8} {'recall':>7} | {'legal rtf':>9} {'recall':>7}")
+    print("-" * 78)
+    for path in paths:
+        pcm = read_wav(path)
+        with open(path[:-4] + ".txt", encoding="utf-8") as f:
+            expected = found_phrases(f.read(), phrases)
+        audio_s = len(pcm) / 2 / SAMPLE_RATE
+        row = []
+        for mode, make in modes.items():
+            t0 = time.perf_counter()
+            rec = make()
+            totals[mode]["create_ms"].append((time.perf_counter() - t0) * 1000)
+            text, seconds = decode(rec, pcm)
+            found = found_phrases(text, phrases)
+            rtf = seconds / audio_s if audio_s else 0.0
+            totals[mode]["rtf"].append(rtf)
+            totals[mode]["expected"] += len(expected)
+            totals[mode]["hits"] += len(expected & found)
+            totals[mode]["false"] += len(found - expected)
+            row.append((rtf, f"{len(expected & found)}/{len(expected)}"))
+        print(f"{os.path.basename(path)[:28]:28} {audio_s:>6.1f}s | {row[0][0]:>8.3f} {row[0][1]:>7} | {row[1][0]:>9.3f} {row[1][1]:>7}")
+
+    print("-" * 78)
+    for mode, t in totals.items():
+        recall = t["hits"] / t["expected"] if t["expected"] else 0.0
+        print(f"{mode:6} real-time factor: mean {sum(t['rtf']) / len(t['rtf']):.3f}, p95 {percentile(t['rtf'], 95):.3f} | "
+              f"keyword recall {recall:.0%} ({t['hits']}/{t['expected']}), false hits {t['false']} | "
+              f"recognizer setup mean {sum(t['create_ms']) / len(t['create_ms']):.0f} ms (uncached)")
+
+
+if __name__ == "__main__":
+    main()
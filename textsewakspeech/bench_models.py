@@ -0,0 +1,79 @@
+"""Model registry: cold load vs shared model, and a mixed-language session stream under a memory budget.
+
+For every configured language the first session pays the model load; later
+sessions only take a recognizer from the shared model (what one process per
+language, each loading its own model, would pay on every start). Then a
+stream of sessions in random languages runs through a registry with the given
+budget, reporting loads, evictions and the session setup latency.
+
+    python bench_models.py --models hi=model,en=model-en
+    python bench_models.py --models hi=model,en=model-en --budget-mb 400 --sessions 200
+"""
+import time
+import random
+import argparse
+
+from bench_endpointing import percentile
+from model_registry import ModelRegistry, ModelUnavailable, parse_models, SPEECH_MODELS, SPEECH_MODEL_MEMORY_MB
+
+
+def session(registry, lang):
+    """One /listen worth of setup and teardown. Returns the setup time in ms."""
+    t0 = time.perf_counter()
+    loaded = registry.acquire(lang)
+    rec = loaded.recognizers.acquire()
+    setup_ms = (time.perf_counter() - t0) * 1000
+    loaded.recognizers.release(rec)
+    registry.release(loaded)
+    return setup_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", default=SPEECH_MODELS, help="language=model directory, comma separated")
+    parser.add_argument("--budget-mb", type=int, default=SPEECH_MODEL_MEMORY_MB, help="Memory budget for the stream")
+    parser.add_argument("--sessions", type=int, default=100, help="Sessions in the mixed-language stream")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    paths = parse_models(args.models)
+    registry = ModelRegistry(paths, engine_url=None, memory_budget_mb=0)
+    langs = [lang for lang in paths if registry.available(lang)]
+    if not langs:
+        print(f"None of the models in '{args.models}' exist")
+        return
+
+    print(f"{'language':10} {'load ms':>9} {'memory MB':>10} {'source':>7} | {'first session':>13} {'shared p50':>11}")
+    print("-" * 70)
+    for lang in langs:
+        try:
+            first_ms = session(registry, lang)
+        except ModelUnavailable as e:
+            print(f"{lang:10} {e}")
+            continue
+        shared = [session(registry, lang) for _ in range(20)]
+        h = registry.history[lang]
+        print(f"{lang:10} {h['load_ms']:>9.0f} {h['memory_mb']:>10.0f} {h['memory_source']:>7} | "
+              f"{first_ms:>10.0f} ms {percentile(shared, 50):>8.2f} ms")
+    loaded = [lang for lang in langs if registry.history[lang]["loads"]]
+    if not loaded:
+        return
+    print(f"All models loaded together: {registry.stats()['memory_mb']:.0f} MB")
+
+    # Fresh registry with the budget: the stream decides what stays loaded
+    registry = ModelRegistry(paths, engine_url=None, memory_budget_mb=args.budget_mb)
+    rng = random.Random(args.seed)
+    # Skewed like real traffic: the first language dominates
+    weights = [4 if i == 0 else 1 for i in range(len(loaded))]
+    setup = [session(registry, rng.choices(loaded, weights)[0]) for _ in range(args.sessions)]
+    stats = registry.stats()
+    loads = sum(m["loads"] for m in stats["models"].values())
+    evictions = sum(m["evictions"] for m in stats["models"].values())
+    print("-" * 70)
+    print(f"{args.sessions} sessions, budget {args.budget_mb} MB: {loads} loads, {evictions} evictions, "
+          f"{stats['memory_mb']:.0f} MB loaded at the end | setup p50 {percentile(setup, 50):.2f} ms, "
+          f"p95 {percentile(setup, 95):.2f} ms, max {max(setup):.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
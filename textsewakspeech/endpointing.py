@@ -0,0 +1,157 @@
+import os
+import json
+import math
+from array import array
+
+# --- Configuration (override with environment variables) ---
+SAMPLE_RATE = 16000
+# Microphone read size, 1600 frames = 100 ms
+CHUNK_FRAMES = int(os.environ.get("VAD_CHUNK_FRAMES", 1600))
+# Give up if nobody starts talking within this window
+LEADING_SILENCE_MS = int(os.environ.get("VAD_LEADING_SILENCE_MS", 5000))
+# Stop this long after the last voiced frame (hangover)
+TRAILING_SILENCE_MS = int(os.environ.get("VAD_TRAILING_SILENCE_MS", 800))
+# Hard cap on a single utterance
+MAX_UTTERANCE_MS = int(os.environ.get("VAD_MAX_UTTERANCE_MS", 20000))
+# Minimum RMS (int16 scale) counted as speech, and ratio over the measured noise floor
+ENERGY_THRESHOLD = float(os.environ.get("VAD_ENERGY_THRESHOLD", 300))
+NOISE_RATIO = float(os.environ.get("VAD_NOISE_RATIO", 3.0))
+# Voiced run needed before we believe speech started (filters clicks / bumps)
+SPEECH_START_MS = int(os.environ.get("VAD_SPEECH_START_MS", 60))
+# ---------------------------------------------------------
+
+FRAME_MS = 20
+
+
+def frame_rms(samples):
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+class EnergyEndpointer:
+    """Energy based voice-activity end-pointing for 16-bit mono PCM.
+
+    Audio is cut into 20 ms frames. A frame is voiced when its RMS is above
+    max(ENERGY_THRESHOLD, noise_floor * NOISE_RATIO), where the noise floor is
+    tracked from the unvoiced frames. `process()` returns True once capture
+    should stop: leading silence ran out, the trailing hangover after the last
+    voiced frame elapsed, or the utterance hit its maximum length.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, leading_silence_ms=LEADING_SILENCE_MS,
+                 trailing_silence_ms=TRAILING_SILENCE_MS, max_utterance_ms=MAX_UTTERANCE_MS,
+                 energy_threshold=ENERGY_THRESHOLD, noise_ratio=NOISE_RATIO,
+                 speech_start_ms=SPEECH_START_MS):
+        self.sample_rate = sample_rate
+        self.frame_samples = sample_rate * FRAME_MS // 1000
+        self.leading_silence_ms = leading_silence_ms
+        self.trailing_silence_ms = trailing_silence_ms
+        self.max_utterance_ms = max_utterance_ms
+        self.energy_threshold = energy_threshold
+        self.noise_ratio = noise_ratio
+        self.speech_start_frames = max(1, speech_start_ms // FRAME_MS)
+
+        self.noise_floor = None
+        self.position_ms = 0
+        self.speech_start_ms = None
+        self.speech_end_ms = None
+        self.voiced_run = 0
+        self.reason = None
+        self._pending = array('h')
+
+    @property
+    def done(self):
+        return self.reason is not None
+
+    def threshold(self):
+        if self.noise_floor is None:
+            return self.energy_threshold
+        return max(self.energy_threshold, self.noise_floor * self.noise_ratio)
+
+    def process(self, chunk):
+        """Feeds raw PCM bytes. Returns True when capture should stop."""
+        if self.done:
+            return True
+        self._pending.frombytes(chunk[:len(chunk) - len(chunk) % 2])
+        n = self.frame_samples
+        offset = 0
+        while len(self._pending) - offset >= n:
+            self._process_frame(self._pending[offset:offset + n])
+            offset += n
+            if self.done:
+                break
+        del self._pending[:offset]
+        return self.done
+
+    def _process_frame(self, frame):
+        rms = frame_rms(frame)
+        self.position_ms += FRAME_MS
+
+        if rms > self.threshold():
+            self.voiced_run += 1
+            if self.speech_start_ms is None and self.voiced_run >= self.speech_start_frames:
+                self.speech_start_ms = self.position_ms - self.voiced_run * FRAME_MS
+            if self.speech_start_ms is not None:
+                self.speech_end_ms = self.position_ms
+        else:
+            self.voiced_run = 0
+            # Slow-moving average so a loud room raises the bar gradually
+            if self.noise_floor is None:
+                self.noise_floor = rms
+            else:
+                self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms
+
+        if self.speech_start_ms is None:
+            if self.position_ms >= self.leading_silence_ms:
+                self.reason = "no_speech"
+        elif self.position_ms - self.speech_end_ms >= self.trailing_silence_ms:
+            self.reason = "end_of_speech"
+        elif self.position_ms - self.speech_start_ms >= self.max_utterance_ms:
+            self.reason = "max_length"
+
+    def info(self):
+        return {
+            "reason": self.reason,
+            "captured_ms": self.position_ms,
+            "speech_start_ms": self.speech_start_ms,
+            "speech_end_ms": self.speech_end_ms
+        }
+
+
+def capture_utterance(rec, read_chunk, endpointer=None, on_segment=None):
+    """Runs the recognizer until the endpointer says the utterance is over.
+
+    `read_chunk()` returns the next block of PCM bytes (empty bytes = end of
+    input), so the same loop serves the microphone and WAV fixtures. Vosk's own
+    result boundaries no longer end the capture, the text of every result is
+    collected (and passed to `on_segment`) until speech actually stops.
+    Returns (text, endpoint_info).
+    """
+    if endpointer is None:
+        endpointer = EnergyEndpointer()
+    segments = []
+    while True:
+        data = read_chunk()
+        if not data:
+            break
+        if rec is not None and rec.AcceptWaveform(data):
+            res = json.loads(rec.Result())
+            if res.get('text'):
+                segments.append(res['text'])
+                if on_segment:
+                    on_segment(res['text'])
+        if endpointer.process(data):
+            break
+
+    if rec is not None:
+        res = json.loads(rec.FinalResult())
+        if res.get('text'):
+            segments.append(res['text'])
+            if on_segment:
+                on_segment(res['text'])
+
+    info = endpointer.info()
+    if info["reason"] is None:
+        info["reason"] = "end_of_input"
+    return " ".join(segments), info
@@ -0,0 +1,196 @@
+import os
+import json
+import hashlib
+import threading
+import urllib.request
+
+from vosk import KaldiRecognizer
+
+from endpointing import SAMPLE_RATE
+
+# --- Configuration (override with environment variables) ---
+# Last vocabulary fetched from the legal engine, used when it is unreachable
+GRAMMAR_CACHE_FILE = os.environ.get(
+    "SPEECH_GRAMMAR_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "legal_grammar.json")
+)
+# Idle recognizers kept per grammar version
+RECOGNIZER_POOL_SIZE = int(os.environ.get("SPEECH_RECOGNIZER_POOL", 4))
+# ---------------------------------------------------------
+
+# Vosk's out-of-grammar token; lets the decoder skip non-legal speech instead of
+# forcing every word onto the nearest phrase
+UNKNOWN = "[unk]"
+
+
+def fetch_vocabulary(engine_url, cache_file=GRAMMAR_CACHE_FILE):
+    """{"version", "phrases"} from the legal engine's /api/vocabulary.
+
+    A successful fetch is written to `cache_file`; if the engine is unreachable
+    the cached copy is returned instead (None if there is none).
+    """
+    try:
+        with urllib.request.urlopen(f"{engine_url}/api/vocabulary", timeout=2) as resp:
+            vocabulary = json.loads(resp.read().decode("utf-8"))
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump(vocabulary, f, ensure_ascii=False)
+        return vocabulary
+    except Exception as e:
+        print(f"Legal vocabulary fetch failed: {e}")
+    if os.path.exists(cache_file):
+        with open(cache_file, encoding="utf-8") as f:
+            return json.load(f)
+    return None
+
+
+def model_words(model_path):
+    """Words the Vosk model can output (graph/words.txt), None if the model has no word list."""
+    path = os.path.join(model_path, "graph", "words.txt")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return {line.split()[0] for line in f if line.strip()}
+
+
+class Grammar:
+    """A phrase list for KaldiRecognizer, restricted to words the model knows.
+
+    Phrases with an out-of-vocabulary word cannot be decoded at all; they are
+    dropped, but their known words are kept as single-word phrases so most of a
+    multi-word title can still be recognized.
+    """
+
+    def __init__(self, phrases, words=None, source_version=None):
+        kept, dropped = set(), []
+        for phrase in phrases:
+            tokens = phrase.split()
+            if words is None or all(t in words for t in tokens):
+                kept.add(phrase)
+            else:
+                dropped.append(phrase)
+                kept.update(t for t in tokens if t in words)
+        self.phrases = sorted(kept)
+        self.dropped = dropped
+        self.source_version = source_version
+        self.json = json.dumps(self.phrases + [UNKNOWN], ensure_ascii=False)
+        self.version = hashlib.sha256(self.json.encode("utf-8")).hexdigest()[:12]
+
+    def info(self):
+        return {
+            "version": self.version,
+            "source_version": self.source_version,
+            "phrases": len(self.phrases),
+            "dropped_phrases": len(self.dropped)
+        }
+
+
+class GrammarRecognizer:
+    """KaldiRecognizer wrapper that removes [unk] from results.
+
+    Exposes the calls capture_utterance() uses, so it is a drop-in replacement.
+    """
+
+    def __init__(self, rec):
+        self.rec = rec
+
+    @staticmethod
+    def _clean(result):
+        res = json.loads(result)
+        if "text" in res:
+            res["text"] = " ".join(w for w in res["text"].split() if w != UNKNOWN)
+        return json.dumps(res, ensure_ascii=False)
+
+    def AcceptWaveform(self, data):
+        return self.rec.AcceptWaveform(data)
+
+    def Result(self):
+        return self._clean(self.rec.Result())
+
+    def FinalResult(self):
+        return self._clean(self.rec.FinalResult())
+
+    def PartialResult(self):
+        return self.rec.PartialResult()
+
+    def Reset(self):
+        self.rec.Reset()
+
+
+class RecognizerCache:
+    """Pools recognizers per grammar version.
+
+    Compiling a grammar into a decoding graph is the expensive part of creating
+    a grammar recognizer, so finished recognizers are Reset() and reused. When a
+    new grammar version is seen the pools of older versions are dropped.
+    `grammar=None` means the model's open vocabulary.
+    """
+
+    def __init__(self, model, pool_size=RECOGNIZER_POOL_SIZE):
+        self.model = model
+        self.pool_size = pool_size
+        self.pools = {}
+        self.latest = None
+        self.created = 0
+        self.reused = 0
+        self.lock = threading.Lock()
+
+    def acquire(self, grammar=None):
+        key = grammar.version if grammar else None
+        with self.lock:
+            pool = self.pools.get(key)
+            if pool:
+                self.reused += 1
+                return pool.pop()
+            if key is not None and key != self.latest:
+                # Only the newest grammar is worth keeping warm
+                self.latest = key
+                for old in [k for k in self.pools if k is not None and k != key]:
+                    del self.pools[old]
+            self.created += 1
+        if grammar is None:
+            return KaldiRecognizer(self.model, SAMPLE_RATE)
+        return GrammarRecognizer(KaldiRecognizer(self.model, SAMPLE_RATE, grammar.json))
+
+    def release(self, rec, grammar=None):
+        key = grammar.version if grammar else None
+        rec.Reset()
+        with self.lock:
+            if key is not None and key != self.latest:
+                return   # a newer grammar replaced this one meanwhile
+            pool = self.pools.setdefault(key, [])
+            if len(pool) < self.pool_size:
+                pool.append(rec)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "created": self.created,
+                "reused": self.reused,
+                "idle": {str(k) if k else "open": len(v) for k, v in self.pools.items()}
+            }
+
+
+class LegalGrammar:
+    """The current legal-vocabulary grammar, built lazily and rebuilt on refresh()."""
+
+    def __init__(self, engine_url, model_path):
+        self.engine_url = engine_url
+        self.model_path = model_path
+        self.grammar = None
+        self.lock = threading.Lock()
+
+    def current(self):
+        if self.grammar is None:
+            self.refresh()
+        return self.grammar
+
+    def refresh(self):
+        with self.lock:
+            vocabulary = fetch_vocabulary(self.engine_url)
+            if vocabulary is None:
+                return self.grammar
+            grammar = Grammar(vocabulary["phrases"], model_words(self.model_path), vocabulary.get("version"))
+            if self.grammar is None or grammar.version != self.grammar.version:
+                print(f"Legal grammar {grammar.version}: {len(grammar.phrases)} phrases "
+                      f"({len(grammar.dropped)} dropped, not in the model vocabulary)")
+                self.grammar = grammar
+            return self.grammar
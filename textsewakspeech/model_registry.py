@@ -0,0 +1,192 @@
+import os
+import time
+import threading
+
+from vosk import Model
+
+from legal_grammar import LegalGrammar, RecognizerCache
+
+# --- Configuration (override with environment variables) ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# language=model directory, relative paths are resolved against this folder
+SPEECH_MODELS = os.environ.get("SPEECH_MODELS", "hi=model,en=model-en")
+# Language used when a request does not ask for one
+SPEECH_LANGUAGE = os.environ.get("SPEECH_LANGUAGE", "hi")
+# Loaded models may hold this much memory together; idle ones are evicted
+# (least recently used first) to get back under it. 0 = no limit
+SPEECH_MODEL_MEMORY_MB = int(os.environ.get("SPEECH_MODEL_MEMORY_MB", 2048))
+# ---------------------------------------------------------
+
+MB = 1024 * 1024
+
+
+class ModelUnavailable(Exception):
+    """The language has no model configured, its folder is missing, or Vosk could not load it."""
+
+
+def parse_models(spec, base_dir=BASE_DIR):
+    """"hi=model,en=model-en" -> {"hi": "<base_dir>/model", "en": "<base_dir>/model-en"}."""
+    paths = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        lang, path = (part.strip() for part in item.split("=", 1))
+        if lang and path:
+            paths[lang] = path if os.path.isabs(path) else os.path.join(base_dir, path)
+    return paths
+
+
+def resident_bytes():
+    """Resident memory of this process, None where /proc is not available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def folder_bytes(path):
+    """On-disk size of a model folder; Vosk keeps most of it in memory."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class LoadedModel:
+    """One Vosk model with its recognizer pool and legal grammar, shared by every session of its language."""
+
+    def __init__(self, lang, path, model, engine_url, load_ms, memory_bytes):
+        self.lang = lang
+        self.path = path
+        self.model = model
+        self.recognizers = RecognizerCache(model)
+        # The grammar is filtered by this model's word list, so it is per model too
+        self.legal_grammar = LegalGrammar(engine_url, path)
+        self.load_ms = load_ms
+        self.memory_bytes = memory_bytes
+        self.users = 0
+        self.last_used = time.time()
+
+
+class ModelRegistry:
+    """Vosk models by language, loaded on first use and evicted when idle and over the memory budget.
+
+    acquire(lang) returns the LoadedModel (loading it if needed) and marks it in
+    use; release() ends the use. Models in use are never evicted, so the budget
+    can be exceeded while they are all busy, and a single model larger than the
+    budget is still loaded. Loads are serialized so the memory measured for a
+    model (growth of the process' resident memory) is its own.
+    """
+
+    def __init__(self, paths, engine_url, memory_budget_mb=SPEECH_MODEL_MEMORY_MB, loader=Model):
+        self.paths = dict(paths)
+        self.engine_url = engine_url
+        self.memory_budget = memory_budget_mb * MB
+        self.loader = loader
+        self.loaded = {}
+        self.history = {
+            lang: {"loads": 0, "evictions": 0, "load_ms": None, "memory_mb": None, "memory_source": None, "error": None}
+            for lang in self.paths
+        }
+        self.lock = threading.Lock()
+        self.load_lock = threading.Lock()
+
+    def available(self, lang):
+        return lang in self.paths and os.path.isdir(self.paths[lang])
+
+    def acquire(self, lang):
+        entry = self._use(lang)
+        if entry:
+            return entry
+        if lang not in self.paths:
+            raise ModelUnavailable(f"No speech model configured for '{lang}' (configured: {', '.join(self.paths)})")
+        with self.load_lock:
+            entry = self._use(lang)   # loaded by another request while we waited
+            if entry:
+                return entry
+            entry = self._load(lang)
+            with self.lock:
+                entry.users = 1
+                self.loaded[lang] = entry
+                self._evict_over_budget()
+            return entry
+
+    def release(self, entry):
+        with self.lock:
+            entry.users -= 1
+            entry.last_used = time.time()
+            self._evict_over_budget()
+
+    def _use(self, lang):
+        with self.lock:
+            entry = self.loaded.get(lang)
+            if entry:
+                entry.users += 1
+                entry.last_used = time.time()
+            return entry
+
+    def _load(self, lang):
+        path = self.paths[lang]
+        history = self.history[lang]
+        if not os.path.isdir(path):
+            history["error"] = f"Model not found at '{path}'"
+            raise ModelUnavailable(history["error"])
+        print(f"Loading {lang} speech model from {path}...")
+        rss_before = resident_bytes()
+        t0 = time.perf_counter()
+        try:
+            model = self.loader(path)
+        except Exception as e:
+            history["error"] = f"Error loading model: {e}"
+            raise ModelUnavailable(history["error"])
+        load_ms = (time.perf_counter() - t0) * 1000
+        rss_after = resident_bytes()
+        if rss_before is not None and rss_after is not None and rss_after > rss_before:
+            memory, source = rss_after - rss_before, "rss"
+        else:
+            memory, source = folder_bytes(path), "disk"
+        history.update(loads=history["loads"] + 1, load_ms=round(load_ms, 1), memory_mb=round(memory / MB, 1),
+                       memory_source=source, error=None)
+        print(f"{lang} model loaded in {load_ms:.0f} ms ({memory / MB:.0f} MB)")
+        return LoadedModel(lang, path, model, self.engine_url, load_ms, memory)
+
+    def _evict_over_budget(self):
+        """Drops idle models, least recently used first, until the loaded ones fit the budget. Caller holds the lock."""
+        if not self.memory_budget:
+            return
+        idle = sorted((e for e in self.loaded.values() if e.users == 0), key=lambda e: e.last_used)
+        total = sum(e.memory_bytes for e in self.loaded.values())
+        for entry in idle:
+            if total <= self.memory_budget:
+                break
+            # Vosk frees the model once its pooled recognizers go with it
+            del self.loaded[entry.lang]
+            self.history[entry.lang]["evictions"] += 1
+            total -= entry.memory_bytes
+            print(f"Evicted idle {entry.lang} speech model ({entry.memory_bytes / MB:.0f} MB, memory budget)")
+
+    def stats(self):
+        now = time.time()
+        with self.lock:
+            models = {}
+            for lang, path in self.paths.items():
+                entry = self.loaded.get(lang)
+                models[lang] = {
+                    "path": path,
+                    "available": os.path.isdir(path),
+                    "loaded": entry is not None,
+                    # load_ms / memory_mb are from the latest load, kept after an eviction
+                    **self.history[lang],
+                    "users": entry.users if entry else 0,
+                    "idle_s": round(now - entry.last_used, 1) if entry and not entry.users else None
+                }
+            return {
+                "memory_budget_mb": self.memory_budget // MB,
+                "memory_mb": round(sum(e.memory_bytes for e in self.loaded.values()) / MB, 1),
+                "models": models
+            }
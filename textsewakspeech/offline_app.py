@@ -2,35 +2,91 @@ import os
 import sys
 import json
 import queue
+import threading
 import pyaudio
-from flask import Flask, render_template, jsonify
+import urllib.request
+from flask import Flask, render_template, jsonify, request
 from flask_cors import CORS
-from vosk import Model, KaldiRecognizer
+
+from endpointing import EnergyEndpointer, capture_utterance, CHUNK_FRAMES
+from model_registry import ModelRegistry, ModelUnavailable, parse_models, SPEECH_MODELS, SPEECH_LANGUAGE
 
 app = Flask(__name__)
 CORS(app)
 
 # --- Configuration ---
-MODEL_PATH = os.path.join(os.getcwd(), "model")  # Use absolute path
+# Vosk models by language (SPEECH_MODELS, see model_registry.py), relative to this folder
+MODEL_PATHS = parse_models(SPEECH_MODELS)
+# Legal engine that receives recognized segments for incremental analysis
+LEGAL_ENGINE_URL = os.environ.get("LEGAL_ENGINE_URL", "http://localhost:5000")
+# Default recognition mode for /listen: "open" (full dictation) or "legal"
+# (grammar of the legal engine's keywords and section titles, see legal_grammar.py)
+SPEECH_GRAMMAR_MODE = os.environ.get("SPEECH_GRAMMAR_MODE", "open")
+# Seconds /listen waits, after the capture, for segments still being sent to
+# the legal engine before it answers without their analysis
+SEGMENT_FORWARD_WAIT_S = float(os.environ.get("SEGMENT_FORWARD_WAIT_S", 3))
 # ---------------------
 
-model = None
-try:
-    print(f"DEBUG: Attempting to load model from: {MODEL_PATH}")
-    if os.path.exists(MODEL_PATH):
-        print(f"DEBUG: Path exists. Contents: {os.listdir(MODEL_PATH)}")
-        model = Model(MODEL_PATH)
-        print("Model loaded successfully!")
-    else:
-        print(f"ERROR: Model not found at '{MODEL_PATH}'. Please download it.")
-except Exception as e:
-    print(f"Error loading model: {e}")
-
-def get_recognizer():
-    if not model:
+# Models load on first use and are shared by all requests of their language
+models = ModelRegistry(MODEL_PATHS, LEGAL_ENGINE_URL)
+for lang, path in MODEL_PATHS.items():
+    print(f"Speech model '{lang}': {path}{'' if os.path.isdir(path) else ' (missing)'}")
+
+def recognition_grammar(loaded, mode):
+    """The grammar for a /listen mode on a loaded model, None for the open vocabulary."""
+    if mode != "legal":
+        return None
+    grammar = loaded.legal_grammar.current()
+    if grammar is None:
+        print("Legal grammar unavailable (engine unreachable, no cached vocabulary), using open vocabulary")
+    return grammar
+
+def forward_segment(session_id, text):
+    """Pushes a recognized segment into a legal engine dictation session.
+
+    Returns the provisional analysis, or None if the engine is unreachable
+    (dictation itself must keep working without the legal engine).
+    """
+    url = f"{LEGAL_ENGINE_URL}/api/session/{session_id}/segment"
+    body = json.dumps({"text": text}).encode("utf-8")
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=2) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+    except Exception as e:
+        print(f"Legal engine forward failed: {e}")
         return None
-    rec = KaldiRecognizer(model, 16000)
-    return rec
+
+class SegmentForwarder:
+    """Sends recognized segments to a legal engine session from a background thread.
+
+    The microphone loop only queues them: a forward_segment() call can block for
+    its whole timeout, and the audio arriving meanwhile would be dropped.
+    Segments are sent in order; `result` is the analysis of the latest one.
+    """
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.segments = queue.Queue()
+        self.result = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def put(self, segment):
+        self.segments.put(segment)
+
+    def close(self, timeout=SEGMENT_FORWARD_WAIT_S):
+        """No more segments: waits up to `timeout` s for the queued ones and returns the latest analysis."""
+        self.segments.put(None)
+        self.thread.join(timeout)
+        return self.result
+
+    def _run(self):
+        while True:
+            segment = self.segments.get()
+            if segment is None:
+                return
+            self.result = forward_segment(self.session_id, segment)
 
 @app.route('/')
 def index():
@@ -38,17 +94,63 @@ def index():
 
 @app.route('/check_model')
 def check_model():
-    if model:
-        return jsonify({"status": "ok"})
-    return jsonify({"status": "error", "message": "Model not found. Please download 'vosk-model-hi-small-0.22' and extract it as 'model' folder."})
+    """Configured models: available on disk, loaded, load time and memory (?load=1 loads the ?lang= model now)."""
+    lang = request.args.get('lang', SPEECH_LANGUAGE)
+    if request.args.get('load'):
+        try:
+            models.release(models.acquire(lang))
+        except ModelUnavailable as e:
+            print(e)
+    status = models.stats()
+    if models.available(lang):
+        return jsonify({"status": "ok", "language": lang, **status})
+    message = f"Model for '{lang}' not found."
+    if lang == "hi":
+        message += " Please download 'vosk-model-hi-small-0.22' and extract it as 'model' folder."
+    return jsonify({"status": "error", "language": lang, "message": message, **status})
+
+@app.route('/grammar')
+def grammar_status():
+    """Legal grammar of the ?lang= model (?refresh=1 re-fetches the engine vocabulary) and its recognizer pool stats."""
+    lang = request.args.get('lang', SPEECH_LANGUAGE)
+    try:
+        loaded = models.acquire(lang)
+    except ModelUnavailable as e:
+        return jsonify({"status": "error", "message": str(e)})
+    try:
+        grammar = loaded.legal_grammar.refresh() if request.args.get('refresh') else loaded.legal_grammar.grammar
+        return jsonify({
+            "language": lang,
+            "default_mode": SPEECH_GRAMMAR_MODE,
+            "grammar": grammar.info() if grammar else None,
+            "recognizers": loaded.recognizers.stats()
+        })
+    finally:
+        models.release(loaded)
 
 @app.route('/listen')
 def listen():
-    if not model:
-        return jsonify({"text": "", "error": "Model not loaded"})
+    # ?lang= picks the model (SPEECH_MODELS); it is loaded on first use and shared
+    lang = request.args.get('lang', SPEECH_LANGUAGE)
+    try:
+        loaded = models.acquire(lang)
+    except ModelUnavailable as e:
+        return jsonify({"text": "", "error": str(e)})
+
+    # ?mode=legal restricts decoding to legal vocabulary, ?mode=open is full dictation
+    mode = request.args.get('mode', SPEECH_GRAMMAR_MODE)
+    try:
+        grammar = recognition_grammar(loaded, mode)
+        rec = loaded.recognizers.acquire(grammar)
+    except Exception:
+        models.release(loaded)
+        raise
+    endpointer = EnergyEndpointer()
+
+    # Optional: feed each recognized segment to a legal engine session (?session=<id>)
+    session_id = request.args.get('session')
+    forwarder = SegmentForwarder(session_id) if session_id else None
 
-    rec = KaldiRecognizer(model, 16000)
-    
     p = pyaudio.PyAudio()
     text = ""
     try:
@@ -57,23 +159,18 @@ def listen():
                         channels=1,
                         rate=16000,
                         input=True,
-                        frames_per_buffer=8000)
+                        frames_per_buffer=CHUNK_FRAMES)
         
         print("Listening...")
         stream.start_stream()
         
-        # Listen for up to 5 seconds
-        for i in range(0, 20): # 20 chunks * 0.5s approx? No, 8000 frames at 16k is 0.5s. So 10 chunks = 5s
-            data = stream.read(4000, exception_on_overflow=False)
-            if rec.AcceptWaveform(data):
-                res = json.loads(rec.Result())
-                if res['text']:
-                    text = res['text']
-                    break
-        
-        if not text:
-            res = json.loads(rec.FinalResult())
-            text = res['text']
+        # Listen until the speaker stops (see endpointing.py for the limits)
+        text, endpoint = capture_utterance(
+            rec,
+            lambda: stream.read(CHUNK_FRAMES, exception_on_overflow=False),
+            endpointer,
+            forwarder.put if forwarder else None
+        )
 
         stream.stop_stream()
         stream.close()
@@ -82,9 +179,15 @@ def listen():
         return jsonify({"text": "", "error": str(e)})
     finally:
         p.terminate()
+        loaded.recognizers.release(rec, grammar)
+        models.release(loaded)
+        legal_result = forwarder.close() if forwarder else None
 
-    print(f"Recognized: {text}")
-    return jsonify({"text": text})
+    print(f"Recognized: {text} ({endpoint['reason']}, {endpoint['captured_ms']} ms)")
+    response = {"text": text, "endpoint": endpoint, "mode": "legal" if grammar else "open", "language": lang}
+    if session_id and text:
+        response["legal"] = legal_result
+    return jsonify(response)
 
 if __name__ == '__main__':
     print("Starting Offline FIR Generator...")